@@ -11,10 +11,20 @@ import logging
 import sys
 import traceback
 from collections.abc import Iterable
+from contextlib import ExitStack
 from typing import Any, TextIO
 
 from flowgate.core.config import ConfigError
-from flowgate.core.observability import events_log_context, set_events_log_path
+from flowgate.core.constants import DEFAULT_EVENTS_FLUSH_INTERVAL
+from flowgate.core.eventlog import SegmentPolicy
+from flowgate.core.metricsinks import MetricsPolicy
+from flowgate.core.observability import (
+    event_sink_policy,
+    events_log_context,
+    metrics_policy,
+    set_events_log_path,
+    span,
+)
 from flowgate.cli.auth import (
     AuthImportCommand,
     AuthListCommand,
@@ -22,12 +32,17 @@ from flowgate.cli.auth import (
     AuthStatusCommand,
 )
 from flowgate.cli.bootstrap import BootstrapDownloadCommand, BootstrapUpdateCommand
+from flowgate.cli.daemon import DaemonCommand, run_via_daemon
 from flowgate.cli.error_handler import EXIT_CONFIG_ERROR, EXIT_RUNTIME_ERROR
 from flowgate.cli.health import DoctorCommand, HealthCommand, StatusCommand
 from flowgate.cli.helpers import (
     _load_and_resolve_config,
+    profile_cli_command,
+    profile_directory,
+    trace_cli_command,
 )
-from flowgate.cli.output import Output
+from flowgate.cli.metrics import MetricsCommand
+from flowgate.cli.output import Output, command_id_from_args
 from flowgate.cli.parser import build_parser
 from flowgate.cli.service import (
     ServiceRestartCommand,
@@ -43,23 +58,59 @@ def run_cli(
     stderr = stderr or sys.stderr
     parser = build_parser()
 
+    argv = list(argv)
+
     try:
-        args = parser.parse_args(list(argv))
+        args = parser.parse_args(argv)
         if getattr(args, "debug", False):
             logging.basicConfig(level=logging.DEBUG)
         args.stdout = stdout
         args.stderr = stderr
         args._output = Output.from_args(args, stdout=stdout, stderr=stderr)
 
+        served = run_via_daemon(argv, args, stdout=stdout, stderr=stderr)
+        if served is not None:
+            return served
+
         from pathlib import Path
 
         cfg_path = Path(args.config).expanduser().resolve()
         early_events_log = cfg_path.parent / ".router" / "runtime" / "events.log"
 
-        with events_log_context(early_events_log):
+        with events_log_context(early_events_log), ExitStack() as stack:
+            profile = None
+            if args.profile or args.profile_memory:
+                profile = stack.enter_context(
+                    profile_cli_command(args, early_events_log.parent, stderr=stderr)
+                )
+            if args.trace_out:
+                # Config loading included, everything nests under one root span.
+                stack.enter_context(trace_cli_command(args.trace_out, stderr=stderr))
+                stack.enter_context(span(command_id_from_args(args)))
             config = _load_and_resolve_config(args.config)
+            if profile is not None:
+                profile.directory = profile_directory(config)
             # Prefer resolved config path once available.
             set_events_log_path(config.get("paths", {}).get("log_file"))
+            # Batch events for the rest of the command; flushed when it ends.
+            events = config.get("observability", {}).get("events", {})
+            stack.enter_context(
+                event_sink_policy(
+                    flush_interval=float(
+                        events.get("flush_interval", DEFAULT_EVENTS_FLUSH_INTERVAL)
+                    ),
+                    fsync=events.get("fsync", "never"),
+                    segments=SegmentPolicy.from_config(events.get("segments", {})),
+                )
+            )
+            # Metric sinks and sample rates are fixed for the rest of the command.
+            stack.enter_context(
+                metrics_policy(
+                    MetricsPolicy.from_config(
+                        config.get("observability", {}).get("metrics", {})
+                    )
+                )
+            )
 
             stdout = stdout or sys.stdout
             stderr = stderr or sys.stderr
@@ -116,6 +167,12 @@ def run_cli(
             if args.command == "doctor":
                 return DoctorCommand(args, config).execute()
 
+            if args.command == "metrics":
+                return MetricsCommand(args, config).execute()
+
+            if args.command == "daemon":
+                return DaemonCommand(args, config).execute()
+
             print("Unknown command", file=stderr)
             return EXIT_CONFIG_ERROR
     except ConfigError as exc:
@@ -187,6 +187,7 @@ class BootstrapUpdateCommand(BaseCommand):
         )
         cliproxy = updated["cliproxyapi_plus"]
         restarted_pid = updated["restarted_pid"]
+        restarted_pids = updated.get("restarted_pids", {})
 
         if output.format != "legacy":
             output.emit_envelope(
@@ -200,6 +201,7 @@ class BootstrapUpdateCommand(BaseCommand):
                         "repo": repo,
                         "cliproxyapi_plus": str(cliproxy),
                         "restarted_pid": restarted_pid,
+                        "restarted_pids": restarted_pids,
                     },
                     "warnings": [],
                     "errors": [],
@@ -211,10 +213,9 @@ class BootstrapUpdateCommand(BaseCommand):
             f"cliproxyapi_plus:updated version={latest_version}",
             file=stdout,
         )
-        if restarted_pid is not None:
-            print(
-                f"{CLIPROXYAPI_PLUS_SERVICE}:restarted pid={restarted_pid}",
-                file=stdout,
-            )
+        if restarted_pid is not None and not restarted_pids:
+            restarted_pids = {CLIPROXYAPI_PLUS_SERVICE: restarted_pid}
+        for name, pid in restarted_pids.items():
+            print(f"{name}:restarted pid={pid}", file=stdout)
 
         return 0
@@ -0,0 +1,287 @@
+"""
+Resident daemon command handler for FlowGate CLI.
+
+``flowgate daemon`` loads the config once, keeps a ProcessSupervisor and recent
+health results in memory, and answers ``status``/``health`` requests from other
+``flowgate`` invocations over a Unix domain socket.
+"""
+
+from __future__ import annotations
+
+import argparse
+import io
+import os
+import signal
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, TextIO
+
+from flowgate.core.daemon import (
+    DAEMON_COMMANDS,
+    DaemonResponse,
+    DaemonServer,
+    default_socket_path,
+    request_daemon,
+)
+from flowgate.core.observability import events_log_context
+from flowgate.core.openmetrics import MetricsServer
+from flowgate.core.process import ProcessSupervisor
+from flowgate.core.sampler import ResourceSampler
+from flowgate.core.watchdog import Watchdog, WatchdogPolicy
+from flowgate.cli.base import BaseCommand
+from flowgate.cli.error_handler import handle_command_errors
+from flowgate.cli.health import HealthCommand, StatusCommand
+from flowgate.cli.helpers import _load_and_resolve_config
+from flowgate.cli.output import Output, command_id_from_args
+from flowgate.cli.parser import build_parser
+
+_COMMANDS: dict[str, type[BaseCommand]] = {
+    "status": StatusCommand,
+    "health": HealthCommand,
+}
+
+
+def _file_stamp(path: str | None) -> tuple[int, int] | None:
+    if not path:
+        return None
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+class DaemonState:
+    """Config, supervisor and cached health results shared by daemon requests."""
+
+    def __init__(self, config: dict[str, Any], *, health_ttl: float = 5.0):
+        self.config_path = str(config["_meta"]["config_path"])
+        self.health_ttl = health_ttl
+        self._lock = threading.Lock()
+        # Building the argparse tree costs milliseconds; do it once.
+        self._parser = build_parser()
+        self._health_cache: dict[tuple[str, ...], tuple[float, DaemonResponse]] = {}
+        self._install(config)
+
+    def _install(self, config: dict[str, Any]) -> None:
+        self.config = config
+        self.supervisor = ProcessSupervisor(
+            config["paths"]["runtime_dir"],
+            events_log=config["paths"]["log_file"],
+        )
+        self._stamps = self._current_stamps()
+        self._health_cache.clear()
+
+    def _current_stamps(self) -> tuple[tuple[int, int] | None, ...]:
+        cliproxy_cfg = self.config.get("cliproxyapi_plus", {}).get("config_file")
+        return (_file_stamp(self.config_path), _file_stamp(cliproxy_cfg))
+
+    def refresh(self) -> None:
+        """Reload the config when either config file changed on disk."""
+        with self._lock:
+            if self._current_stamps() != self._stamps:
+                self._install(_load_and_resolve_config(self.config_path))
+
+    def snapshot(self) -> tuple[dict[str, Any], ProcessSupervisor]:
+        """Current (config, supervisor) pair, reloading changed config first."""
+        self.refresh()
+        with self._lock:
+            return self.config, self.supervisor
+
+    def dispatch(self, request: dict[str, Any]) -> DaemonResponse:
+        if request.get("op") == "ping":
+            return {"exit_code": 0, "stdout": f"pid={os.getpid()}\n", "stderr": ""}
+
+        argv = [str(item) for item in request.get("argv", [])]
+        try:
+            with self._lock:
+                args = self._parser.parse_args(argv)
+        except SystemExit:
+            return {"error": "usage"}
+        if args.command not in DAEMON_COMMANDS:
+            return {"error": f"unsupported command: {args.command}"}
+        if request.get("format"):
+            args.format = str(request["format"])
+
+        self.refresh()
+        cache_key = (args.format, *argv)
+        if args.command == "health":
+            with self._lock:
+                cached = self._health_cache.get(cache_key)
+            if cached is not None and time.monotonic() - cached[0] < self.health_ttl:
+                return cached[1]
+
+        response = self._run(args)
+        if args.command == "health":
+            with self._lock:
+                self._health_cache[cache_key] = (time.monotonic(), response)
+        return response
+
+    def _run(self, args: argparse.Namespace) -> DaemonResponse:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        args.stdout = stdout
+        args.stderr = stderr
+        args._output = Output.from_args(args, stdout=stdout, stderr=stderr)
+        args._supervisor = self.supervisor
+        with events_log_context(self.config["paths"]["log_file"]):
+            exit_code = _COMMANDS[args.command](args, self.config).execute()
+        return {
+            "exit_code": int(exit_code),
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }
+
+
+class DaemonCommand(BaseCommand):
+    """Serve status/health from memory until SIGTERM/SIGINT."""
+
+    @handle_command_errors
+    def execute(self) -> int:
+        """Execute daemon command."""
+        stdout: TextIO = getattr(self.args, "stdout", None) or sys.stdout
+        stderr: TextIO = getattr(self.args, "stderr", None) or sys.stderr
+        output: Output = getattr(self.args, "_output", None) or Output.from_args(
+            self.args, stdout=stdout, stderr=stderr
+        )
+
+        state = DaemonState(
+            self.config, health_ttl=float(getattr(self.args, "health_ttl", 5.0))
+        )
+        socket_path = default_socket_path(state.config_path)
+        server = DaemonServer(socket_path, state.dispatch)
+
+        def _request_shutdown(signum: int, frame: Any) -> None:
+            # shutdown() blocks until serve_forever returns, so not on this thread.
+            threading.Thread(target=server.shutdown, daemon=True).start()
+
+        watchdog: Watchdog | None = None
+        watchdog_thread: threading.Thread | None = None
+        if getattr(self.args, "watchdog", False):
+            watchdog = Watchdog(
+                state.snapshot,
+                policy=WatchdogPolicy(
+                    initial_backoff=float(self.args.restart_backoff),
+                    max_backoff=float(self.args.restart_backoff_max),
+                    crash_loop_threshold=int(self.args.crash_loop_threshold),
+                    crash_loop_window=float(self.args.crash_loop_window),
+                ),
+            )
+            watchdog_thread = threading.Thread(
+                target=watchdog.run, name="flowgate-watchdog", daemon=True
+            )
+            watchdog_thread.start()
+
+        sampler: ResourceSampler | None = None
+        sampler_thread: threading.Thread | None = None
+        sample_interval = float(getattr(self.args, "sample_interval", 0.0) or 0.0)
+        if sample_interval > 0:
+            sampler = ResourceSampler(state.snapshot, interval=sample_interval)
+            sampler_thread = threading.Thread(
+                target=sampler.run, name="flowgate-sampler", daemon=True
+            )
+            sampler_thread.start()
+
+        metrics: MetricsServer | None = None
+        metrics_listen = getattr(self.args, "metrics_listen", None)
+        if metrics_listen is not None:
+
+            def services_up() -> dict[str, bool]:
+                config, supervisor = state.snapshot()
+                return {
+                    name: supervisor.is_running(name) for name in config["services"]
+                }
+
+            metrics = MetricsServer(
+                metrics_listen,
+                state.config["paths"]["log_file"],
+                services_up=services_up,
+            )
+            metrics.start()
+        metrics_address = (
+            "{}:{}".format(*metrics.address) if metrics is not None else None
+        )
+
+        previous = {
+            sig: signal.signal(sig, _request_shutdown)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        state.supervisor.record_event(
+            "daemon_start",
+            service="flowgate",
+            result="success",
+            detail=str(socket_path),
+        )
+        if output.format == "legacy":
+            print(
+                f"daemon:listening socket={socket_path} "
+                f"watchdog={'on' if watchdog is not None else 'off'} "
+                f"sampler={'on' if sampler is not None else 'off'} "
+                f"metrics={metrics_address or 'off'}",
+                file=stdout,
+                flush=True,
+            )
+        else:
+            output.emit_envelope(
+                {
+                    "ok": True,
+                    "command": command_id_from_args(self.args),
+                    "data": {
+                        "socket": str(socket_path),
+                        "pid": os.getpid(),
+                        "watchdog": watchdog is not None,
+                        "sample_interval": sample_interval if sampler else None,
+                        "metrics": metrics_address,
+                    },
+                    "warnings": [],
+                    "errors": [],
+                }
+            )
+            stdout.flush()
+
+        try:
+            server.serve_forever()
+        finally:
+            if watchdog is not None and watchdog_thread is not None:
+                watchdog.stop()
+                watchdog_thread.join(timeout=5)
+            if sampler is not None and sampler_thread is not None:
+                sampler.stop()
+                sampler_thread.join(timeout=5)
+            if metrics is not None:
+                metrics.stop()
+            server.server_close()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+            state.supervisor.record_event(
+                "daemon_stop", service="flowgate", result="success", detail=None
+            )
+        return 0
+
+
+def run_via_daemon(
+    argv: list[str], args: argparse.Namespace, *, stdout: TextIO, stderr: TextIO
+) -> int | None:
+    """Answer a read-only command from a running daemon, if there is one.
+
+    Traced or profiled commands (``--trace-out``, ``--profile``,
+    ``--profile-memory``) always run locally.
+    """
+    if args.command not in DAEMON_COMMANDS or getattr(args, "no_daemon", False):
+        return None
+    if any(
+        getattr(args, option, None)
+        for option in ("trace_out", "profile", "profile_memory")
+    ):
+        return None
+    response = request_daemon(
+        default_socket_path(Path(args.config)),
+        {"argv": argv, "format": args._output.format},
+    )
+    if response is None or "exit_code" not in response:
+        return None
+    stdout.write(response.get("stdout", ""))
+    stderr.write(response.get("stderr", ""))
+    return int(response["exit_code"])
@@ -13,10 +13,16 @@ from pathlib import Path
 from typing import Any, TextIO
 
 from flowgate.core.bootstrap import is_executable_file
-from flowgate.core.constants import DEFAULT_READINESS_PATH, DEFAULT_SERVICE_HOST
-from flowgate.core.health import check_http_health, comprehensive_health_check
+from flowgate.core.health import (
+    check_http_health,
+    comprehensive_health_check,
+    service_readiness_url,
+)
+from flowgate.core.lifecycle import effective_service
 from flowgate.core.process import ProcessSupervisor
+from flowgate.core.sampler import read_resource_state
 from flowgate.core.security import check_secret_file_permissions
+from flowgate.core.watchdog import read_watchdog_state
 from flowgate.cli.base import BaseCommand
 from flowgate.cli.error_handler import handle_command_errors
 from flowgate.cli.helpers import effective_secret_files, maybe_print_update_notification
@@ -35,13 +41,19 @@ class StatusCommand(BaseCommand):
             self.args, stdout=stdout, stderr=stderr
         )
 
-        supervisor = ProcessSupervisor(
+        supervisor = getattr(self.args, "_supervisor", None) or ProcessSupervisor(
             self.config["paths"]["runtime_dir"],
             events_log=self.config["paths"]["log_file"],
         )
         services: dict[str, bool] = {}
+        controls_drift: dict[str, list[str]] = {}
         for name in sorted(self.config["services"].keys()):
             services[name] = bool(supervisor.is_running(name))
+            drift = supervisor.controls_drift(name) if services[name] else None
+            if drift is not None:
+                controls_drift[name] = drift
+        watchdog = read_watchdog_state(self.config["paths"]["runtime_dir"])
+        resources = read_resource_state(self.config["paths"]["runtime_dir"])
 
         issues = check_secret_file_permissions(effective_secret_files(self.config))
         secret_issue_count = len(issues)
@@ -53,15 +65,22 @@ class StatusCommand(BaseCommand):
         cliproxy_cfg_str = str(cliproxy_cfg).strip() if cliproxy_cfg else ""
 
         if output.format != "legacy":
+            data: dict[str, Any] = {
+                "services": services,
+                "cliproxyapi_plus_config": cliproxy_cfg_str,
+                "secret_permission_issues": secret_issue_count,
+            }
+            if watchdog:
+                data["watchdog"] = watchdog
+            if resources:
+                data["resources"] = resources
+            if controls_drift:
+                data["process_controls_drift"] = controls_drift
             output.emit_envelope(
                 {
                     "ok": True,
                     "command": command_id_from_args(self.args),
-                    "data": {
-                        "services": services,
-                        "cliproxyapi_plus_config": cliproxy_cfg_str,
-                        "secret_permission_issues": secret_issue_count,
-                    },
+                    "data": data,
                     "warnings": [],
                     "errors": [],
                 }
@@ -73,6 +92,21 @@ class StatusCommand(BaseCommand):
                 f"services.{name}_running={'yes' if services[name] else 'no'}",
                 file=stdout,
             )
+            watch = watchdog.get(name)
+            if isinstance(watch, dict):
+                print(f"services.{name}_watchdog={watch.get('state')}", file=stdout)
+            sample = resources.get(name)
+            if isinstance(sample, dict) and sample.get("pid") is not None:
+                print(
+                    f"services.{name}_resources=cpu_pct={sample.get('cpu_pct')} "
+                    f"rss_kb={sample.get('rss_kb')} threads={sample.get('threads')} "
+                    f"fds={sample.get('fds')}",
+                    file=stdout,
+                )
+            if name in controls_drift:
+                drift = controls_drift[name]
+                state = f"drift:{','.join(drift)}" if drift else "ok"
+                print(f"services.{name}_process_controls={state}", file=stdout)
         if cliproxy_cfg_str:
             print(f"cliproxyapi_plus_config={cliproxy_cfg_str}", file=stdout)
         print(f"secret_permission_issues={secret_issue_count}", file=stdout)
@@ -144,7 +178,7 @@ class HealthCommand(BaseCommand):
             print("", file=stdout)
 
         # Also run service health checks
-        supervisor = ProcessSupervisor(
+        supervisor = getattr(self.args, "_supervisor", None) or ProcessSupervisor(
             self.config["paths"]["runtime_dir"],
             events_log=self.config["paths"]["log_file"],
         )
@@ -157,16 +191,10 @@ class HealthCommand(BaseCommand):
             running = supervisor.is_running(name)
             liveness_ok = running
 
-            host = service.get("host", DEFAULT_SERVICE_HOST)
-            port = service.get("port")
-            readiness_path = (
-                service.get("readiness_path")
-                or service.get("health_path")
-                or DEFAULT_READINESS_PATH
+            readiness_url = service_readiness_url(
+                effective_service(supervisor, name, service)
             )
-
-            if isinstance(port, int):
-                readiness_url = f"http://{host}:{port}{readiness_path}"
+            if readiness_url is not None:
                 readiness = check_http_health(readiness_url, timeout=1.0)
             else:
                 readiness_url = "n/a"
@@ -5,15 +5,23 @@ This module contains helper functions for:
 - Configuration loading and path resolution
 - Secret file collection from config and auth directory
 - CLIProxyAPIPlus update notification
+- Profiling a command (``--profile``/``--profile-memory``)
 """
 
 from __future__ import annotations
 
+import argparse
 import os
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Any, TextIO
 
 from flowgate.core.config import PathResolver, load_router_config
+from flowgate.core.observability import TraceRecorder, trace_to
+from flowgate.core.profiling import PROFILES_DIR, ProfileSession, profile_command
+from flowgate.cli.output import command_id_from_args
 
 
 def _load_and_resolve_config(path: str) -> dict[str, Any]:
@@ -45,6 +53,7 @@ def effective_secret_files(config: dict[str, Any]) -> list[str]:
     Sources:
     - Files listed in config's secret_files list (resolved to absolute paths)
     - *.json files in the default auth directory
+    - Derived CLIProxyAPIPlus configs (per backend/replica copies with keys)
 
     Returns deduplicated, sorted list of absolute file paths.
     """
@@ -58,6 +67,15 @@ def effective_secret_files(config: dict[str, Any]) -> list[str]:
         for item in default_auth_dir.glob("*.json"):
             paths.add(str(item.resolve()))
 
+    derived_dirs = {
+        service["derived_config"]["dir"]
+        for service in config.get("services", {}).values()
+        if isinstance(service, dict) and "derived_config" in service
+    }
+    for derived_dir in derived_dirs:
+        for item in Path(derived_dir).glob("*.yaml"):
+            paths.add(str(item.resolve()))
+
     return sorted(paths)
 
 
@@ -111,3 +129,52 @@ def maybe_print_update_notification(config: dict[str, Any], *, stdout: TextIO) -
         ),
         file=stdout,
     )
+
+
+@contextmanager
+def profile_cli_command(
+    args: argparse.Namespace, runtime_dir: str | Path, *, stderr: TextIO
+) -> Iterator[ProfileSession]:
+    """Profile a command as ``--profile``/``--profile-memory`` ask.
+
+    Artifacts go to ``<runtime_dir>/profiles/``; set the session's
+    ``directory`` once the configured runtime dir is known. Their paths are
+    printed to ``stderr`` so they never mix with command output.
+    """
+    session: ProfileSession | None = None
+    try:
+        with profile_command(
+            command_id_from_args(args),
+            Path(runtime_dir) / PROFILES_DIR,
+            cpu=bool(getattr(args, "profile", False)),
+            memory=bool(getattr(args, "profile_memory", False)),
+        ) as session:
+            yield session
+    finally:
+        for path in session.artifacts if session is not None else []:
+            print(f"profile={path}", file=stderr)
+
+
+@contextmanager
+def trace_cli_command(
+    path: str | Path, *, stderr: TextIO | None
+) -> Iterator[TraceRecorder]:
+    """Trace a command as ``--trace-out`` asks.
+
+    A trace file that cannot be written is reported on ``stderr``; the
+    command's own exit code is kept.
+    """
+
+    def report(exc: OSError) -> None:
+        print(
+            f"trace: cannot write {path}: {exc.strerror or exc}",
+            file=stderr or sys.stderr,
+        )
+
+    with trace_to(path, on_error=report) as recorder:
+        yield recorder
+
+
+def profile_directory(config: dict[str, Any]) -> Path:
+    """Where profiles of commands run with ``config`` are written."""
+    return Path(config["paths"]["runtime_dir"]) / PROFILES_DIR
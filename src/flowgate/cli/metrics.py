@@ -0,0 +1,79 @@
+"""
+Metrics command handler for FlowGate CLI.
+
+``flowgate metrics`` reports per-operation latency percentiles from the
+histograms kept next to the events log (see ``flowgate.core.latency``).
+"""
+
+from __future__ import annotations
+
+import sys
+import time
+from typing import Any, TextIO
+
+from flowgate.core.latency import (
+    LatencySummary,
+    latency_state_path,
+    read_latency_store,
+    window_seconds,
+)
+from flowgate.core.observability import flush_event_sinks
+from flowgate.cli.base import BaseCommand
+from flowgate.cli.error_handler import handle_command_errors
+from flowgate.cli.output import Output, command_id_from_args
+
+DEFAULT_WINDOWS = ("5m", "1h", "24h")
+
+
+class MetricsCommand(BaseCommand):
+    """Report latency percentiles per operation and time window."""
+
+    @handle_command_errors
+    def execute(self) -> int:
+        """Execute metrics command."""
+        stdout: TextIO = getattr(self.args, "stdout", None) or sys.stdout
+        stderr: TextIO = getattr(self.args, "stderr", None) or sys.stderr
+        output: Output = getattr(self.args, "_output", None) or Output.from_args(
+            self.args, stdout=stdout, stderr=stderr
+        )
+        windows = getattr(self.args, "window", None) or list(DEFAULT_WINDOWS)
+        operations = getattr(self.args, "operation", None)
+
+        # Include metrics this process has queued but not written yet.
+        flush_event_sinks()
+        store = read_latency_store(latency_state_path(self.config["paths"]["log_file"]))
+        now = time.time()
+        report: dict[str, dict[str, LatencySummary]] = {}
+        for window in windows:
+            histograms = store.window(window_seconds(window), now)
+            report[window] = {
+                operation: histograms[operation].summary()
+                for operation in sorted(histograms)
+                if operations is None or operation in operations
+            }
+
+        if output.format != "legacy":
+            data: dict[str, Any] = {"windows": report}
+            output.emit_envelope(
+                {
+                    "ok": True,
+                    "command": command_id_from_args(self.args),
+                    "data": data,
+                    "warnings": [],
+                    "errors": [],
+                }
+            )
+            return 0
+
+        for window, summaries in report.items():
+            if not summaries:
+                print(f"metrics.{window}=none", file=stdout)
+            for operation, summary in summaries.items():
+                print(
+                    f"metrics.{window}.{operation}=count={summary['count']} "
+                    f"mean_ms={summary['mean_ms']} p50_ms={summary['p50_ms']} "
+                    f"p90_ms={summary['p90_ms']} p99_ms={summary['p99_ms']} "
+                    f"max_ms={summary['max_ms']}",
+                    file=stdout,
+                )
+        return 0
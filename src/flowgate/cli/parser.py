@@ -10,6 +10,32 @@ from __future__ import annotations
 import argparse
 
 from flowgate.core.bootstrap import DEFAULT_CLIPROXY_REPO, DEFAULT_CLIPROXY_VERSION
+from flowgate.core.latency import window_seconds
+from flowgate.core.metricsinks import parse_address
+
+
+def _positive_int(value: str) -> int:
+    parsed = int(value)
+    if parsed < 1:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return parsed
+
+
+def _window(value: str) -> str:
+    try:
+        window_seconds(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
+    return value
+
+
+def _listen_address(value: str) -> tuple[str, int]:
+    try:
+        return parse_address(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "expected HOST:PORT, e.g. 127.0.0.1:9464"
+        ) from None
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -22,7 +48,8 @@ def build_parser() -> argparse.ArgumentParser:
   flowgate --config config/flowgate.yaml service start all
   flowgate --config config/flowgate.yaml auth login codex --timeout 180
   flowgate --config config/flowgate.yaml bootstrap download
-  flowgate --config config/flowgate.yaml doctor""",
+  flowgate --config config/flowgate.yaml doctor
+  flowgate --config config/flowgate.yaml --format json metrics --window 1h""",
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
     parser.add_argument(
@@ -54,6 +81,33 @@ def build_parser() -> argparse.ArgumentParser:
         default=False,
         help="Avoid unicode status icons in legacy output",
     )
+    parser.add_argument(
+        "--no-daemon",
+        action="store_true",
+        default=False,
+        help="Do not route status/health through a running flowgate daemon",
+    )
+    parser.add_argument(
+        "--trace-out",
+        metavar="FILE",
+        default=None,
+        help="Write a trace-event JSON trace of the command to FILE "
+        "(opens in Perfetto or chrome://tracing)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        help="Run the command under cProfile; writes a .pstats file and a "
+        "top-N cumulative summary to <runtime_dir>/profiles/",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        default=False,
+        help="Trace allocations with tracemalloc and report peak memory and "
+        "the top allocation sites to <runtime_dir>/profiles/",
+    )
 
     sub = parser.add_subparsers(dest="command", required=True, title="commands")
 
@@ -66,6 +120,78 @@ def build_parser() -> argparse.ArgumentParser:
         "doctor",
         help="Run diagnostics (config validation, dependency checks, permissions)",
     )
+    metrics = sub.add_parser(
+        "metrics",
+        help="Show per-operation latency percentiles (count, mean, p50/p90/p99, max)",
+    )
+    metrics.add_argument(
+        "--window",
+        action="append",
+        type=_window,
+        default=None,
+        help="Time window such as 5m, 1h or 7d; repeatable (default: 5m, 1h and 24h)",
+    )
+    metrics.add_argument(
+        "--operation",
+        action="append",
+        default=None,
+        help="Only report this operation (e.g. config_load); repeatable",
+    )
+    daemon = sub.add_parser(
+        "daemon",
+        help="Run a resident supervisor that serves status/health over a Unix socket",
+    )
+    daemon.add_argument(
+        "--health-ttl",
+        type=float,
+        default=5.0,
+        help="Seconds to reuse a health result before probing again (default: 5)",
+    )
+    daemon.add_argument(
+        "--watchdog",
+        action="store_true",
+        default=False,
+        help="Restart crashed services with exponential backoff",
+    )
+    daemon.add_argument(
+        "--restart-backoff",
+        type=float,
+        default=1.0,
+        help="Initial watchdog restart delay in seconds (default: 1)",
+    )
+    daemon.add_argument(
+        "--restart-backoff-max",
+        type=float,
+        default=60.0,
+        help="Maximum watchdog restart delay in seconds (default: 60)",
+    )
+    daemon.add_argument(
+        "--crash-loop-threshold",
+        type=_positive_int,
+        default=5,
+        help="Crashes within the window that stop automatic restarts (default: 5)",
+    )
+    daemon.add_argument(
+        "--crash-loop-window",
+        type=float,
+        default=300.0,
+        help="Crash-loop detection window in seconds (default: 300)",
+    )
+    daemon.add_argument(
+        "--sample-interval",
+        type=float,
+        default=0.0,
+        help="Sample per-service CPU/RSS/threads/fds from /proc every N seconds "
+        "(default: 0, disabled)",
+    )
+    daemon.add_argument(
+        "--metrics-listen",
+        type=_listen_address,
+        default=None,
+        metavar="HOST:PORT",
+        help="Serve OpenMetrics/Prometheus metrics at http://HOST:PORT/metrics "
+        "(default: disabled)",
+    )
 
     auth = sub.add_parser("auth", help="Authentication management")
     auth_sub = auth.add_subparsers(
@@ -128,6 +254,34 @@ def build_parser() -> argparse.ArgumentParser:
             default="all",
             help='Service name or "all" (default: all)',
         )
+        action_parser.add_argument(
+            "--max-parallel",
+            type=_positive_int,
+            default=4,
+            help="Maximum services to operate on concurrently (default: 4)",
+        )
+        action_parser.add_argument(
+            "--lock-timeout",
+            type=float,
+            default=60.0,
+            help=(
+                "Seconds to wait for another flowgate operation on the same "
+                "service (0: fail immediately; default: 60)"
+            ),
+        )
+        if action in ("start", "restart"):
+            action_parser.add_argument(
+                "--wait",
+                action="store_true",
+                default=False,
+                help="Wait until each service passes its readiness probe",
+            )
+            action_parser.add_argument(
+                "--wait-timeout",
+                type=float,
+                default=30.0,
+                help="Readiness wait deadline in seconds (default: 30)",
+            )
 
     bootstrap = sub.add_parser("bootstrap", help="Runtime environment initialization")
     bootstrap_sub = bootstrap.add_subparsers(
@@ -6,13 +6,31 @@ This module contains command handlers for starting, stopping, and restarting ser
 
 from __future__ import annotations
 
-import os
+import contextvars
 import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, TextIO
 
 from flowgate.core.config import ConfigError
 from flowgate.core.constants import CLIPROXYAPI_PLUS_SERVICE, DEFAULT_SERVICE_HOST
-from flowgate.core.process import ProcessSupervisor, is_port_available
+from flowgate.core.health import service_readiness_url, wait_for_readiness
+from flowgate.core.lifecycle import (
+    effective_service,
+    on_demand_services,
+    restart_service,
+    start_service,
+    stop_service,
+    warm_up,
+)
+from flowgate.core.process import (
+    DEFAULT_LOCK_TIMEOUT,
+    ProcessSupervisor,
+    ServiceBusyError,
+    is_port_available,
+)
 from flowgate.cli.base import BaseCommand
 from flowgate.cli.error_handler import handle_command_errors
 from flowgate.cli.helpers import maybe_print_update_notification
@@ -28,6 +46,248 @@ def _service_names(config: dict[str, Any], target: str) -> list[str]:
     return [target]
 
 
+DEFAULT_MAX_PARALLEL = 4
+
+
+@dataclass
+class _ServiceOutcome:
+    """Per-service result plus the legacy output lines it produced."""
+
+    result: dict[str, Any]
+    stdout_lines: list[str] = field(default_factory=list)
+    stderr_lines: list[str] = field(default_factory=list)
+    # Set when the operation already ran the warm-up (blue/green restart).
+    warmed: bool = False
+
+
+def _run_for_services(
+    names: list[str],
+    operation: Callable[[str], _ServiceOutcome],
+    *,
+    max_parallel: int,
+) -> list[_ServiceOutcome]:
+    """Run ``operation`` for each service on a bounded worker pool.
+
+    Outcomes are returned in ``names`` order regardless of completion order,
+    so output stays deterministic. A single worker runs inline. Workers run
+    in copies of the caller's context, so they log to the same events log
+    and their spans nest under the caller's.
+    """
+    workers = max(1, min(max_parallel, len(names)))
+    if workers == 1:
+        return [operation(name) for name in names]
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(
+        max_workers=workers, thread_name_prefix="flowgate-service"
+    ) as pool:
+        return list(pool.map(lambda name: context.copy().run(operation, name), names))
+
+
+def _run_backends_first(
+    config: dict[str, Any],
+    names: list[str],
+    operation: Callable[[str], _ServiceOutcome],
+    *,
+    max_parallel: int,
+) -> list[_ServiceOutcome]:
+    """Run ``operation`` for backends, then for the services that front them.
+
+    A front proxy started alongside its backends would accept connections it
+    cannot route yet, so it waits for the whole first phase to finish (and,
+    with ``--wait``, for the backends to become ready). Outcomes keep
+    ``names`` order.
+    """
+    fronts = [name for name in names if "backends" in config["services"][name]]
+    backends = [name for name in names if name not in fronts]
+    outcomes = dict(
+        zip(
+            backends,
+            _run_for_services(backends, operation, max_parallel=max_parallel),
+        )
+    )
+    outcomes.update(
+        zip(fronts, _run_for_services(fronts, operation, max_parallel=max_parallel))
+    )
+    return [outcomes[name] for name in names]
+
+
+def _emit_legacy_lines(
+    outcomes: list[_ServiceOutcome], *, stdout: TextIO, stderr: TextIO
+) -> None:
+    for outcome in outcomes:
+        for line in outcome.stdout_lines:
+            print(line, file=stdout)
+        for line in outcome.stderr_lines:
+            print(line, file=stderr)
+
+
+def _wait_until_ready(
+    supervisor: ProcessSupervisor,
+    name: str,
+    service: dict[str, Any],
+    *,
+    started_at: float,
+    timeout: float,
+    warm: bool = True,
+) -> dict[str, Any]:
+    """Block until the service is ready and record a service_ready event.
+
+    A service with a ``warmup`` section only counts as ready once its warm-up
+    requests have run.
+    """
+    url = service_readiness_url(service)
+    if url is None:
+        supervisor.record_event(
+            "service_ready", service=name, result="missing-port", detail=None
+        )
+        return {"ready": False, "reason": "missing-port", "time_to_ready_ms": None}
+
+    outcome = wait_for_readiness(
+        url,
+        timeout=timeout,
+        is_alive=lambda: supervisor.is_running(name),
+        started_at=started_at,
+    )
+    time_to_ready_ms = outcome["time_to_ready_ms"]
+    warmup = warm_up(supervisor, name, service) if outcome["ok"] and warm else None
+    if warmup is not None:
+        time_to_ready_ms = round((time.perf_counter() - started_at) * 1000, 2)
+    supervisor.record_event(
+        "service_ready",
+        service=name,
+        result="success" if outcome["ok"] else outcome["reason"],
+        detail=f"attempts={outcome['attempts']}",
+        extra={
+            "time_to_ready_ms": time_to_ready_ms,
+            "warmup_ms": warmup["duration_ms"] if warmup is not None else None,
+        },
+    )
+    readiness: dict[str, Any] = {
+        "ready": outcome["ok"],
+        "time_to_ready_ms": time_to_ready_ms,
+    }
+    if warmup is not None:
+        readiness["warmup"] = warmup
+    if not outcome["ok"]:
+        readiness["reason"] = outcome["reason"]
+    return readiness
+
+
+def _record_readiness(
+    outcome: _ServiceOutcome, name: str, readiness: dict[str, Any]
+) -> None:
+    outcome.result.update(readiness)
+    outcome.result["ok"] = bool(readiness["ready"])
+    if readiness["ready"]:
+        line = f"{name}:ready time_to_ready_ms={readiness['time_to_ready_ms']}"
+        if "warmup" in readiness:
+            line += f" warmup_ms={readiness['warmup']['duration_ms']}"
+        outcome.stdout_lines.append(line)
+    else:
+        outcome.stderr_lines.append(f"{name}:not-ready reason={readiness['reason']}")
+
+
+def _busy_outcome(name: str, action: str, exc: ServiceBusyError) -> _ServiceOutcome:
+    return _ServiceOutcome(
+        result={
+            "service": name,
+            "action": action,
+            "ok": False,
+            "reason": "busy",
+            "error": str(exc),
+        },
+        stderr_lines=[f"{name}:{action}-failed reason=busy"],
+    )
+
+
+def _start_or_restart(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    action: str,
+    wait: bool,
+    wait_timeout: float,
+) -> _ServiceOutcome:
+    """Start or restart one service; shared by the start/restart commands."""
+    started_at = time.perf_counter()
+    try:
+        # The port check must see the outcome of any concurrent start.
+        with supervisor.locked(name):
+            outcome = _launch(
+                config, supervisor, name, action=action, wait_timeout=wait_timeout
+            )
+    except ServiceBusyError as exc:
+        return _busy_outcome(name, action, exc)
+    if wait and outcome.result["ok"]:
+        service = effective_service(supervisor, name, config["services"][name])
+        readiness = _wait_until_ready(
+            supervisor,
+            name,
+            service,
+            started_at=started_at,
+            timeout=wait_timeout,
+            warm=not outcome.warmed,
+        )
+        _record_readiness(outcome, name, readiness)
+    return outcome
+
+
+def _launch(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    action: str,
+    wait_timeout: float,
+) -> _ServiceOutcome:
+    service = effective_service(supervisor, name, config["services"][name])
+    host = str(service.get("host", DEFAULT_SERVICE_HOST))
+    port = service.get("port")
+
+    # Check port availability if service is not currently running
+    if isinstance(port, int):
+        running = supervisor.is_running(name)
+        if not running and not is_port_available(host, port):
+            return _ServiceOutcome(
+                result={
+                    "service": name,
+                    "action": action,
+                    "ok": False,
+                    "reason": "port-in-use",
+                    "host": host,
+                    "port": port,
+                },
+                stderr_lines=[
+                    f"{name}:{action}-failed reason=port-in-use host={host} port={port}"
+                ],
+            )
+
+    warmed = False
+    if action == "restart":
+        # A blue/green restart warms the standby before switching traffic.
+        warmed = "proxy" in service and supervisor.is_running(name)
+        pid = restart_service(config, supervisor, name, timeout=wait_timeout)
+        verb = "restarted"
+    else:
+        pid = start_service(config, supervisor, name)
+        verb = "started"
+    # A blue/green restart moves the service to its other slot port.
+    service = effective_service(supervisor, name, config["services"][name])
+    return _ServiceOutcome(
+        result={
+            "service": name,
+            "action": action,
+            "ok": True,
+            "pid": pid,
+            "host": host,
+            "port": service.get("port"),
+        },
+        stdout_lines=[f"{name}:{verb} pid={pid}"],
+        warmed=warmed,
+    )
+
+
 class ServiceStartCommand(BaseCommand):
     """Start one or all services."""
 
@@ -43,64 +303,45 @@ class ServiceStartCommand(BaseCommand):
         supervisor = ProcessSupervisor(
             self.config["paths"]["runtime_dir"],
             events_log=self.config["paths"]["log_file"],
+            lock_timeout=float(
+                getattr(self.args, "lock_timeout", DEFAULT_LOCK_TIMEOUT)
+            ),
         )
         target = self.args.target
+        wait = bool(getattr(self.args, "wait", False))
+        wait_timeout = float(getattr(self.args, "wait_timeout", 30.0))
+        max_parallel = int(getattr(self.args, "max_parallel", DEFAULT_MAX_PARALLEL))
 
         names = _service_names(self.config, target)
+        if target == "all":
+            # A lazy front proxy starts these itself on the first connection.
+            on_demand = on_demand_services(self.config)
+            names = [name for name in names if name not in on_demand]
+
+        outcomes = _run_backends_first(
+            self.config,
+            names,
+            lambda name: _start_or_restart(
+                self.config,
+                supervisor,
+                name,
+                action="start",
+                wait=wait,
+                wait_timeout=wait_timeout,
+            ),
+            max_parallel=max_parallel,
+        )
+        results = [outcome.result for outcome in outcomes]
+        ok = all(result["ok"] for result in results)
+        started_cliproxy = any(
+            result["ok"] and result["service"] == CLIPROXYAPI_PLUS_SERVICE
+            for result in results
+        )
 
-        ok = True
-        started_cliproxy = False
-        results: list[dict[str, Any]] = []
-
-        for name in names:
-            service = self.config["services"][name]
-            args = service["command"]["args"]
-            cwd = service["command"].get("cwd")
-            host = str(service.get("host", DEFAULT_SERVICE_HOST))
-            port = service.get("port")
-            if cwd is None:
-                cwd = os.getcwd()
-
-            # Check port availability before starting
-            if isinstance(port, int):
-                running = supervisor.is_running(name)
-                if not running and not is_port_available(host, port):
-                    ok = False
-                    results.append(
-                        {
-                            "service": name,
-                            "action": "start",
-                            "ok": False,
-                            "reason": "port-in-use",
-                            "host": host,
-                            "port": port,
-                        }
-                    )
-                    if output.format == "legacy":
-                        print(
-                            f"{name}:start-failed reason=port-in-use host={host} port={port}",
-                            file=stderr,
-                        )
-                    continue
-
-            pid = supervisor.start(name, args, cwd=cwd)
-            results.append(
-                {
-                    "service": name,
-                    "action": "start",
-                    "ok": True,
-                    "pid": pid,
-                    "host": host,
-                    "port": port,
-                }
-            )
-            if output.format == "legacy":
-                print(f"{name}:started pid={pid}", file=stdout)
-            if name == CLIPROXYAPI_PLUS_SERVICE:
-                started_cliproxy = True
-
-        if output.format == "legacy" and started_cliproxy:
-            maybe_print_update_notification(self.config, stdout=stdout)
+        if output.format == "legacy":
+            _emit_legacy_lines(outcomes, stdout=stdout, stderr=stderr)
+            if started_cliproxy:
+                maybe_print_update_notification(self.config, stdout=stdout)
 
         if output.format != "legacy":
             output.emit_envelope(
@@ -130,28 +371,35 @@ class ServiceStopCommand(BaseCommand):
         supervisor = ProcessSupervisor(
             self.config["paths"]["runtime_dir"],
             events_log=self.config["paths"]["log_file"],
+            lock_timeout=float(
+                getattr(self.args, "lock_timeout", DEFAULT_LOCK_TIMEOUT)
+            ),
         )
         target = self.args.target
+        max_parallel = int(getattr(self.args, "max_parallel", DEFAULT_MAX_PARALLEL))
 
         names = _service_names(self.config, target)
 
-        ok = True
-        results: list[dict[str, Any]] = []
-        for name in names:
-            stopped = supervisor.stop(name)
-            results.append(
-                {
+        def stop_one(name: str) -> _ServiceOutcome:
+            try:
+                stopped = stop_service(self.config, supervisor, name)
+            except ServiceBusyError as exc:
+                return _busy_outcome(name, "stop", exc)
+            return _ServiceOutcome(
+                result={
                     "service": name,
                     "action": "stop",
                     "ok": bool(stopped),
-                }
+                },
+                stdout_lines=[f"{name}:{'stopped' if stopped else 'stop-failed'}"],
             )
-            if output.format == "legacy":
-                print(
-                    f"{name}:{'stopped' if stopped else 'stop-failed'}",
-                    file=stdout,
-                )
-            ok = ok and stopped
+
+        outcomes = _run_for_services(names, stop_one, max_parallel=max_parallel)
+        results = [outcome.result for outcome in outcomes]
+        ok = all(result["ok"] for result in results)
+
+        if output.format == "legacy":
+            _emit_legacy_lines(outcomes, stdout=stdout, stderr=stderr)
 
         if output.format != "legacy":
             output.emit_envelope(
@@ -181,57 +429,35 @@ class ServiceRestartCommand(BaseCommand):
         supervisor = ProcessSupervisor(
             self.config["paths"]["runtime_dir"],
             events_log=self.config["paths"]["log_file"],
+            lock_timeout=float(
+                getattr(self.args, "lock_timeout", DEFAULT_LOCK_TIMEOUT)
+            ),
         )
         target = self.args.target
+        wait = bool(getattr(self.args, "wait", False))
+        wait_timeout = float(getattr(self.args, "wait_timeout", 30.0))
+        max_parallel = int(getattr(self.args, "max_parallel", DEFAULT_MAX_PARALLEL))
 
         names = _service_names(self.config, target)
 
-        ok = True
-        results: list[dict[str, Any]] = []
-        for name in names:
-            service = self.config["services"][name]
-            args = service["command"]["args"]
-            cwd = service["command"].get("cwd")
-            host = str(service.get("host", DEFAULT_SERVICE_HOST))
-            port = service.get("port")
-            if cwd is None:
-                cwd = os.getcwd()
-
-            # Check port availability if service is not currently running
-            if isinstance(port, int):
-                running = supervisor.is_running(name)
-                if not running and not is_port_available(host, port):
-                    ok = False
-                    results.append(
-                        {
-                            "service": name,
-                            "action": "restart",
-                            "ok": False,
-                            "reason": "port-in-use",
-                            "host": host,
-                            "port": port,
-                        }
-                    )
-                    if output.format == "legacy":
-                        print(
-                            f"{name}:restart-failed reason=port-in-use host={host} port={port}",
-                            file=stderr,
-                        )
-                    continue
-
-            pid = supervisor.restart(name, args, cwd=cwd)
-            results.append(
-                {
-                    "service": name,
-                    "action": "restart",
-                    "ok": True,
-                    "pid": pid,
-                    "host": host,
-                    "port": port,
-                }
-            )
-            if output.format == "legacy":
-                print(f"{name}:restarted pid={pid}", file=stdout)
+        outcomes = _run_backends_first(
+            self.config,
+            names,
+            lambda name: _start_or_restart(
+                self.config,
+                supervisor,
+                name,
+                action="restart",
+                wait=wait,
+                wait_timeout=wait_timeout,
+            ),
+            max_parallel=max_parallel,
+        )
+        results = [outcome.result for outcome in outcomes]
+        ok = all(result["ok"] for result in results)
+
+        if output.format == "legacy":
+            _emit_legacy_lines(outcomes, stdout=stdout, stderr=stderr)
 
         if output.format != "legacy":
             output.emit_envelope(
@@ -3,7 +3,6 @@
 from __future__ import annotations
 
 import json
-import os
 import re
 import time
 from collections.abc import Callable
@@ -16,7 +15,9 @@ from flowgate.core.bootstrap import (
     http_get_json,
     validate_cliproxy_binary,
 )
+from flowgate.core.config import cliproxy_service_names
 from flowgate.core.constants import CLIPROXYAPI_PLUS_SERVICE
+from flowgate.core.lifecycle import restart_service
 from flowgate.core.process import ProcessSupervisor
 
 CHECK_CACHE_FILE = "cliproxyapiplus_update_cache.json"
@@ -231,8 +232,8 @@ def perform_update(
     latest_version: str,
     repo: str = DEFAULT_CLIPROXY_REPO,
     require_sha256: bool = False,
-) -> dict[str, Path | int | None]:
-    """Download/update CLIProxyAPIPlus and restart running service if needed."""
+) -> dict[str, Any]:
+    """Download/update CLIProxyAPIPlus and restart every running replica."""
     runtime_dir = config["paths"]["runtime_dir"]
     runtime_bin_dir = Path(runtime_dir) / "bin"
 
@@ -247,19 +248,17 @@ def perform_update(
 
     write_installed_version(runtime_dir, latest_version)
 
-    restarted_pid: int | None = None
     supervisor = ProcessSupervisor(
         runtime_dir,
         events_log=config["paths"]["log_file"],
     )
-    if supervisor.is_running(CLIPROXYAPI_PLUS_SERVICE):
-        service_cfg = config["services"].get(CLIPROXYAPI_PLUS_SERVICE, {})
-        args = service_cfg.get("command", {}).get("args", [])
-        cwd = service_cfg.get("command", {}).get("cwd") or os.getcwd()
-        pid = supervisor.restart(CLIPROXYAPI_PLUS_SERVICE, args, cwd=cwd)
-        restarted_pid = int(pid)
+    restarted: dict[str, int] = {}
+    for name in cliproxy_service_names(config["services"]):
+        if supervisor.is_running(name):
+            restarted[name] = int(restart_service(config, supervisor, name))
 
     return {
         "cliproxyapi_plus": cliproxy,
-        "restarted_pid": restarted_pid,
+        "restarted_pid": restarted.get(CLIPROXYAPI_PLUS_SERVICE),
+        "restarted_pids": restarted,
     }
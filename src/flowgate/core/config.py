@@ -4,11 +4,32 @@ from __future__ import annotations
 
 import copy
 import json
+import os
+import sys
 from pathlib import Path
 from typing import Any
 
-from flowgate.core.constants import DEFAULT_READINESS_PATH, DEFAULT_SERVICE_HOST
-from flowgate.core.observability import measure_time
+from flowgate.core.constants import (
+    CLIPROXYAPI_PLUS_SERVICE,
+    DEFAULT_BACKEND_PORT_OFFSET,
+    DEFAULT_DRAIN_SECONDS,
+    DEFAULT_EVENTS_FLUSH_INTERVAL,
+    DEFAULT_LAZY_IDLE_SECONDS,
+    DEFAULT_PROXY_HEALTH_INTERVAL,
+    DEFAULT_READINESS_PATH,
+    DEFAULT_SERVICE_HOST,
+    FRONT_PROXY_SERVICE,
+)
+from flowgate.core.eventlog import DEFAULT_KEEP_SEGMENTS, DEFAULT_SEGMENT_BYTES
+from flowgate.core.metricsinks import (
+    DEFAULT_MEMORY_CAPACITY,
+    DEFAULT_STATSD_ADDRESS,
+    DEFAULT_STATSD_PREFIX,
+    METRIC_SINK_TYPES,
+    parse_address,
+)
+from flowgate.core.observability import FSYNC_POLICIES, measure_time
+from flowgate.core.tuning import IO_CLASSES, split_cpus
 
 # ── Exceptions ────────────────────────────────────────────────
 
@@ -129,6 +150,7 @@ _ALLOWED_TOP_LEVEL_KEYS = {
     "cliproxyapi_plus",
     "auth",
     "secret_files",
+    "observability",
 }
 
 _REQUIRED_TOP_LEVEL_KEYS = {
@@ -140,7 +162,12 @@ _LATEST_CONFIG_VERSION = 3
 _SUPPORTED_CONFIG_VERSIONS = {3}
 
 
-def _parse_yaml_like(path: Path) -> dict[str, Any]:
+def parse_yaml_like(path: Path) -> dict[str, Any]:
+    """Read a YAML (or, without PyYAML, JSON) file whose top level is a mapping.
+
+    Raises:
+        ConfigError: If the file cannot be parsed or is not a mapping
+    """
     text = path.read_text(encoding="utf-8")
     try:
         import yaml  # type: ignore
@@ -185,7 +212,7 @@ def _derive_cliproxy_service(
     cliproxy_cfg_path = _resolve_path_relative_to_config(
         flowgate_config_path, config_file_raw.strip()
     )
-    cliproxy_cfg = _parse_yaml_like(cliproxy_cfg_path)
+    cliproxy_cfg = parse_yaml_like(cliproxy_cfg_path)
 
     host_raw = cliproxy_cfg.get("host", DEFAULT_SERVICE_HOST)
     host = str(host_raw).strip() if host_raw is not None else DEFAULT_SERVICE_HOST
@@ -218,6 +245,167 @@ def _derive_cliproxy_service(
     return service, cliproxy_cfg_path
 
 
+def replica_service_name(index: int) -> str:
+    """Service name of CLIProxyAPIPlus replica ``index`` (1-based)."""
+    if index == 1:
+        return CLIPROXYAPI_PLUS_SERVICE
+    return f"{CLIPROXYAPI_PLUS_SERVICE}_{index}"
+
+
+def cliproxy_service_names(services: dict[str, Any]) -> list[str]:
+    """Names of every CLIProxyAPIPlus instance (the primary plus any replicas)."""
+    return [
+        name
+        for name, service in services.items()
+        if name == CLIPROXYAPI_PLUS_SERVICE
+        or (isinstance(service, dict) and "replica" in service)
+    ]
+
+
+def _derive_replica_services(
+    *,
+    runtime_dir_path: Path,
+    cliproxy_service: dict[str, Any],
+    cliproxy_cfg_path: Path,
+    replicas: int,
+    base_port: int,
+) -> dict[str, Any]:
+    """Expand cliproxyapi_plus into ``replicas`` instances on consecutive ports.
+
+    Every replica is launched with its own derived copy of the CLIProxyAPIPlus
+    config, so each gets a distinct port, pid file and process log.
+    """
+    derived_dir = runtime_dir_path / "cliproxyapi"
+    services: dict[str, Any] = {}
+    for index in range(1, replicas + 1):
+        name = replica_service_name(index)
+        port = base_port + index - 1
+        args = list(cliproxy_service["command"]["args"])
+        args[-1] = str(derived_dir / f"{name}-{port}.yaml")
+        services[name] = {
+            **cliproxy_service,
+            "port": port,
+            "command": {"cwd": cliproxy_service["command"]["cwd"], "args": args},
+            "derived_config": {
+                "source": str(cliproxy_cfg_path),
+                "dir": str(derived_dir),
+            },
+            "replica": index,
+        }
+    return services
+
+
+def _derive_front_proxy_services(
+    *,
+    runtime_dir_path: Path,
+    cliproxy_service: dict[str, Any],
+    cliproxy_cfg_path: Path,
+    front_proxy: dict[str, Any],
+    replicas: int = 1,
+    flowgate_config_path: Path | None = None,
+) -> dict[str, Any]:
+    """Split cliproxyapi_plus into a FlowGate front proxy plus loopback backends.
+
+    The proxy takes over the public host/port from the CLIProxyAPIPlus config.
+    Each backend replica alternates between its own pair of ``backend_ports``
+    (blue/green slots), and is launched with a derived copy of the
+    CLIProxyAPIPlus config.
+    """
+    public_port = cliproxy_service["port"]
+    backend_ports = front_proxy.get("backend_ports")
+    if backend_ports is None:
+        base = public_port + DEFAULT_BACKEND_PORT_OFFSET
+        backend_ports = list(range(base, base + 2 * replicas))
+
+    derived_dir = runtime_dir_path / "cliproxyapi"
+    drain_seconds = float(front_proxy.get("drain_seconds", DEFAULT_DRAIN_SECONDS))
+    services: dict[str, Any] = {}
+    for index in range(1, replicas + 1):
+        name = replica_service_name(index)
+        slots = list(backend_ports[2 * (index - 1) : 2 * index])
+        backend_args = list(cliproxy_service["command"]["args"])
+        backend_args[-1] = str(derived_dir / f"{name}-{slots[0]}.yaml")
+        backend: dict[str, Any] = {
+            "host": DEFAULT_SERVICE_HOST,
+            "port": slots[0],
+            "readiness_path": cliproxy_service["readiness_path"],
+            "command": {
+                "cwd": cliproxy_service["command"]["cwd"],
+                "args": backend_args,
+            },
+            "derived_config": {
+                "source": str(cliproxy_cfg_path),
+                "dir": str(derived_dir),
+            },
+            "proxy": {
+                "service": FRONT_PROXY_SERVICE,
+                "ports": slots,
+                "drain_seconds": drain_seconds,
+                "hot_spare": bool(front_proxy.get("hot_spare", False)),
+            },
+        }
+        if replicas > 1:
+            backend["replica"] = index
+        services[name] = backend
+
+    routes_file = runtime_dir_path / "proxy" / "routes.json"
+    services[FRONT_PROXY_SERVICE] = {
+        "host": cliproxy_service["host"],
+        "port": public_port,
+        "readiness_path": cliproxy_service["readiness_path"],
+        "command": {
+            "cwd": cliproxy_service["command"]["cwd"],
+            "args": [
+                sys.executable,
+                "-m",
+                "flowgate.core.proxy",
+                "--routes",
+                str(routes_file),
+            ],
+        },
+        "routes_file": str(routes_file),
+        "backends": list(services),
+        "health_interval": float(
+            front_proxy.get("health_interval", DEFAULT_PROXY_HEALTH_INTERVAL)
+        ),
+    }
+    if front_proxy.get("lazy", False) and flowgate_config_path is not None:
+        # The proxy reloads this config to start backends through the supervisor.
+        services[FRONT_PROXY_SERVICE]["lazy"] = {
+            "config": str(flowgate_config_path.resolve()),
+            "idle_seconds": float(
+                front_proxy.get("idle_seconds", DEFAULT_LAZY_IDLE_SECONDS)
+            ),
+        }
+    return services
+
+
+def _assign_process_controls(
+    services: dict[str, Any], names: list[str], controls: dict[str, Any]
+) -> None:
+    """Attach ``controls`` to ``names``, giving each instance its own core set.
+
+    ``cpus: auto`` means every CPU FlowGate itself may run on, and is the
+    default for replicas. With several instances the CPU list is split into
+    disjoint contiguous sets, one per instance, so replicas do not compete
+    for the same cores.
+    """
+    cpus = controls.get("cpus")
+    if cpus == "auto":
+        cpus = sorted(
+            os.sched_getaffinity(0)
+            if hasattr(os, "sched_getaffinity")
+            else range(os.cpu_count() or 1)
+        )
+    core_sets = split_cpus(cpus, len(names)) if cpus is not None else None
+    for index, name in enumerate(names):
+        assigned = {key: value for key, value in controls.items() if value is not None}
+        if core_sets is not None:
+            assigned["cpus"] = core_sets[index]
+        if assigned:
+            services[name]["process_controls"] = assigned
+
+
 @measure_time("config_normalize")
 def _normalize_legacy_fields(data: dict[str, Any]) -> dict[str, Any]:
     normalized = dict(data)
@@ -244,7 +432,7 @@ def _normalize_legacy_fields(data: dict[str, Any]) -> dict[str, Any]:
 @measure_time("config_load")
 def load_router_config(path: str | Path) -> dict[str, Any]:
     path_obj = Path(path)
-    data = _normalize_legacy_fields(_parse_yaml_like(path_obj))
+    data = _normalize_legacy_fields(parse_yaml_like(path_obj))
 
     unknown = sorted(
         k
@@ -267,7 +455,76 @@ def load_router_config(path: str | Path) -> dict[str, Any]:
         paths=paths,
         cliproxy_section=cliproxy_section,
     )
-    services = {"cliproxyapi_plus": cliproxy_service}
+    services = {CLIPROXYAPI_PLUS_SERVICE: cliproxy_service}
+    ConfigValidator.validate_replicas(cliproxy_section)
+    replicas = int(cliproxy_section.get("replicas", 1))
+    runtime_dir_path = _resolve_path_relative_to_config(
+        path_obj, str(paths["runtime_dir"]).strip()
+    )
+    front_proxy_raw = cliproxy_section.get("front_proxy", {})
+    front_proxy = _ensure_mapping(front_proxy_raw, "cliproxyapi_plus.front_proxy")
+    ConfigValidator.validate_front_proxy(front_proxy, replicas=replicas)
+    if front_proxy.get("enabled", False):
+        services = _derive_front_proxy_services(
+            runtime_dir_path=runtime_dir_path,
+            cliproxy_service=cliproxy_service,
+            cliproxy_cfg_path=cliproxy_cfg_path,
+            front_proxy=front_proxy,
+            replicas=replicas,
+            flowgate_config_path=path_obj,
+        )
+    elif replicas > 1 or "base_port" in cliproxy_section:
+        services = _derive_replica_services(
+            runtime_dir_path=runtime_dir_path,
+            cliproxy_service=cliproxy_service,
+            cliproxy_cfg_path=cliproxy_cfg_path,
+            replicas=replicas,
+            base_port=int(cliproxy_section.get("base_port", cliproxy_service["port"])),
+        )
+    log_rotation_raw = cliproxy_section.get("log_rotation")
+    if log_rotation_raw is not None:
+        log_rotation = _ensure_mapping(
+            log_rotation_raw, "cliproxyapi_plus.log_rotation"
+        )
+        ConfigValidator.validate_log_rotation(log_rotation)
+        for service in services.values():
+            service["log_rotation"] = dict(log_rotation)
+    stop_drain = cliproxy_section.get("stop_drain_seconds")
+    if stop_drain is not None:
+        ConfigValidator.validate_stop_drain_seconds(stop_drain)
+        for service in services.values():
+            service["stop_drain_seconds"] = float(stop_drain)
+    controls_raw = cliproxy_section.get("process_controls")
+    instances = cliproxy_service_names(services)
+    if controls_raw is not None or len(instances) > 1:
+        controls = dict(
+            _ensure_mapping(
+                {} if controls_raw is None else controls_raw,
+                "cliproxyapi_plus.process_controls",
+            )
+        )
+        ConfigValidator.validate_process_controls(
+            controls, "cliproxyapi_plus.process_controls"
+        )
+        if len(instances) > 1:
+            # Replicas get disjoint cores unless cpus is set (null opts out).
+            controls.setdefault("cpus", "auto")
+        _assign_process_controls(services, instances, controls)
+    warmup_raw = cliproxy_section.get("warmup")
+    if warmup_raw is not None:
+        warmup = _ensure_mapping(warmup_raw, "cliproxyapi_plus.warmup")
+        ConfigValidator.validate_warmup(warmup)
+        for name in cliproxy_service_names(services):
+            services[name]["warmup"] = {
+                **warmup,
+                "api_keys_from": str(cliproxy_cfg_path),
+            }
+    proxy_controls_raw = front_proxy.get("process_controls")
+    if proxy_controls_raw is not None and FRONT_PROXY_SERVICE in services:
+        prefix = "cliproxyapi_plus.front_proxy.process_controls"
+        proxy_controls = _ensure_mapping(proxy_controls_raw, prefix)
+        ConfigValidator.validate_process_controls(proxy_controls, prefix)
+        _assign_process_controls(services, [FRONT_PROXY_SERVICE], proxy_controls)
     ConfigValidator.validate_services(services)
 
     auth_raw = data.get("auth", {})
@@ -279,13 +536,53 @@ def load_router_config(path: str | Path) -> dict[str, Any]:
     secret_files = data.get("secret_files", [])
     ConfigValidator.validate_secret_files(secret_files)
 
+    observability = _ensure_mapping(data.get("observability", {}), "observability")
+    ConfigValidator.validate_observability(observability)
+    events = observability.get("events", {})
+    segments = events.get("segments", {})
+    metrics = observability.get("metrics", {})
+    memory_sink = metrics.get("memory", {})
+    statsd_sink = metrics.get("statsd", {})
+
     return {
         "config_version": data["config_version"],
         "paths": paths,
         "services": services,
-        "cliproxyapi_plus": {"config_file": str(cliproxy_cfg_path)},
+        "cliproxyapi_plus": {
+            "config_file": str(cliproxy_cfg_path),
+            "replicas": replicas,
+        },
         "auth": {"providers": providers},
         "secret_files": secret_files,
+        "observability": {
+            "events": {
+                "flush_interval": float(
+                    events.get("flush_interval", DEFAULT_EVENTS_FLUSH_INTERVAL)
+                ),
+                "fsync": events.get("fsync", "never"),
+                "segments": {
+                    "max_bytes": segments.get("max_bytes", DEFAULT_SEGMENT_BYTES),
+                    "keep": segments.get("keep", DEFAULT_KEEP_SEGMENTS),
+                    "compress": segments.get("compress", True),
+                },
+            },
+            "metrics": {
+                "sinks": list(metrics.get("sinks", ["file"])),
+                "sample_rate": float(metrics.get("sample_rate", 1.0)),
+                "sample_rates": {
+                    operation: float(rate)
+                    for operation, rate in metrics.get("sample_rates", {}).items()
+                },
+                "memory": {
+                    "capacity": memory_sink.get("capacity", DEFAULT_MEMORY_CAPACITY)
+                },
+                "statsd": {
+                    "address": statsd_sink.get("address", DEFAULT_STATSD_ADDRESS),
+                    "prefix": statsd_sink.get("prefix", DEFAULT_STATSD_PREFIX),
+                    "dogstatsd": statsd_sink.get("dogstatsd", False),
+                },
+            },
+        },
     }
 
 
@@ -429,6 +726,409 @@ class ConfigValidator:
                 continue
             ConfigValidator.validate_service(name, svc)
 
+    @staticmethod
+    def validate_replicas(cliproxy_section: dict[str, Any]) -> None:
+        """Validate the replica fields of the cliproxyapi_plus section.
+
+        Optional fields:
+        - replicas: positive integer (default 1)
+        - base_port: port of the first replica; replica N listens on
+          ``base_port + N - 1`` (default: the CLIProxyAPIPlus config port)
+
+        Args:
+            cliproxy_section: The cliproxyapi_plus section from configuration
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        replicas = cliproxy_section.get("replicas", 1)
+        if not isinstance(replicas, int) or isinstance(replicas, bool) or replicas < 1:
+            raise ConfigError("cliproxyapi_plus.replicas must be a positive integer")
+
+        base_port = cliproxy_section.get("base_port")
+        if base_port is not None and (
+            not isinstance(base_port, int)
+            or isinstance(base_port, bool)
+            or not 1 <= base_port <= 65536 - replicas
+        ):
+            raise ConfigError(
+                "cliproxyapi_plus.base_port must leave room for every replica "
+                "port between 1 and 65535"
+            )
+
+    @staticmethod
+    def validate_front_proxy(front_proxy: dict[str, Any], *, replicas: int = 1) -> None:
+        """Validate the cliproxyapi_plus.front_proxy section.
+
+        Optional fields:
+        - enabled: boolean (default false)
+        - backend_ports: two distinct ports per replica, used as blue/green
+          backend slots
+        - drain_seconds: non-negative number
+        - health_interval: positive number of seconds between backend probes
+        - lazy: boolean; start backends on the first connection (default false)
+        - idle_seconds: positive number; with lazy, stop backends after this
+          long without connections (default 600)
+        - hot_spare: boolean; keep a ready standby per backend on its free
+          slot port for instant failover (default false, not with lazy)
+
+        Args:
+            front_proxy: The front_proxy section from configuration
+            replicas: Number of CLIProxyAPIPlus replicas behind the proxy
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        enabled = front_proxy.get("enabled", False)
+        if not isinstance(enabled, bool):
+            raise ConfigError("cliproxyapi_plus.front_proxy.enabled must be a boolean")
+
+        ports = front_proxy.get("backend_ports")
+        if ports is not None:
+            if (
+                not isinstance(ports, list)
+                or len(ports) != 2 * replicas
+                or not all(
+                    isinstance(p, int) and not isinstance(p, bool) and 1 <= p <= 65535
+                    for p in ports
+                )
+                or len(set(ports)) != len(ports)
+            ):
+                raise ConfigError(
+                    "cliproxyapi_plus.front_proxy.backend_ports must be two distinct "
+                    "ports between 1 and 65535 per replica"
+                )
+
+        drain = front_proxy.get("drain_seconds")
+        if drain is not None and (
+            not isinstance(drain, (int, float)) or isinstance(drain, bool) or drain < 0
+        ):
+            raise ConfigError(
+                "cliproxyapi_plus.front_proxy.drain_seconds must be a non-negative number"
+            )
+
+        interval = front_proxy.get("health_interval")
+        if interval is not None and (
+            not isinstance(interval, (int, float))
+            or isinstance(interval, bool)
+            or interval <= 0
+        ):
+            raise ConfigError(
+                "cliproxyapi_plus.front_proxy.health_interval must be a positive number"
+            )
+
+        lazy = front_proxy.get("lazy", False)
+        if not isinstance(lazy, bool):
+            raise ConfigError("cliproxyapi_plus.front_proxy.lazy must be a boolean")
+
+        hot_spare = front_proxy.get("hot_spare", False)
+        if not isinstance(hot_spare, bool):
+            raise ConfigError(
+                "cliproxyapi_plus.front_proxy.hot_spare must be a boolean"
+            )
+        if hot_spare and lazy:
+            raise ConfigError(
+                "cliproxyapi_plus.front_proxy.hot_spare cannot be combined with lazy"
+            )
+
+        idle = front_proxy.get("idle_seconds")
+        if idle is not None and (
+            not isinstance(idle, (int, float)) or isinstance(idle, bool) or idle <= 0
+        ):
+            raise ConfigError(
+                "cliproxyapi_plus.front_proxy.idle_seconds must be a positive number"
+            )
+
+    @staticmethod
+    def validate_log_rotation(log_rotation: dict[str, Any]) -> None:
+        """Validate the cliproxyapi_plus.log_rotation section.
+
+        At least one of max_bytes / interval_seconds is required.
+
+        Optional fields:
+        - max_bytes: positive integer; rotate once the log reaches this size
+        - interval_seconds: positive number; rotate logs older than this
+        - keep: positive integer number of rotated segments to retain (default 5)
+        - compress: boolean, gzip rotated segments (default true)
+
+        Args:
+            log_rotation: The log_rotation section from configuration
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        prefix = "cliproxyapi_plus.log_rotation"
+        max_bytes = log_rotation.get("max_bytes")
+        interval = log_rotation.get("interval_seconds")
+        if max_bytes is None and interval is None:
+            raise ConfigError(f"{prefix} requires max_bytes or interval_seconds")
+        for key, value in (
+            ("max_bytes", max_bytes),
+            ("keep", log_rotation.get("keep")),
+        ):
+            if value is not None and (
+                not isinstance(value, int) or isinstance(value, bool) or value < 1
+            ):
+                raise ConfigError(f"{prefix}.{key} must be a positive integer")
+        if interval is not None and (
+            not isinstance(interval, (int, float))
+            or isinstance(interval, bool)
+            or interval <= 0
+        ):
+            raise ConfigError(f"{prefix}.interval_seconds must be a positive number")
+        compress = log_rotation.get("compress")
+        if compress is not None and not isinstance(compress, bool):
+            raise ConfigError(f"{prefix}.compress must be a boolean")
+
+    @staticmethod
+    def validate_stop_drain_seconds(stop_drain: Any) -> None:
+        """Validate cliproxyapi_plus.stop_drain_seconds.
+
+        How long a stopping service may keep serving established connections
+        before it is killed; must be a non-negative number (0 disables draining).
+
+        Args:
+            stop_drain: The stop_drain_seconds value from configuration
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        if (
+            not isinstance(stop_drain, (int, float))
+            or isinstance(stop_drain, bool)
+            or stop_drain < 0
+        ):
+            raise ConfigError(
+                "cliproxyapi_plus.stop_drain_seconds must be a non-negative number"
+            )
+
+    @staticmethod
+    def validate_process_controls(controls: dict[str, Any], prefix: str) -> None:
+        """Validate a process_controls section.
+
+        Optional fields:
+        - cpus: list of CPU ids, or "auto" for every CPU available to FlowGate;
+          split into disjoint sets across replicas
+        - nice: integer between -20 and 19
+        - io_priority: mapping with class (realtime, best-effort, idle) and
+          level (0-7, default 4)
+        - max_open_files: positive integer (RLIMIT_NOFILE)
+        - max_address_space: positive integer number of bytes (RLIMIT_AS)
+
+        Args:
+            controls: The process_controls section from configuration
+            prefix: Dotted config path of the section, used in error messages
+
+        Raises:
+            ConfigError: If validation fails
+        """
+
+        def _is_int(value: Any) -> bool:
+            return isinstance(value, int) and not isinstance(value, bool)
+
+        cpus = controls.get("cpus")
+        if cpus is not None and cpus != "auto":
+            if (
+                not isinstance(cpus, list)
+                or not cpus
+                or not all(_is_int(cpu) and cpu >= 0 for cpu in cpus)
+            ):
+                raise ConfigError(
+                    f'{prefix}.cpus must be "auto" or a non-empty list of CPU ids'
+                )
+
+        nice = controls.get("nice")
+        if nice is not None and (not _is_int(nice) or not -20 <= nice <= 19):
+            raise ConfigError(f"{prefix}.nice must be an integer between -20 and 19")
+
+        io_priority = controls.get("io_priority")
+        if io_priority is not None:
+            if (
+                not isinstance(io_priority, dict)
+                or io_priority.get("class") not in IO_CLASSES
+            ):
+                classes = ", ".join(sorted(IO_CLASSES))
+                raise ConfigError(
+                    f"{prefix}.io_priority.class must be one of: {classes}"
+                )
+            level = io_priority.get("level")
+            if level is not None and (not _is_int(level) or not 0 <= level <= 7):
+                raise ConfigError(
+                    f"{prefix}.io_priority.level must be an integer between 0 and 7"
+                )
+
+        for key in ("max_open_files", "max_address_space"):
+            value = controls.get(key)
+            if value is not None and (not _is_int(value) or value < 1):
+                raise ConfigError(f"{prefix}.{key} must be a positive integer")
+
+    @staticmethod
+    def validate_warmup(warmup: dict[str, Any]) -> None:
+        """Validate the cliproxyapi_plus.warmup section.
+
+        Required fields:
+        - requests: non-empty list; each entry is a path (sent as GET) or a
+          mapping with path, optional method, JSON body and string headers
+
+        Optional fields:
+        - concurrency: positive integer, requests in flight at once (default 4)
+        - timeout: positive number of seconds per request (default 10)
+        - rounds: positive integer, times the request set is sent (default 2)
+
+        Args:
+            warmup: The warmup section from configuration
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        prefix = "cliproxyapi_plus.warmup"
+        requests = warmup.get("requests")
+        if not isinstance(requests, list) or not requests:
+            raise ConfigError(f"{prefix}.requests must be a non-empty list")
+        for index, entry in enumerate(requests):
+            name = f"{prefix}.requests[{index}]"
+            path = entry.get("path") if isinstance(entry, dict) else entry
+            if not isinstance(path, str) or not path.startswith("/"):
+                raise ConfigError(f"{name} must be a path starting with '/'")
+            if not isinstance(entry, dict):
+                continue
+            method = entry.get("method")
+            if method is not None and (not isinstance(method, str) or not method):
+                raise ConfigError(f"{name}.method must be a non-empty string")
+            headers = entry.get("headers", {})
+            if not isinstance(headers, dict) or not all(
+                isinstance(k, str) and isinstance(v, str) for k, v in headers.items()
+            ):
+                raise ConfigError(f"{name}.headers must map strings to strings")
+        for key in ("concurrency", "rounds"):
+            value = warmup.get(key)
+            if value is not None and (
+                not isinstance(value, int) or isinstance(value, bool) or value < 1
+            ):
+                raise ConfigError(f"{prefix}.{key} must be a positive integer")
+        timeout = warmup.get("timeout")
+        if timeout is not None and (
+            not isinstance(timeout, (int, float))
+            or isinstance(timeout, bool)
+            or timeout <= 0
+        ):
+            raise ConfigError(f"{prefix}.timeout must be a positive number")
+
+    @staticmethod
+    def validate_observability(observability: dict[str, Any]) -> None:
+        """Validate the observability section.
+
+        Optional fields:
+        - events.flush_interval: non-negative number of seconds between
+          batched events log writes (0 writes every event immediately)
+        - events.fsync: "never" or "batch" (fsync after every write)
+        - events.segments.max_bytes: positive integer; seal the events log
+          into an indexed segment at this size (default 64 MiB)
+        - events.segments.keep: positive integer number of sealed segments to
+          retain (default 20)
+        - events.segments.compress: boolean, gzip sealed segments (default true)
+        - metrics.sinks: list of metric sinks, each one of "file", "memory",
+          "statsd" or "null" (default ["file"])
+        - metrics.sample_rate: number in [0, 1], share of measurements kept
+          (default 1)
+        - metrics.sample_rates: mapping of operation name to a sample rate
+        - metrics.memory.capacity: positive integer, ring buffer size
+        - metrics.statsd.address: "HOST:PORT" (default 127.0.0.1:8125)
+        - metrics.statsd.prefix: string prepended to metric names
+        - metrics.statsd.dogstatsd: boolean, append DogStatsD tags
+
+        Args:
+            observability: The observability section from configuration
+
+        Raises:
+            ConfigError: If validation fails
+        """
+        events = observability.get("events", {})
+        ConfigValidator._validate_type(events, dict, "observability.events")
+        interval = events.get("flush_interval")
+        if interval is not None and (
+            not isinstance(interval, (int, float))
+            or isinstance(interval, bool)
+            or interval < 0
+        ):
+            raise ConfigError(
+                "observability.events.flush_interval must be a non-negative number"
+            )
+        fsync = events.get("fsync")
+        if fsync is not None and fsync not in FSYNC_POLICIES:
+            raise ConfigError(
+                f"observability.events.fsync must be one of: {', '.join(FSYNC_POLICIES)}"
+            )
+        segments = events.get("segments", {})
+        ConfigValidator._validate_type(segments, dict, "observability.events.segments")
+        for key in ("max_bytes", "keep"):
+            value = segments.get(key)
+            if value is not None and (
+                not isinstance(value, int) or isinstance(value, bool) or value < 1
+            ):
+                raise ConfigError(
+                    f"observability.events.segments.{key} must be a positive integer"
+                )
+        compress = segments.get("compress")
+        if compress is not None and not isinstance(compress, bool):
+            raise ConfigError(
+                "observability.events.segments.compress must be a boolean"
+            )
+
+        metrics = observability.get("metrics", {})
+        ConfigValidator._validate_type(metrics, dict, "observability.metrics")
+        sinks = metrics.get("sinks", ["file"])
+        if not isinstance(sinks, list) or not sinks:
+            raise ConfigError("observability.metrics.sinks must be a non-empty list")
+        for sink in sinks:
+            if sink not in METRIC_SINK_TYPES:
+                raise ConfigError(
+                    "observability.metrics.sinks entries must be one of: "
+                    f"{', '.join(METRIC_SINK_TYPES)}"
+                )
+        rates = metrics.get("sample_rates", {})
+        ConfigValidator._validate_type(
+            rates, dict, "observability.metrics.sample_rates"
+        )
+        for name, rate in [("sample_rate", metrics.get("sample_rate"))] + [
+            (f"sample_rates.{operation}", rate) for operation, rate in rates.items()
+        ]:
+            if rate is not None and (
+                not isinstance(rate, (int, float))
+                or isinstance(rate, bool)
+                or not 0 <= rate <= 1
+            ):
+                raise ConfigError(
+                    f"observability.metrics.{name} must be a number between 0 and 1"
+                )
+        memory = metrics.get("memory", {})
+        ConfigValidator._validate_type(memory, dict, "observability.metrics.memory")
+        capacity = memory.get("capacity")
+        if capacity is not None and (
+            not isinstance(capacity, int) or isinstance(capacity, bool) or capacity < 1
+        ):
+            raise ConfigError(
+                "observability.metrics.memory.capacity must be a positive integer"
+            )
+        statsd = metrics.get("statsd", {})
+        ConfigValidator._validate_type(statsd, dict, "observability.metrics.statsd")
+        address = statsd.get("address")
+        if address is not None:
+            try:
+                parse_address(address if isinstance(address, str) else "")
+            except ValueError:
+                raise ConfigError(
+                    "observability.metrics.statsd.address must be HOST:PORT"
+                ) from None
+        prefix = statsd.get("prefix")
+        if prefix is not None and not isinstance(prefix, str):
+            raise ConfigError("observability.metrics.statsd.prefix must be a string")
+        dogstatsd = statsd.get("dogstatsd")
+        if dogstatsd is not None and not isinstance(dogstatsd, bool):
+            raise ConfigError(
+                "observability.metrics.statsd.dogstatsd must be a boolean"
+            )
+
     @staticmethod
     def validate_auth_providers(providers_config: dict[str, Any]) -> None:
         """Validate the auth.providers configuration section.
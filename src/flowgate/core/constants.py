@@ -4,10 +4,22 @@ from types import MappingProxyType
 from typing import Final
 
 CLIPROXYAPI_PLUS_SERVICE: Final = "cliproxyapi_plus"
+FRONT_PROXY_SERVICE: Final = "flowgate_proxy"
 
 DEFAULT_SERVICE_HOST: Final = "127.0.0.1"
 DEFAULT_READINESS_PATH: Final = "/v1/models"
 
+# Front proxy backends listen on the public port plus this offset by default.
+DEFAULT_BACKEND_PORT_OFFSET: Final = 10000
+DEFAULT_DRAIN_SECONDS: Final = 1.0
+# Seconds between front proxy readiness probes of each backend.
+DEFAULT_PROXY_HEALTH_INTERVAL: Final = 2.0
+# Lazy front proxy: stop backends after this many seconds without connections.
+DEFAULT_LAZY_IDLE_SECONDS: Final = 600.0
+
+# Seconds between batched events log writes during CLI commands and the daemon.
+DEFAULT_EVENTS_FLUSH_INTERVAL: Final = 1.0
+
 DEFAULT_SERVICE_PORTS: MappingProxyType[str, int] = MappingProxyType(
     {
         CLIPROXYAPI_PLUS_SERVICE: 8317,
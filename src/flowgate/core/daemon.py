@@ -0,0 +1,162 @@
+"""Unix-socket transport for the resident FlowGate daemon.
+
+The daemon keeps config and supervisor state in memory and answers read-only
+CLI commands (``status``/``health``) without a cold start. The protocol is one
+JSON object per line in each direction:
+
+    -> {"argv": ["status"], "format": "json"}
+    <- {"exit_code": 0, "stdout": "...", "stderr": "", "server_ms": 0.21}
+
+A response without ``exit_code`` means the daemon declined the request and the
+client should run the command itself.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypedDict
+
+from flowgate.core.process import ProcessError
+
+DAEMON_COMMANDS = frozenset({"status", "health"})
+DEFAULT_CLIENT_TIMEOUT = 30.0
+_MAX_LINE = 1024 * 1024
+
+
+class DaemonResponse(TypedDict, total=False):
+    exit_code: int
+    stdout: str
+    stderr: str
+    server_ms: float
+    error: str
+
+
+def default_socket_path(config_path: str | Path) -> Path:
+    """Per-config socket path, derivable without loading the config.
+
+    Lives in ``$XDG_RUNTIME_DIR`` or, when that is unset, in a per-user
+    ``<tmp>/flowgate-<uid>/`` directory that only the user can enter.
+    """
+    resolved = str(Path(config_path).expanduser().resolve())
+    digest = hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:16]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = Path(runtime_dir) if runtime_dir else _fallback_socket_dir()
+    return base / f"flowgate-{digest}.sock"
+
+
+def _fallback_socket_dir() -> Path:
+    return Path(tempfile.gettempdir()) / f"flowgate-{os.getuid()}"
+
+
+def request_daemon(
+    socket_path: str | Path,
+    payload: dict[str, Any],
+    *,
+    timeout: float = DEFAULT_CLIENT_TIMEOUT,
+) -> DaemonResponse | None:
+    """Send one request; return None when no daemon is listening.
+
+    A socket owned by another user is treated as no daemon, so its answers
+    are never trusted.
+    """
+    try:
+        if os.stat(socket_path).st_uid != os.getuid():
+            return None
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(timeout)
+            conn.connect(str(socket_path))
+            conn.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+            with conn.makefile("rb") as reader:
+                line = reader.readline(_MAX_LINE)
+    except (FileNotFoundError, ConnectionRefusedError):
+        return None
+    except OSError:
+        # A wedged daemon must not break the CLI; fall back to a local run.
+        return None
+    try:
+        response = json.loads(line)
+    except ValueError:
+        return None
+    return response if isinstance(response, dict) else None
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        for line in iter(lambda: self.rfile.readline(_MAX_LINE), b""):
+            started = time.perf_counter()
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                response: dict[str, Any] = dict(self.server.dispatch(request))
+            except Exception as exc:  # noqa: BLE001
+                response = {"error": f"{type(exc).__name__}: {exc}"}
+            response["server_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingUnixStreamServer):
+    """Threaded Unix-socket server that hands each request to ``dispatch``."""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: str | Path,
+        dispatch: Callable[[dict[str, Any]], DaemonResponse],
+    ):
+        self.socket_path = Path(socket_path)
+        self.dispatch = dispatch
+        _claim_socket_path(self.socket_path)
+        # Bind with the final 0600 mode; a later chmod leaves a window in
+        # which other users could connect.
+        umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _Handler)
+        finally:
+            os.umask(umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _claim_socket_path(path: Path) -> None:
+    """Remove a stale socket file, refusing to evict a live daemon."""
+    if path.parent == _fallback_socket_dir():
+        _ensure_private_dir(path.parent)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return
+    if request_daemon(path, {"op": "ping"}, timeout=1.0) is not None:
+        raise ProcessError(f"FlowGate daemon already listening on {path}")
+    path.unlink()
+
+
+def _ensure_private_dir(path: Path) -> None:
+    """Create ``path`` as a 0700 directory, refusing one owned by someone else.
+
+    Raises:
+        ProcessError: If ``path`` is not a directory owned by this user
+    """
+    try:
+        path.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid():
+        raise ProcessError(f"Refusing daemon socket dir not owned by this user: {path}")
+    if stat.S_IMODE(info.st_mode) != 0o700:
+        os.chmod(path, 0o700)
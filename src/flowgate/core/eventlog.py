@@ -0,0 +1,524 @@
+"""Segmented events log with a sidecar index per sealed segment.
+
+The events log (``paths.log_file``) is the active segment. Once an append
+takes it to ``max_bytes`` it is sealed: renamed to ``<log>.<UTC timestamp>``.
+A background thread then indexes it into ``<segment>.idx.json``, gzips it
+when ``compress`` is set, and keeps only the newest ``keep`` sealed segments,
+so the append that crossed the threshold only pays for the rename. Writers
+open the log for every append, so the next record simply starts a new active
+segment. Segments not indexed yet (including any left by a process that
+exited mid-way) are read in full and finished by the next seal.
+
+An index records what a segment holds without reading it again:
+
+    {"file": "events.log.20260101T000000.000000Z.gz",
+     "first_ts": "...", "last_ts": "...", "lines": 81234, "bytes": 67108864,
+     "events": {"performance_metric": {"count": 512, "start": 0, "end": 9120}},
+     "operations": {"config_load": {"count": 12, "start": 40, "end": 7311}}}
+
+``start``/``end`` are byte offsets into the uncompressed segment spanning the
+first to the last matching line. :func:`read_events` uses them so time-range
+and event/operation queries open only the segments, and read only the byte
+ranges, that can match. The active segment has no index; it is bounded by
+``max_bytes`` and read directly (newest first from the end of the file).
+"""
+
+from __future__ import annotations
+
+import fcntl
+import gzip
+import json
+import math
+import os
+import re
+import shutil
+import threading
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, TypedDict, TypeVar
+
+DEFAULT_SEGMENT_BYTES = 64 * 1024 * 1024
+DEFAULT_KEEP_SEGMENTS = 20
+INDEX_SUFFIX = ".idx.json"
+
+# Bytes read per step by read_lines_reversed.
+_REVERSE_BLOCK_SIZE = 64 * 1024
+_CHUNK_SIZE = 64 * 1024
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SegmentPolicy:
+    """When to seal the active events log and how many segments to keep."""
+
+    max_bytes: int = DEFAULT_SEGMENT_BYTES
+    keep: int = DEFAULT_KEEP_SEGMENTS
+    compress: bool = True
+
+    @classmethod
+    def from_config(cls, section: dict[str, Any]) -> SegmentPolicy:
+        """Build a policy from a validated ``observability.events.segments``."""
+        return cls(
+            max_bytes=int(section.get("max_bytes", DEFAULT_SEGMENT_BYTES)),
+            keep=int(section.get("keep", DEFAULT_KEEP_SEGMENTS)),
+            compress=bool(section.get("compress", True)),
+        )
+
+
+class KeyRange(TypedDict):
+    """Where the lines of one event or operation sit in a segment."""
+
+    count: int
+    start: int
+    end: int
+
+
+class SegmentIndex(TypedDict):
+    """Sidecar index of one sealed segment."""
+
+    file: str
+    first_ts: str | None
+    last_ts: str | None
+    lines: int
+    bytes: int
+    events: dict[str, KeyRange]
+    operations: dict[str, KeyRange]
+
+
+def _index_pattern(log: Path) -> re.Pattern[str]:
+    return re.compile(
+        re.escape(log.name) + r"\.\d{8}T\d{6}\.\d{6}Z" + re.escape(INDEX_SUFFIX)
+    )
+
+
+def _segment_pattern(log: Path) -> re.Pattern[str]:
+    return re.compile(re.escape(log.name) + r"\.\d{8}T\d{6}\.\d{6}Z(\.gz)?")
+
+
+def _index_path(segment: Path) -> Path:
+    name = segment.name.removesuffix(".gz")
+    return segment.with_name(name + INDEX_SUFFIX)
+
+
+def sealed_segments(path: str | Path) -> list[tuple[Path, SegmentIndex]]:
+    """Sealed segments of the events log at ``path`` with their indexes, oldest
+    first. Segments whose index cannot be read are skipped."""
+    log = Path(path)
+    pattern = _index_pattern(log)
+    try:
+        # Timestamps sort lexically.
+        names = sorted(
+            entry.name
+            for entry in os.scandir(log.parent)
+            if pattern.fullmatch(entry.name)
+        )
+    except OSError:
+        return []
+    segments: list[tuple[Path, SegmentIndex]] = []
+    for name in names:
+        try:
+            index: SegmentIndex = json.loads((log.parent / name).read_text("utf-8"))
+        except (OSError, ValueError):
+            continue
+        segments.append((log.parent / index["file"], index))
+    return segments
+
+
+def pending_segments(path: str | Path) -> list[Path]:
+    """Sealed segments of the events log at ``path`` that have no index yet,
+    oldest first."""
+    log = Path(path)
+    pattern = _segment_pattern(log)
+    try:
+        names = {
+            entry.name
+            for entry in os.scandir(log.parent)
+            if pattern.fullmatch(entry.name)
+        }
+    except OSError:
+        return []
+    pending = []
+    for name in sorted(names, key=lambda n: n.removesuffix(".gz")):
+        if name.endswith(".gz") and name.removesuffix(".gz") in names:
+            continue  # compression was cut short; the original is complete
+        segment = log.parent / name
+        if not _index_path(segment).exists():
+            pending.append(segment)
+    return pending
+
+
+def build_index(lines: Iterable[bytes], file: str) -> SegmentIndex:
+    """Index the raw lines (newline included) of a segment."""
+    index: SegmentIndex = {
+        "file": file,
+        "first_ts": None,
+        "last_ts": None,
+        "lines": 0,
+        "bytes": 0,
+        "events": {},
+        "operations": {},
+    }
+    offset = 0
+    for raw in lines:
+        start, offset = offset, offset + len(raw)
+        try:
+            record = json.loads(raw)
+        except ValueError:
+            continue
+        if not isinstance(record, dict):
+            continue
+        index["lines"] += 1
+        timestamp = record.get("timestamp")
+        if isinstance(timestamp, str):
+            if index["first_ts"] is None:
+                index["first_ts"] = timestamp
+            index["last_ts"] = timestamp
+        for key, name in (
+            ("events", record.get("event")),
+            ("operations", record.get("operation")),
+        ):
+            if not isinstance(name, str):
+                continue
+            ranges: dict[str, KeyRange] = index[key]  # type: ignore[literal-required]
+            entry = ranges.setdefault(name, {"count": 0, "start": start, "end": 0})
+            entry["count"] += 1
+            entry["end"] = offset
+    index["bytes"] = offset
+    return index
+
+
+def seal(path: str | Path, policy: SegmentPolicy) -> Path | None:
+    """Seal the active events log if it reached ``policy.max_bytes``.
+
+    Only the rename happens here; :func:`finish_sealed` runs on a background
+    thread to index, compress and prune. Safe to call from several processes:
+    the first one seals, the others find a fresh active segment. Returns the
+    sealed (not yet indexed) segment, if any.
+    """
+    log = Path(path)
+    lock_path = log.with_name(log.name + ".lock")
+    fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if log.stat().st_size < policy.max_bytes:
+                return None
+        except FileNotFoundError:
+            return None
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        segment = log.with_name(f"{log.name}.{stamp}")
+        os.replace(log, segment)
+    finally:
+        os.close(fd)
+    # Not a daemon thread: an exiting CLI finishes the segment it sealed.
+    thread = threading.Thread(
+        target=finish_sealed, args=(log, policy), name="flowgate-events-seal"
+    )
+    with _FINISHERS_LOCK:
+        _FINISHERS[:] = [t for t in _FINISHERS if t.is_alive()]
+        _FINISHERS.append(thread)
+    thread.start()
+    return segment
+
+
+_FINISHERS: list[threading.Thread] = []
+_FINISHERS_LOCK = threading.Lock()
+
+
+def wait_for_sealing(timeout: float | None = None) -> None:
+    """Wait for this process's background :func:`finish_sealed` runs."""
+    with _FINISHERS_LOCK:
+        threads = list(_FINISHERS)
+    for thread in threads:
+        thread.join(timeout)
+
+
+def finish_sealed(path: str | Path, policy: SegmentPolicy) -> None:
+    """Index, compress and prune the sealed segments that have no index yet.
+
+    Runs are serialized across processes by ``<log>.seal.lock``; segments a
+    previous run did not finish are picked up too. Errors leave the segment
+    for the next run.
+    """
+    log = Path(path)
+    try:
+        fd = os.open(
+            log.with_name(log.name + ".seal.lock"), os.O_WRONLY | os.O_CREAT, 0o644
+        )
+    except OSError:
+        return
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        for segment in pending_segments(log):
+            opener = gzip.open if segment.suffix == ".gz" else open
+            with opener(segment, "rb") as f:
+                index = build_index(f, segment.name)
+            if policy.compress and segment.suffix != ".gz":
+                segment = _compress(segment)
+                index["file"] = segment.name
+            _write_index(_index_path(segment), index)
+        _prune(log, policy.keep)
+    except OSError:
+        return
+    finally:
+        os.close(fd)
+
+
+def _compress(segment: Path) -> Path:
+    target = segment.with_name(segment.name + ".gz")
+    tmp = segment.with_name(segment.name + ".gz.tmp")
+    try:
+        with segment.open("rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+        os.replace(tmp, target)
+    except OSError:
+        tmp.unlink(missing_ok=True)
+        return segment  # keep it uncompressed
+    segment.unlink()
+    return target
+
+
+def _write_index(path: Path, index: SegmentIndex) -> None:
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(json.dumps(index, ensure_ascii=True), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _prune(log: Path, keep: int) -> None:
+    segments = sealed_segments(log)
+    for segment, _ in segments[: max(len(segments) - keep, 0)]:
+        # Drop the index first: a segment without one is never read.
+        _index_path(segment).unlink(missing_ok=True)
+        segment.unlink(missing_ok=True)
+
+
+def read_lines_reversed(
+    path: str | Path,
+    *,
+    block_size: int = _REVERSE_BLOCK_SIZE,
+    start: int = 0,
+    end: int | None = None,
+) -> Iterator[str]:
+    """Yield the lines of ``path`` newest first, reading blocks from the end.
+
+    Only the blocks the caller actually consumes are read, so stopping early
+    costs time and memory proportional to the lines returned, not the file.
+    Lines are decoded as UTF-8 (invalid bytes replaced) without their newline.
+    ``start``/``end`` restrict reading to that byte range, which must begin
+    at the start of a line.
+
+    Raises:
+        OSError: If the file cannot be opened or read
+    """
+    with Path(path).open("rb") as f:
+        position = f.seek(0, os.SEEK_END) if end is None else end
+        # Head of a line whose remainder came in the previously read block.
+        tail = b""
+        while position > start:
+            step = min(block_size, position - start)
+            position -= step
+            f.seek(position)
+            block = f.read(step) + tail
+            lines = block.split(b"\n")
+            # The first piece may continue into the block before it.
+            tail = lines[0]
+            for line in reversed(lines[1:]):
+                if line:
+                    yield line.decode("utf-8", errors="replace")
+        if tail:
+            yield tail.decode("utf-8", errors="replace")
+
+
+def _read_lines(path: Path) -> Iterator[str]:
+    with path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield line.decode("utf-8", errors="replace")
+
+
+def _segment_lines(segment: Path, start: int, end: int | None) -> Iterator[str]:
+    """Stream the lines in bytes ``[start, end)`` of a sealed segment (to its
+    end when ``end`` is None)."""
+    opener = gzip.open if segment.suffix == ".gz" else open
+    with opener(segment, "rb") as f:
+        f.seek(start)
+        remaining = math.inf if end is None else end - start
+        while remaining > 0:
+            raw = f.readline(min(remaining, _CHUNK_SIZE))
+            if not raw:
+                break
+            remaining -= len(raw)
+            if raw.strip():
+                yield raw.decode("utf-8", errors="replace")
+
+
+def _utc(value: datetime | str | None) -> datetime | None:
+    """``value`` as an aware UTC datetime; naive values are taken as UTC.
+
+    ``Z`` and ``+00:00`` (or any other offset) compare correctly once
+    parsed, which plain string comparison does not guarantee.
+
+    Raises:
+        ValueError: If ``value`` is not an ISO 8601 timestamp
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _record_time(timestamp: object) -> datetime | None:
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return _utc(timestamp)
+    except ValueError:
+        return None
+
+
+def read_events(
+    path: str | Path,
+    *,
+    event: str | None = None,
+    operation: str | None = None,
+    since: datetime | str | None = None,
+    until: datetime | str | None = None,
+    newest_first: bool = False,
+    limit: int | None = None,
+) -> Iterator[dict[str, Any]]:
+    """Yield the records of the events log at ``path``, sealed segments included.
+
+    Records are filtered by ``event`` name, performance metric ``operation``
+    and ``since``/``until`` (inclusive bounds on ``timestamp``, compared as
+    UTC instants). Sealed segments whose index rules them out are never
+    opened, and segments are streamed rather than loaded. With
+    ``newest_first`` uncompressed segments are read backwards, so a caller
+    that stops early only reads the end of the log; gzipped segments are
+    read forward keeping at most ``limit`` matches. At most ``limit``
+    records are yielded.
+
+    Raises:
+        OSError: If a segment cannot be read
+        ValueError: If ``since``/``until`` is not an ISO 8601 timestamp
+    """
+    log = Path(path)
+    since_at, until_at = _utc(since), _utc(until)
+    needles = [json.dumps(name) for name in (event, operation) if name is not None]
+    remaining = limit
+
+    def selected(lines: Iterable[str]) -> Iterator[dict[str, Any]]:
+        for line in lines:
+            # Cheap pre-filter before parsing.
+            if any(needle not in line for needle in needles):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Skip malformed lines (e.g. a write in progress)
+                continue
+            if not isinstance(record, dict):
+                continue
+            if event is not None and record.get("event") != event:
+                continue
+            if operation is not None and record.get("operation") != operation:
+                continue
+            if since_at is not None or until_at is not None:
+                at = _record_time(record.get("timestamp"))
+                if at is None:
+                    continue
+                if since_at is not None and at < since_at:
+                    continue
+                if until_at is not None and at > until_at:
+                    continue
+            yield record
+
+    def newest_first_records(
+        segment: Path, start: int, end: int | None
+    ) -> Iterable[dict[str, Any]]:
+        if segment.suffix != ".gz":
+            return selected(read_lines_reversed(segment, start=start, end=end))
+        # gzip cannot be read backwards: stream it forward, keeping only the
+        # newest matches still wanted.
+        lines = _segment_lines(segment, start, end)
+        return reversed(deque(selected(lines), maxlen=remaining))
+
+    ranges: list[tuple[Path, int, int | None]] = []
+    for segment, index in sealed_segments(log):
+        span = _candidate_span(index, event, operation, since_at, until_at)
+        if span is not None:
+            ranges.append((segment, *span))
+    # Not indexed yet (sealing in progress): read them whole.
+    ranges.extend((segment, 0, None) for segment in pending_segments(log))
+    ranges.sort(key=lambda span: span[0].name.removesuffix(".gz"))
+
+    sources: list[Iterable[dict[str, Any]]] = []
+    if newest_first:
+        if log.exists():
+            sources.append(selected(read_lines_reversed(log)))
+        sources.extend(_lazy(newest_first_records, *span) for span in reversed(ranges))
+    else:
+        sources.extend(selected(_lazy(_segment_lines, *span)) for span in ranges)
+        if log.exists():
+            sources.append(selected(_read_lines(log)))
+
+    if remaining is not None and remaining <= 0:
+        return
+    for records in sources:
+        for record in records:
+            yield record
+            if remaining is not None:
+                remaining -= 1
+                if remaining <= 0:
+                    return
+
+
+def _lazy(
+    open_segment: Callable[[Path, int, int | None], Iterable[T]],
+    segment: Path,
+    start: int,
+    end: int | None,
+) -> Iterator[T]:
+    """Open a segment only once its contents are actually wanted."""
+    try:
+        yield from open_segment(segment, start, end)
+    except FileNotFoundError:
+        if end is not None or segment.suffix == ".gz":
+            raise
+        # Compressed since it was listed; the .gz holds the same lines.
+        yield from open_segment(segment.with_name(segment.name + ".gz"), start, end)
+
+
+def _candidate_span(
+    index: SegmentIndex,
+    event: str | None,
+    operation: str | None,
+    since_at: datetime | None,
+    until_at: datetime | None,
+) -> tuple[int, int] | None:
+    """Byte range of ``index``'s segment that can hold matches, or None."""
+    if since_at is not None:
+        last_at = _record_time(index["last_ts"])
+        if last_at is None or last_at < since_at:
+            return None
+    if until_at is not None:
+        first_at = _record_time(index["first_ts"])
+        if first_at is None or first_at > until_at:
+            return None
+    start, end = 0, index["bytes"]
+    for ranges, name in ((index["events"], event), (index["operations"], operation)):
+        if name is None:
+            continue
+        entry = ranges.get(name)
+        if entry is None:
+            return None
+        start, end = max(start, entry["start"]), min(end, entry["end"])
+    if start >= end:
+        return None
+    return start, end
@@ -3,11 +3,15 @@ from __future__ import annotations
 import os
 import shutil
 import socket
+import time
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any, Literal, TypedDict
 from urllib.error import HTTPError, URLError
 from urllib.request import urlopen
 
+from flowgate.core.constants import DEFAULT_READINESS_PATH, DEFAULT_SERVICE_HOST
+
 
 class HttpHealthResult(TypedDict):
     ok: bool
@@ -15,6 +19,17 @@ class HttpHealthResult(TypedDict):
     error: str | None
 
 
+class ReadinessWaitResult(TypedDict):
+    """Outcome of waiting for a service to pass its readiness probe."""
+
+    ok: bool
+    reason: Literal["ready", "timeout", "exited"]
+    time_to_ready_ms: float | None
+    attempts: int
+    status_code: int | None
+    error: str | None
+
+
 HealthStatus = Literal["healthy", "degraded", "unhealthy"]
 
 
@@ -45,6 +60,85 @@ def check_health_url(url: str, *, timeout: float = 1.0) -> bool:
     return check_http_health(url, timeout=timeout)["ok"]
 
 
+def service_readiness_url(service: dict[str, Any]) -> str | None:
+    """Build the readiness probe URL for a service, or None without a port."""
+    port = service.get("port")
+    if not isinstance(port, int):
+        return None
+    host = service.get("host", DEFAULT_SERVICE_HOST)
+    readiness_path = (
+        service.get("readiness_path")
+        or service.get("health_path")
+        or DEFAULT_READINESS_PATH
+    )
+    return f"http://{host}:{port}{readiness_path}"
+
+
+def wait_for_readiness(
+    url: str,
+    *,
+    timeout: float = 30.0,
+    is_alive: Callable[[], bool] | None = None,
+    started_at: float | None = None,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+    probe_timeout: float = 1.0,
+) -> ReadinessWaitResult:
+    """Probe ``url`` with exponential backoff until it is ready or the deadline passes.
+
+    Args:
+        url: Readiness URL (see ``service_readiness_url``)
+        timeout: Overall deadline in seconds
+        is_alive: Optional liveness callback; when it returns False the wait
+            fails fast with reason "exited"
+        started_at: ``time.perf_counter()`` value to measure time-to-ready
+            from (defaults to the start of this call)
+        initial_delay: First backoff delay in seconds (doubles per attempt)
+        max_delay: Upper bound for a single backoff delay
+        probe_timeout: Per-probe HTTP timeout in seconds
+
+    Returns:
+        ReadinessWaitResult describing the outcome
+    """
+    origin = time.perf_counter() if started_at is None else started_at
+    deadline = time.perf_counter() + max(timeout, 0.0)
+    delay = initial_delay
+    attempts = 0
+    last: HttpHealthResult = {"ok": False, "status_code": None, "error": None}
+
+    while True:
+        attempts += 1
+        remaining = deadline - time.perf_counter()
+        last = check_http_health(url, timeout=max(min(probe_timeout, remaining), 0.05))
+        if last["ok"]:
+            return {
+                "ok": True,
+                "reason": "ready",
+                "time_to_ready_ms": round((time.perf_counter() - origin) * 1000, 2),
+                "attempts": attempts,
+                "status_code": last["status_code"],
+                "error": None,
+            }
+        if is_alive is not None and not is_alive():
+            reason: Literal["timeout", "exited"] = "exited"
+            break
+        remaining = deadline - time.perf_counter()
+        if remaining <= 0:
+            reason = "timeout"
+            break
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+    return {
+        "ok": False,
+        "reason": reason,
+        "time_to_ready_ms": None,
+        "attempts": attempts,
+        "status_code": last["status_code"],
+        "error": last["error"],
+    }
+
+
 def check_disk_space(
     path: str | Path, threshold_percent: int = 20
 ) -> HealthCheckResult:
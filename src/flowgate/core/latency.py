@@ -0,0 +1,383 @@
+"""Per-operation latency histograms persisted next to the events log.
+
+Every ``performance_metric`` record written through an
+:class:`~flowgate.core.observability.EventSink` also updates a
+:class:`LatencyHistogram` for its operation (``config_load``,
+``service_start``, ``oauth_poll_status``, ...). ``flowgate metrics`` reports
+count, mean, p50/p90/p99 and max from them without reading the events log.
+
+Histograms are HDR-style: values are recorded in microseconds into
+log-linear buckets (32 linear sub-buckets per power of two), so memory is
+bounded by :data:`BUCKET_COUNT` counters and every percentile is within about
+3% of the exact value. Only buckets that were hit are stored, so a slot
+usually holds a handful of counters. Count, sum, min and max are kept exactly.
+
+To answer windowed queries, each operation keeps one histogram per minute
+for the last hour and one per hour for the last week, in ``latency.json`` in
+the events log's directory (the runtime dir by default):
+
+    {"minute": {"config_load": {"1767225600": {histogram}, ...}},
+     "hour": {"config_load": {"1767225600": {histogram}, ...}}}
+
+Each save appends only its own update, one line of the same shape, to
+``latency.json.journal``; readers merge the journal into ``latency.json``.
+Once the journal passes :data:`JOURNAL_COMPACT_BYTES` the saving writer folds
+it into ``latency.json``, drops expired slots and empties it. Writers and the
+compaction are serialized by a file lock, which readers share.
+"""
+
+from __future__ import annotations
+
+import fcntl
+import json
+import math
+import os
+import tempfile
+import time
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any, TypedDict
+
+LATENCY_STATE_FILE = "latency.json"
+JOURNAL_SUFFIX = ".journal"
+# Journal size at which a save folds it into the state file.
+JOURNAL_COMPACT_BYTES = 256 * 1024
+
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# Values are tracked up to ~19 hours; longer ones land in the last bucket.
+MAX_TRACKABLE_US = 1 << 36
+
+
+def bucket_index(value_us: int) -> int:
+    """Bucket holding ``value_us`` microseconds."""
+    value_us = min(max(value_us, 0), MAX_TRACKABLE_US - 1)
+    shift = max(value_us.bit_length() - SUB_BUCKET_BITS - 1, 0)
+    return shift * _SUB_BUCKETS + (value_us >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """``[low, high)`` microsecond range of bucket ``index``."""
+    shift = max(index // _SUB_BUCKETS - 1, 0)
+    low = (index - shift * _SUB_BUCKETS) << shift
+    return low, low + (1 << shift)
+
+
+BUCKET_COUNT = bucket_index(MAX_TRACKABLE_US - 1) + 1
+
+
+class LatencySummary(TypedDict):
+    """What ``flowgate metrics`` reports per operation and window."""
+
+    count: int
+    mean_ms: float | None
+    p50_ms: float | None
+    p90_ms: float | None
+    p99_ms: float | None
+    max_ms: float | None
+
+
+class LatencyHistogram:
+    """Log-bucketed histogram of durations in milliseconds.
+
+    ``counts`` maps bucket index to count and only holds buckets that were hit.
+    A sampled value is recorded with the weight ``1 / sample_rate``, so counts
+    (and sums) may be fractional; :meth:`summary` rounds the count.
+    """
+
+    __slots__ = ("counts", "count", "sum_ms", "min_ms", "max_ms")
+
+    def __init__(self) -> None:
+        self.counts: dict[int, float] = {}
+        self.count: float = 0
+        self.sum_ms = 0.0
+        self.min_ms: float | None = None
+        self.max_ms: float | None = None
+
+    def record(self, duration_ms: float, weight: float = 1) -> None:
+        duration_ms = max(duration_ms, 0.0)
+        index = bucket_index(round(duration_ms * 1000))
+        self.counts[index] = self.counts.get(index, 0) + weight
+        self.count += weight
+        self.sum_ms += duration_ms * weight
+        if self.min_ms is None or duration_ms < self.min_ms:
+            self.min_ms = duration_ms
+        if self.max_ms is None or duration_ms > self.max_ms:
+            self.max_ms = duration_ms
+
+    def merge(self, other: LatencyHistogram) -> None:
+        for index, n in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + n
+        self.count += other.count
+        self.sum_ms += other.sum_ms
+        for value in (other.min_ms, other.max_ms):
+            if value is None:
+                continue
+            if self.min_ms is None or value < self.min_ms:
+                self.min_ms = value
+            if self.max_ms is None or value > self.max_ms:
+                self.max_ms = value
+
+    def percentile(self, q: float) -> float | None:
+        """Value at percentile ``q`` (0-100): the middle of its bucket, clamped
+        to the exact min/max."""
+        if not self.count:
+            return None
+        rank = max(math.ceil(q / 100 * self.count), 1)
+        seen = 0
+        for index, n in sorted(self.counts.items()):
+            seen += n
+            if seen >= rank:
+                low, high = bucket_bounds(index)
+                value = (low + high - 1) / 2 / 1000
+                return min(max(value, self.min_ms or 0.0), self.max_ms or value)
+        return self.max_ms
+
+    def summary(self) -> LatencySummary:
+        def ms(value: float | None) -> float | None:
+            return round(value, 2) if value is not None else None
+
+        return {
+            "count": round(self.count),
+            "mean_ms": ms(self.sum_ms / self.count) if self.count else None,
+            "p50_ms": ms(self.percentile(50)),
+            "p90_ms": ms(self.percentile(90)),
+            "p99_ms": ms(self.percentile(99)),
+            "max_ms": ms(self.max_ms),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "count": self.count,
+            "sum_ms": self.sum_ms,
+            "min_ms": self.min_ms,
+            "max_ms": self.max_ms,
+            "buckets": {str(i): n for i, n in sorted(self.counts.items()) if n},
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencyHistogram:
+        histogram = cls()
+        for index, n in data.get("buckets", {}).items():
+            if n:
+                histogram.counts[int(index)] = _count(n)
+        histogram.count = _count(data.get("count", 0))
+        histogram.sum_ms = float(data.get("sum_ms", 0.0))
+        histogram.min_ms = data.get("min_ms")
+        histogram.max_ms = data.get("max_ms")
+        return histogram
+
+
+def _count(value: Any) -> float:
+    """A stored count: an int unless sampling made it fractional."""
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+# Slot length and retention (seconds) per resolution.
+RESOLUTIONS: dict[str, tuple[int, int]] = {
+    "minute": (60, 3600),
+    "hour": (3600, 7 * 86400),
+}
+MAX_WINDOW_SECONDS = RESOLUTIONS["hour"][1]
+
+
+class LatencyStore:
+    """Histograms per resolution, operation and slot start (epoch seconds)."""
+
+    def __init__(self) -> None:
+        self.slots: dict[str, dict[str, dict[int, LatencyHistogram]]] = {
+            resolution: {} for resolution in RESOLUTIONS
+        }
+
+    def add(
+        self, operation: str, duration_ms: float, at: float, weight: float = 1
+    ) -> None:
+        for resolution, (length, _) in RESOLUTIONS.items():
+            slots = self.slots[resolution].setdefault(operation, {})
+            start = int(at // length * length)
+            slots.setdefault(start, LatencyHistogram()).record(duration_ms, weight)
+
+    def merge(self, other: LatencyStore) -> None:
+        for resolution, operations in other.slots.items():
+            for operation, slots in operations.items():
+                mine = self.slots[resolution].setdefault(operation, {})
+                for start, histogram in slots.items():
+                    mine.setdefault(start, LatencyHistogram()).merge(histogram)
+
+    def prune(self, now: float) -> None:
+        for resolution, (length, retention) in RESOLUTIONS.items():
+            operations = self.slots[resolution]
+            for operation in list(operations):
+                slots = operations[operation]
+                for start in [s for s in slots if s + length <= now - retention]:
+                    del slots[start]
+                if not slots:
+                    del operations[operation]
+
+    def window(self, seconds: float, now: float) -> dict[str, LatencyHistogram]:
+        """Merged histogram per operation over the last ``seconds``.
+
+        Windows up to an hour use minute slots, longer ones hour slots, so the
+        window is rounded out to whole slots.
+        """
+        resolution = "minute" if seconds <= RESOLUTIONS["minute"][1] else "hour"
+        length = RESOLUTIONS[resolution][0]
+        merged: dict[str, LatencyHistogram] = {}
+        for operation, slots in self.slots[resolution].items():
+            for start, histogram in slots.items():
+                if start + length > now - seconds:
+                    merged.setdefault(operation, LatencyHistogram()).merge(histogram)
+        return merged
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            resolution: {
+                operation: {
+                    str(start): h.to_dict() for start, h in sorted(slots.items())
+                }
+                for operation, slots in sorted(operations.items())
+            }
+            for resolution, operations in self.slots.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> LatencyStore:
+        store = cls()
+        for resolution in RESOLUTIONS:
+            for operation, slots in data.get(resolution, {}).items():
+                store.slots[resolution][operation] = {
+                    int(start): LatencyHistogram.from_dict(h)
+                    for start, h in slots.items()
+                }
+        return store
+
+
+def latency_state_path(events_log: str | Path) -> Path:
+    """Where the histograms of the events log at ``events_log`` are kept."""
+    return Path(events_log).with_name(LATENCY_STATE_FILE)
+
+
+def _journal_path(path: Path) -> Path:
+    return path.with_name(path.name + JOURNAL_SUFFIX)
+
+
+def _lock(path: Path, operation: int) -> int | None:
+    """Hold ``path``'s lock file; None when it cannot be opened (read-only)."""
+    try:
+        fd = os.open(
+            path.with_name(path.name + ".lock"), os.O_WRONLY | os.O_CREAT, 0o644
+        )
+    except OSError:
+        if operation == fcntl.LOCK_SH:
+            return None
+        raise
+    fcntl.flock(fd, operation)
+    return fd
+
+
+def _read_store(path: Path) -> LatencyStore:
+    """State file plus journal; call with the lock held."""
+    try:
+        data = json.loads(path.read_text("utf-8"))
+    except (OSError, ValueError):
+        data = None
+    store = LatencyStore.from_dict(data) if isinstance(data, dict) else LatencyStore()
+    try:
+        with _journal_path(path).open("rb") as journal:
+            for line in journal:
+                try:
+                    update = json.loads(line)
+                except ValueError:
+                    # A save cut short; the rest of the journal is intact.
+                    continue
+                if isinstance(update, dict):
+                    store.merge(LatencyStore.from_dict(update))
+    except OSError:
+        pass
+    return store
+
+
+def read_latency_store(path: str | Path) -> LatencyStore:
+    """Persisted histograms; empty when nothing was recorded yet."""
+    target = Path(path)
+    lock = _lock(target, fcntl.LOCK_SH)
+    try:
+        return _read_store(target)
+    finally:
+        if lock is not None:
+            os.close(lock)
+
+
+def record_latencies(
+    path: str | Path,
+    samples: Iterable[tuple[str, float, float] | tuple[str, float, float, float]],
+) -> None:
+    """Add ``(operation, duration_ms, epoch seconds[, weight])`` samples to
+    ``path``. ``weight`` (default 1) is how many values a sample stands for.
+
+    Only the update is written (appended to the journal), so a save costs
+    the size of its samples, not of the stored history.
+
+    Raises:
+        OSError: If the state file cannot be locked or written
+    """
+    update = LatencyStore()
+    for sample in samples:
+        update.add(*sample)
+    target = Path(path)
+    journal = _journal_path(target)
+    line = json.dumps(update.to_dict(), separators=(",", ":")).encode("utf-8")
+    lock = _lock(target, fcntl.LOCK_EX)
+    assert lock is not None
+    try:
+        fd = os.open(journal, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            os.write(fd, line + b"\n")
+            size = os.fstat(fd).st_size
+        finally:
+            os.close(fd)
+        if size >= JOURNAL_COMPACT_BYTES:
+            _compact(target)
+    finally:
+        os.close(lock)
+
+
+def _compact(path: Path) -> None:
+    """Fold the journal into the state file; call with the lock held."""
+    store = _read_store(path)
+    store.prune(time.time())
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            # dumps uses the C encoder; dump to a file does not.
+            handle.write(json.dumps(store.to_dict(), separators=(",", ":")))
+        os.replace(tmp, path)
+    except OSError:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    # Every journaled update is in the state file now.
+    os.truncate(_journal_path(path), 0)
+
+
+_WINDOW_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def window_seconds(label: str) -> float:
+    """Seconds in a window label such as ``90s``, ``5m``, ``1h`` or ``7d``.
+
+    Raises:
+        ValueError: If the label is malformed, not positive or longer than the
+            histograms are kept
+    """
+    unit = _WINDOW_UNITS.get(label[-1:])
+    try:
+        amount = float(label[:-1])
+    except ValueError:
+        amount = math.nan
+    if unit is None or not amount > 0:
+        raise ValueError(f"invalid window {label!r} (expected e.g. 5m, 1h, 7d)")
+    seconds = amount * unit
+    if seconds > MAX_WINDOW_SECONDS:
+        raise ValueError(f"window {label!r} exceeds the 7d histogram retention")
+    return seconds
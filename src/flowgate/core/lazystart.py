@@ -0,0 +1,190 @@
+"""Lazy start and idle stop of the backends behind the front proxy.
+
+With ``front_proxy.lazy: true`` the front proxy keeps the public port bound
+while the CLIProxyAPIPlus backends are down. The first connection starts them
+through ``start_service`` (the same path as ``flowgate service start``), waits
+for their readiness probes and warm-up requests and is then forwarded;
+connections arriving meanwhile queue behind the same start. Once no connection has been open for
+``idle_seconds`` the backends are stopped again.
+
+Both sides are measured in the events log:
+
+- ``lazy_start``: ``cold_start_ms`` from the first connection to all backends
+  ready, plus the services that were started; or, per backend, a failed
+  start. After a failed start the next connection tries again.
+- ``lazy_idle_stop`` (one per backend): ``rss_kb`` freed and ``idle_ms``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Callable
+from typing import Any
+
+from flowgate.core.config import load_router_config
+from flowgate.core.constants import FRONT_PROXY_SERVICE
+from flowgate.core.health import service_readiness_url, wait_for_readiness
+from flowgate.core.lifecycle import (
+    DEFAULT_SWITCH_TIMEOUT,
+    service_port,
+    start_service,
+    warm_up,
+)
+from flowgate.core.process import ProcessSupervisor
+from flowgate.core.sampler import read_proc_sample
+
+
+class LazyBackends:
+    """Start the proxy's backends on demand and stop them when idle."""
+
+    def __init__(
+        self,
+        config: dict[str, Any],
+        supervisor: ProcessSupervisor,
+        *,
+        idle_seconds: float,
+        start_timeout: float = DEFAULT_SWITCH_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.config = config
+        self.supervisor = supervisor
+        self.idle_seconds = idle_seconds
+        self.start_timeout = start_timeout
+        self.backends: list[str] = list(
+            config["services"][FRONT_PROXY_SERVICE].get("backends", [])
+        )
+        self._clock = clock
+        self._last_active = clock()
+        # None until the first check: backends may already be running.
+        self._running: bool | None = None
+        self._lock = asyncio.Lock()
+
+    @classmethod
+    def from_routes(cls, section: dict[str, Any]) -> LazyBackends:
+        """Build from the ``lazy`` section the proxy finds in its routes file."""
+        config = load_router_config(section["config"])
+        supervisor = ProcessSupervisor(
+            config["paths"]["runtime_dir"], events_log=config["paths"]["log_file"]
+        )
+        return cls(config, supervisor, idle_seconds=float(section["idle_seconds"]))
+
+    def touch(self) -> None:
+        """Restart the idle clock (called as connections open and close)."""
+        self._last_active = self._clock()
+
+    async def ensure_started(self, on_started: Callable[[], None]) -> None:
+        """Start any stopped backend and wait until all are ready.
+
+        ``on_started`` runs after a cold start, so the proxy can pick up the
+        rewritten routes before forwarding.
+        """
+        self.touch()
+        if self._running:
+            return
+        async with self._lock:
+            if self._running:
+                return
+            started_at = time.perf_counter()
+            started, ready = await asyncio.to_thread(self._start_all, started_at)
+            if started:
+                on_started()
+            if not ready:
+                # Leave _running unset so the next connection tries again.
+                return
+            self._running = True
+            if started:
+                self.supervisor.record_event(
+                    "lazy_start",
+                    service=FRONT_PROXY_SERVICE,
+                    detail=",".join(started),
+                    extra={"cold_start_ms": _elapsed_ms(started_at)},
+                )
+
+    def _start_all(self, started_at: float) -> tuple[list[str], bool]:
+        """Start the stopped backends; return them and whether all are ready."""
+        stopped = [
+            name for name in self.backends if not self.supervisor.is_running(name)
+        ]
+        started: list[str] = []
+        ready = True
+        for name in stopped:
+            try:
+                start_service(self.config, self.supervisor, name)
+            except Exception as exc:  # noqa: BLE001
+                self._record_failure(name, f"start failed: {exc}")
+                ready = False
+                continue
+            started.append(name)
+        # Backends boot concurrently; wait for each in turn.
+        for name in started:
+            service = self.config["services"][name]
+            port = service_port(self.supervisor, name, service)
+            url = service_readiness_url({**service, "port": port})
+            if url is None:
+                if not self.supervisor.is_running(name):
+                    self._record_failure(name, "process_exited")
+                    ready = False
+                continue
+            readiness = wait_for_readiness(
+                url,
+                timeout=self.start_timeout,
+                is_alive=lambda name=name: self.supervisor.is_running(name),
+                started_at=started_at,
+            )
+            if readiness["ok"]:
+                warm_up(self.supervisor, name, service, port=port)
+            else:
+                self._record_failure(name, str(readiness["reason"]))
+                ready = False
+        return started, ready
+
+    def _record_failure(self, name: str, detail: str) -> None:
+        self.supervisor.record_event(
+            "lazy_start", service=name, result="failed", detail=detail
+        )
+
+    async def run(self, active_connections: Callable[[], int]) -> None:
+        """Stop the backends after ``idle_seconds`` without connections."""
+        if self._running is None:
+            self._running = await asyncio.to_thread(
+                lambda: any(self.supervisor.is_running(n) for n in self.backends)
+            )
+        while True:
+            remaining = self.idle_seconds - (self._clock() - self._last_active)
+            await asyncio.sleep(max(remaining, min(self.idle_seconds, 1.0)))
+            if active_connections():
+                self.touch()
+                continue
+            if not self._running or self._idle_for() < self.idle_seconds:
+                continue
+            async with self._lock:
+                # A connection may have arrived while we waited for the lock.
+                if active_connections() or self._idle_for() < self.idle_seconds:
+                    continue
+                await asyncio.to_thread(self._stop_all, self._idle_for())
+                self._running = False
+
+    def _idle_for(self) -> float:
+        return self._clock() - self._last_active
+
+    def _stop_all(self, idle: float) -> None:
+        for name in self.backends:
+            pid = self.supervisor.read_pid(name)
+            if pid is None or not self.supervisor.is_running(name):
+                continue
+            sample = read_proc_sample(pid)
+            self.supervisor.stop(name)
+            self.supervisor.record_event(
+                "lazy_idle_stop",
+                service=name,
+                detail=f"pid={pid}",
+                extra={
+                    "rss_kb": sample.rss_kb if sample is not None else None,
+                    "idle_ms": round(idle * 1000, 2),
+                },
+            )
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
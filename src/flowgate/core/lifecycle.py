@@ -0,0 +1,607 @@
+"""Service start/restart orchestration on top of ProcessSupervisor.
+
+Plain services are started and restarted directly by the supervisor; replicas
+of ``cliproxyapi_plus`` first get their derived config (own port) written. When
+``cliproxyapi_plus.front_proxy`` is enabled, the backend service carries a
+``proxy`` section and is restarted blue/green:
+
+1. start a standby instance on the other backend slot port
+2. wait for the standby to pass readiness and run its warm-up requests
+3. atomically rewrite the proxy routes file to point at the standby
+4. give in-flight requests ``drain_seconds`` to finish, then stop the old one
+5. promote the standby to the service name
+
+With ``front_proxy.hot_spare`` each backend also keeps a ready standby,
+``<name>.spare``, on its free slot port. It is listed in the routes file as a
+``standby`` backend, so the proxy moves traffic to it as soon as the primary
+stops answering. :func:`failover` then promotes it to the service name (the
+watchdog does this right after a crash) and a new spare is spawned. Operations
+on a spare run under its primary's lock.
+
+The front proxy itself is replaced by starting a second proxy that inherits
+the listening socket from the first one, so queued connections are never reset.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+from collections.abc import Callable
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from flowgate.core.config import parse_yaml_like
+from flowgate.core.constants import DEFAULT_PROXY_HEALTH_INTERVAL, DEFAULT_SERVICE_HOST
+from flowgate.core.health import service_readiness_url, wait_for_readiness
+from flowgate.core.logcollector import LogRotationPolicy
+from flowgate.core.process import ProcessError, ProcessSupervisor
+from flowgate.core.proxy import proxy_state_path, read_routes, write_routes
+from flowgate.core.tuning import ProcessControls
+from flowgate.core.warmup import WarmupPlan, WarmupResult, run_warmup
+
+STANDBY_SUFFIX = ".standby"
+SPARE_SUFFIX = ".spare"
+DEFAULT_SWITCH_TIMEOUT = 30.0
+
+
+def service_port(
+    supervisor: ProcessSupervisor, name: str, service: dict[str, Any]
+) -> int | None:
+    """Port the running instance actually listens on (falls back to config)."""
+    recorded = supervisor.service_port(name)
+    if isinstance(recorded, int) and not isinstance(recorded, bool):
+        return recorded
+    port = service.get("port")
+    return port if isinstance(port, int) else None
+
+
+def on_demand_services(config: dict[str, Any]) -> set[str]:
+    """Backends a lazy front proxy starts on the first connection."""
+    return {
+        backend
+        for service in config["services"].values()
+        if isinstance(service, dict) and "lazy" in service
+        for backend in service.get("backends", [])
+    }
+
+
+def spare_name(name: str) -> str:
+    """Pid name of the hot spare backing up ``name``."""
+    return f"{name}{SPARE_SUFFIX}"
+
+
+def has_hot_spare(service: dict[str, Any]) -> bool:
+    return bool(service.get("proxy", {}).get("hot_spare"))
+
+
+def effective_service(
+    supervisor: ProcessSupervisor, name: str, service: dict[str, Any]
+) -> dict[str, Any]:
+    """Copy of ``service`` with ``port`` set to the live instance's port."""
+    port = service_port(supervisor, name, service)
+    if port == service.get("port"):
+        return service
+    return {**service, "port": port}
+
+
+def materialize_backend_config(name: str, service: dict[str, Any], port: int) -> Path:
+    """Write a copy of the CLIProxyAPIPlus config that listens on ``port``.
+
+    The copy is JSON, which CLIProxyAPIPlus reads as YAML. It holds the
+    API keys and management secret of the source, so it is created 0600.
+    """
+    derived = service["derived_config"]
+    data = parse_yaml_like(Path(derived["source"]))
+    data["host"] = str(service.get("host", DEFAULT_SERVICE_HOST))
+    data["port"] = port
+    target = Path(derived["dir"]) / f"{name}-{port}.yaml"
+    target.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+    # mkstemp creates the file 0600 before any secret is written to it.
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(data, handle, indent=2)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    return target
+
+
+def _backend_args(name: str, service: dict[str, Any], port: int) -> list[str]:
+    args = list(service["command"]["args"])
+    args[-1] = str(materialize_backend_config(name, service, port))
+    return args
+
+
+def _service_args(name: str, service: dict[str, Any]) -> list[str]:
+    if "derived_config" in service:
+        return _backend_args(name, service, service["port"])
+    return list(service["command"]["args"])
+
+
+def _cwd(service: dict[str, Any]) -> str:
+    return service["command"].get("cwd") or os.getcwd()
+
+
+def _spawn_options(service: dict[str, Any]) -> dict[str, Any]:
+    """Supervisor start options derived from the service config."""
+    log_rotation = service.get("log_rotation")
+    controls = service.get("process_controls")
+    return {
+        "log_rotation": (
+            LogRotationPolicy.from_config(log_rotation) if log_rotation else None
+        ),
+        "controls": ProcessControls.from_config(controls) if controls else None,
+        "drain_timeout": service.get("stop_drain_seconds"),
+    }
+
+
+def warm_up(
+    supervisor: ProcessSupervisor,
+    name: str,
+    service: dict[str, Any],
+    *,
+    port: int | None = None,
+) -> WarmupResult | None:
+    """Run the service's warm-up requests and record a service_warmup event.
+
+    Returns None when the service has no ``warmup`` section.
+    """
+    section = service.get("warmup")
+    if not section:
+        return None
+    host = str(service.get("host", DEFAULT_SERVICE_HOST))
+    port = port if port is not None else service_port(supervisor, name, service)
+    result = run_warmup(f"http://{host}:{port}", WarmupPlan.from_config(section))
+    supervisor.record_event(
+        "service_warmup",
+        service=name,
+        result="success" if result["ok"] else "partial",
+        detail=f"requests={result['requests']} failures={result['failures']}",
+        extra={
+            "duration_ms": result["duration_ms"],
+            "first_latency_ms": result["first_latency_ms"],
+            "steady_latency_ms": result["steady_latency_ms"],
+        },
+    )
+    return result
+
+
+def write_proxy_routes(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    proxy_name: str,
+    *,
+    overrides: dict[str, int] | None = None,
+) -> Path:
+    """(Re)write the routes file for ``proxy_name`` from live backend ports."""
+    proxy = config["services"][proxy_name]
+    overrides = overrides or {}
+    backends = []
+    drain_timeout = 0.0
+    for backend in proxy.get("backends", []):
+        service = config["services"][backend]
+        port = overrides.get(backend, service_port(supervisor, backend, service))
+        backends.append(
+            {
+                "name": backend,
+                "host": str(service.get("host", DEFAULT_SERVICE_HOST)),
+                "port": port,
+                "readiness_url": service_readiness_url({**service, "port": port}),
+            }
+        )
+        spare = spare_name(backend)
+        spare_port = supervisor.service_port(spare) if has_hot_spare(service) else None
+        if spare_port is not None and supervisor.is_running(spare):
+            backends.append(
+                {
+                    "name": spare,
+                    "host": str(service.get("host", DEFAULT_SERVICE_HOST)),
+                    "port": spare_port,
+                    "readiness_url": service_readiness_url(
+                        {**service, "port": spare_port}
+                    ),
+                    "standby": True,
+                }
+            )
+        drain = float(service.get("proxy", {}).get("drain_seconds", 0.0))
+        drain_timeout = max(drain_timeout, drain)
+    path = Path(proxy["routes_file"])
+    routes: dict[str, Any] = {
+        "listen": {
+            "host": str(proxy.get("host", DEFAULT_SERVICE_HOST)),
+            "port": proxy["port"],
+        },
+        "backends": backends,
+        "drain_timeout": max(drain_timeout, 1.0),
+        "health_interval": float(
+            proxy.get("health_interval", DEFAULT_PROXY_HEALTH_INTERVAL)
+        ),
+    }
+    if "lazy" in proxy:
+        routes["lazy"] = proxy["lazy"]
+    write_routes(path, routes)
+    return path
+
+
+def start_service(
+    config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+) -> int:
+    """Start a service, preparing proxy routes/backend configs when needed."""
+    with supervisor.locked(name):
+        return _start_service(config, supervisor, name)
+
+
+def _start_service(
+    config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+) -> int:
+    service = config["services"][name]
+    args = service["command"]["args"]
+    cwd = _cwd(service)
+
+    if "routes_file" in service:
+        write_proxy_routes(config, supervisor, name)
+        return supervisor.start(
+            name,
+            args,
+            cwd=cwd,
+            **_spawn_options(service),
+        )
+
+    if "proxy" in service and not supervisor.is_running(name):
+        pid = failover(config, supervisor, name)
+        if pid is None:
+            port = service["port"]
+            if supervisor.is_running(spare_name(name)):
+                # The spare is unusable and may hold a slot port.
+                supervisor.stop(spare_name(name))
+            pid = supervisor.start(
+                name,
+                _backend_args(name, service, port),
+                cwd=cwd,
+                metadata={"port": port},
+                **_spawn_options(service),
+            )
+        _spawn_spare(config, supervisor, name)
+        write_proxy_routes(config, supervisor, service["proxy"]["service"])
+        return pid
+
+    if "derived_config" in service and not supervisor.is_running(name):
+        args = _service_args(name, service)
+    return supervisor.start(
+        name,
+        args,
+        cwd=cwd,
+        **_spawn_options(service),
+    )
+
+
+def stop_service(
+    config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+) -> bool:
+    """Stop a service together with its hot spare, if it has one."""
+    service = config["services"][name]
+    with supervisor.locked(name):
+        spare = spare_name(name)
+        if has_hot_spare(service) and supervisor.read_pid(spare) is not None:
+            # Spare first, so the proxy cannot fail over to it meanwhile.
+            supervisor.stop(spare)
+        return supervisor.stop(name)
+
+
+def restart_service(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    timeout: float = DEFAULT_SWITCH_TIMEOUT,
+) -> int:
+    """Restart a service, without dropping traffic when it sits behind the proxy.
+
+    Holds the service lock for the whole switch. A restart that had to wait
+    for a concurrent one to finish returns that restart's pid instead of
+    restarting again.
+    """
+    service = config["services"][name]
+    if "proxy" not in service and "routes_file" not in service:
+        # ProcessSupervisor.restart locks and coalesces on its own.
+        return supervisor.restart(
+            name,
+            _service_args(name, service),
+            cwd=_cwd(service),
+            **_spawn_options(service),
+        )
+    requested_at = datetime.now(timezone.utc)
+    with supervisor.locked(name):
+        pid = supervisor.restarted_since(name, requested_at)
+        if pid is not None:
+            supervisor.record_event(
+                "service_restart", service=name, result="coalesced", detail=f"pid={pid}"
+            )
+            return pid
+        return _restart_service(config, supervisor, name, timeout=timeout)
+
+
+def _restart_service(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    timeout: float,
+) -> int:
+    service = config["services"][name]
+    if not supervisor.is_running(name):
+        return start_service(config, supervisor, name)
+    if "proxy" in service:
+        return blue_green_restart(config, supervisor, name, timeout=timeout)
+    return _replace_proxy(config, supervisor, name, timeout=timeout)
+
+
+def _other_slot(
+    supervisor: ProcessSupervisor, name: str, service: dict[str, Any]
+) -> int:
+    slots = service["proxy"]["ports"]
+    return slots[1] if service_port(supervisor, name, service) == slots[0] else slots[0]
+
+
+def _spawn_spare(
+    config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+) -> int | None:
+    """Spawn the hot spare on the free slot port without waiting for it."""
+    service = config["services"][name]
+    spare = spare_name(name)
+    if not has_hot_spare(service) or supervisor.is_running(spare):
+        return None
+    port = _other_slot(supervisor, name, service)
+    pid = supervisor.start(
+        spare,
+        _backend_args(name, service, port),
+        cwd=_cwd(service),
+        metadata={"port": port},
+        log_name=name,
+        **_spawn_options(service),
+    )
+    supervisor.record_event(
+        "hot_spare_start",
+        service=name,
+        result="success",
+        detail=f"pid={pid} port={port}",
+    )
+    return pid
+
+
+def ensure_spare(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    timeout: float = DEFAULT_SWITCH_TIMEOUT,
+) -> int | None:
+    """Make sure ``name`` has a ready, warmed-up hot spare; returns its pid.
+
+    Returns None when the service has no hot spare, the primary is not
+    running, or the spare did not become ready within ``timeout``.
+    """
+    service = config["services"][name]
+    if not has_hot_spare(service):
+        return None
+    spare = spare_name(name)
+    started_at = time.perf_counter()
+    with supervisor.locked(name):
+        if not supervisor.is_running(name):
+            return None
+        if _spawn_spare(config, supervisor, name) is not None:
+            write_proxy_routes(config, supervisor, service["proxy"]["service"])
+        pid = supervisor.read_pid(spare)
+        port = supervisor.service_port(spare)
+    readiness = wait_for_readiness(
+        service_readiness_url({**service, "port": port}) or "",
+        timeout=timeout,
+        is_alive=lambda: supervisor.is_running(spare),
+        started_at=started_at,
+    )
+    if not readiness["ok"]:
+        supervisor.record_event(
+            "hot_spare_ready",
+            service=name,
+            result="failed",
+            detail=str(readiness["reason"]),
+        )
+        return None
+    warm_up(supervisor, spare, service, port=port)
+    supervisor.record_event(
+        "hot_spare_ready",
+        service=name,
+        result="success",
+        detail=f"pid={pid} port={port}",
+        extra={"time_to_ready_ms": round((time.perf_counter() - started_at) * 1000, 2)},
+    )
+    return pid
+
+
+def failover(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    detected_at: float | None = None,
+    timeout: float = DEFAULT_SWITCH_TIMEOUT,
+) -> int | None:
+    """Promote the hot spare of a dead backend; returns its pid, or None.
+
+    ``detected_at`` is the ``time.perf_counter()`` value at which the crash
+    was noticed; the ``service_failover`` event reports ``failover_ms`` from
+    there until the routes point at the spare. A spare that is still booting
+    is waited for (up to ``timeout``), which still beats a cold start.
+    """
+    service = config["services"][name]
+    spare = spare_name(name)
+    if not has_hot_spare(service):
+        return None
+    started_at = time.perf_counter() if detected_at is None else detected_at
+    with supervisor.locked(name):
+        if supervisor.is_running(name) or not supervisor.is_running(spare):
+            return None
+        port = supervisor.service_port(spare)
+        readiness = wait_for_readiness(
+            service_readiness_url({**service, "port": port}) or "",
+            timeout=timeout,
+            is_alive=lambda: supervisor.is_running(spare),
+        )
+        if not readiness["ok"]:
+            supervisor.record_event(
+                "service_failover",
+                service=name,
+                result="failed",
+                detail=f"spare-{readiness['reason']}",
+            )
+            return None
+        pid = supervisor.read_pid(spare)
+        supervisor.rename(spare, name)
+        write_proxy_routes(config, supervisor, service["proxy"]["service"])
+    supervisor.record_event(
+        "service_failover",
+        service=name,
+        result="success",
+        detail=f"pid={pid} port={port}",
+        extra={"failover_ms": round((time.perf_counter() - started_at) * 1000, 2)},
+    )
+    assert pid is not None
+    return pid
+
+
+def _promote(
+    supervisor: ProcessSupervisor,
+    name: str,
+    standby: str,
+    *,
+    rollback: Callable[[], object] | None = None,
+) -> None:
+    """Retire ``name`` and rename ``standby`` into its place.
+
+    If ``name`` does not stop, it keeps serving: ``rollback`` (e.g. pointing
+    the routes back at it) runs before the standby is stopped.
+    """
+    if not supervisor.stop(name):
+        if rollback is not None:
+            rollback()
+        supervisor.stop(standby)
+        supervisor.record_event(
+            "service_restart", service=name, result="failed", detail="stop-timeout"
+        )
+        raise ProcessError(f"Failed to stop previous instance of {name}")
+    supervisor.rename(standby, name)
+
+
+def blue_green_restart(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    timeout: float = DEFAULT_SWITCH_TIMEOUT,
+) -> int:
+    """Replace a proxied backend with a standby on the other slot port."""
+    service = config["services"][name]
+    proxy_cfg = service["proxy"]
+    port = _other_slot(supervisor, name, service)
+    standby = f"{name}{STANDBY_SUFFIX}"
+
+    if supervisor.read_pid(spare_name(name)) is not None:
+        # The spare holds the other slot; a fresh one follows the switch.
+        supervisor.stop(spare_name(name))
+    started_at = time.perf_counter()
+    pid = supervisor.start(
+        standby,
+        _backend_args(name, service, port),
+        cwd=_cwd(service),
+        metadata={"port": port},
+        log_name=name,
+        **_spawn_options(service),
+    )
+    url = service_readiness_url({**service, "port": port})
+    readiness = wait_for_readiness(
+        url or "",
+        timeout=timeout,
+        is_alive=lambda: supervisor.is_running(standby),
+        started_at=started_at,
+    )
+    if not readiness["ok"]:
+        supervisor.stop(standby)
+        supervisor.record_event(
+            "service_restart",
+            service=name,
+            result="failed",
+            detail=f"standby-{readiness['reason']}",
+        )
+        raise ProcessError(
+            f"Standby instance of {name} did not become ready: {readiness['reason']}"
+        )
+
+    warm_up(supervisor, name, service, port=port)
+    write_proxy_routes(config, supervisor, proxy_cfg["service"], overrides={name: port})
+    time.sleep(float(proxy_cfg.get("drain_seconds", 0.0)))
+    _promote(
+        supervisor,
+        name,
+        standby,
+        rollback=lambda: write_proxy_routes(config, supervisor, proxy_cfg["service"]),
+    )
+    if _spawn_spare(config, supervisor, name) is not None:
+        write_proxy_routes(config, supervisor, proxy_cfg["service"])
+    supervisor.record_event(
+        "service_restart",
+        service=name,
+        result="success",
+        detail=f"pid={pid} mode=blue-green port={port}",
+        extra={"time_to_ready_ms": readiness["time_to_ready_ms"]},
+    )
+    return pid
+
+
+def _replace_proxy(
+    config: dict[str, Any],
+    supervisor: ProcessSupervisor,
+    name: str,
+    *,
+    timeout: float,
+) -> int:
+    """Hand the listener to a second proxy, then retire (and drain) the old one."""
+    service = config["services"][name]
+    routes_path = write_proxy_routes(config, supervisor, name)
+    standby = f"{name}{STANDBY_SUFFIX}"
+    args = list(service["command"]["args"])
+    old_pid = supervisor.read_pid(name)
+    if old_pid is not None:
+        args += ["--takeover", str(old_pid)]
+    pid = supervisor.start(
+        standby,
+        args,
+        cwd=_cwd(service),
+        log_name=name,
+        **_spawn_options(service),
+    )
+
+    deadline = time.monotonic() + timeout
+    delay = 0.01
+    while read_routes(proxy_state_path(routes_path, pid)) is None:
+        if time.monotonic() >= deadline or not supervisor.is_running(standby):
+            supervisor.stop(standby)
+            supervisor.record_event(
+                "service_restart", service=name, result="failed", detail="standby-bind"
+            )
+            raise ProcessError(f"Replacement {name} did not start listening")
+        time.sleep(delay)
+        delay = min(delay * 2, 0.5)
+
+    _promote(supervisor, name, standby)
+    supervisor.record_event(
+        "service_restart",
+        service=name,
+        result="success",
+        detail=f"pid={pid} mode=handoff",
+    )
+    return pid
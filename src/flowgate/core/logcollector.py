@@ -0,0 +1,329 @@
+"""Bounded process-log capture with rotation and compressed archives.
+
+With log rotation enabled, ``ProcessSupervisor.start`` connects the child's
+stdout/stderr to a pipe read by a small collector process instead of handing
+it the log file directly:
+
+    child --pipe--> python -m flowgate.core.logcollector --path <name>.log ...
+
+The collector rotates ``<name>.log`` once it exceeds ``max_bytes`` or is older
+than ``interval`` seconds, renaming it to ``<name>.log.<UTC timestamp>`` and
+gzipping that segment on a background thread. Only the newest ``keep``
+rotated segments are retained. ``SIGHUP`` forces a rotation; the child is never
+restarted or signalled.
+
+The child must never block on logging, so reading and writing are decoupled:
+a reader thread drains the pipe into a bounded in-memory buffer, and when the
+disk cannot keep up, chunks beyond ``buffer_bytes`` are dropped and a marker
+line records how many bytes were lost. The collector exits once every writer
+has closed the pipe, i.e. when the service (and anything it spawned) exits;
+SIGTERM/SIGINT are ignored so a stray signal cannot break the child's pipe.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gzip
+import os
+import shutil
+import signal
+import threading
+import time
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+_CHUNK_SIZE = 64 * 1024
+# Linux pipes default to 64 KiB; a larger buffer absorbs bursts before the
+# collector even gets scheduled.
+PIPE_BUFFER_BYTES = 1024 * 1024
+DEFAULT_BUFFER_BYTES = 8 * 1024 * 1024
+DEFAULT_KEEP = 5
+
+
+@dataclass(frozen=True)
+class LogRotationPolicy:
+    """When to rotate a process log and how many archives to keep."""
+
+    max_bytes: int | None = None
+    interval: float | None = None
+    keep: int = DEFAULT_KEEP
+    compress: bool = True
+    buffer_bytes: int = DEFAULT_BUFFER_BYTES
+
+    @classmethod
+    def from_config(cls, section: dict[str, Any]) -> LogRotationPolicy:
+        """Build a policy from a validated ``log_rotation`` config section."""
+        return cls(
+            max_bytes=section.get("max_bytes"),
+            interval=(
+                float(section["interval_seconds"])
+                if section.get("interval_seconds") is not None
+                else None
+            ),
+            keep=int(section.get("keep", DEFAULT_KEEP)),
+            compress=bool(section.get("compress", True)),
+        )
+
+    def to_args(self) -> list[str]:
+        """Command-line flags for the collector process."""
+        args = ["--keep", str(self.keep), "--buffer-bytes", str(self.buffer_bytes)]
+        if self.max_bytes is not None:
+            args += ["--max-bytes", str(self.max_bytes)]
+        if self.interval is not None:
+            args += ["--interval", str(self.interval)]
+        if not self.compress:
+            args.append("--no-compress")
+        return args
+
+
+def rotated_segments(path: str | Path) -> list[Path]:
+    """Rotated segments of ``path`` (compressed or not), oldest first."""
+    target = Path(path)
+    prefix = f"{target.name}."
+    try:
+        names = [
+            entry.name
+            for entry in os.scandir(target.parent)
+            if entry.name.startswith(prefix) and not entry.name.endswith(".tmp")
+        ]
+    except OSError:
+        return []
+    # Timestamps sort lexically; ".gz" only differs after the timestamp.
+    return [target.parent / name for name in sorted(names)]
+
+
+class LogCollector:
+    """Copy bytes from a pipe into a size/time-rotated log file."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        policy: LogRotationPolicy,
+        *,
+        clock: Any = time.monotonic,
+    ):
+        self.path = Path(path)
+        self.policy = policy
+        self._clock = clock
+        self._buffer: deque[bytes] = deque()
+        self._buffered = 0
+        self._dropped = 0
+        self._eof = False
+        self._cond = threading.Condition()
+        self._rotate_requested = False
+        self._compressors: list[threading.Thread] = []
+        self._file = self.path.open("ab")
+        self._size = self._file.tell()
+        self._opened_at = self._clock()
+
+    # ── Reader side (never blocks on disk) ─────────────────────
+
+    def feed(self, data: bytes) -> None:
+        with self._cond:
+            if self._buffered + len(data) > self.policy.buffer_bytes:
+                self._dropped += len(data)
+            else:
+                self._buffer.append(data)
+                self._buffered += len(data)
+            self._cond.notify()
+
+    def close_input(self) -> None:
+        with self._cond:
+            self._eof = True
+            self._cond.notify()
+
+    def request_rotation(self) -> None:
+        with self._cond:
+            self._rotate_requested = True
+            self._cond.notify()
+
+    def read_from(self, fd: int) -> None:
+        """Drain ``fd`` until every writer has closed it."""
+        try:
+            while True:
+                try:
+                    data = os.read(fd, _CHUNK_SIZE)
+                except InterruptedError:
+                    continue
+                if not data:
+                    break
+                self.feed(data)
+        finally:
+            self.close_input()
+
+    # ── Writer side ─────────────────────────────────────────────
+
+    def run(self) -> None:
+        """Write buffered chunks, rotating as needed, until input is exhausted."""
+        try:
+            while True:
+                with self._cond:
+                    while not (self._buffer or self._eof or self._rotate_requested):
+                        self._cond.wait(timeout=self._wait_timeout())
+                        if self._rotation_due():
+                            break
+                    chunks = list(self._buffer)
+                    self._buffer.clear()
+                    self._buffered = 0
+                    dropped, self._dropped = self._dropped, 0
+                    forced, self._rotate_requested = self._rotate_requested, False
+                    done = self._eof and not chunks
+
+                if chunks or dropped:
+                    self._reopen_if_moved()
+                if forced or self._rotation_due():
+                    self.rotate()
+                if dropped:
+                    self._write(
+                        f"[flowgate-logcollector] dropped {dropped} bytes "
+                        "(disk too slow)\n".encode()
+                    )
+                for chunk in chunks:
+                    self._write(chunk)
+                self._file.flush()
+                if done:
+                    break
+        finally:
+            self._file.close()
+            for thread in self._compressors:
+                thread.join()
+
+    def _reopen_if_moved(self) -> None:
+        """Follow the path if another collector (or logrotate) moved our file.
+
+        During a blue/green restart the old and new instance share one log
+        name; whichever rotates first renames the file out from under the other.
+        """
+        try:
+            moved = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            self._file.close()
+            self._file = self.path.open("ab")
+            self._size = self._file.tell()
+            self._opened_at = self._clock()
+
+    def _wait_timeout(self) -> float | None:
+        if self.policy.interval is None or self._size == 0:
+            return None
+        return max(self.policy.interval - (self._clock() - self._opened_at), 0.01)
+
+    def _rotation_due(self) -> bool:
+        if self._size == 0:
+            return False
+        if self.policy.max_bytes is not None and self._size >= self.policy.max_bytes:
+            return True
+        return (
+            self.policy.interval is not None
+            and self._clock() - self._opened_at >= self.policy.interval
+        )
+
+    def _write(self, data: bytes) -> None:
+        limit = self.policy.max_bytes
+        while data:
+            if self._size == 0:
+                # A segment's age counts from its first byte, not from when it was
+                # opened.
+                self._opened_at = self._clock()
+            piece = data
+            if limit is not None and self._size + len(data) > limit:
+                # Split at the last line break that fits so lines are not torn;
+                # a single oversized line is cut at the limit.
+                room = max(limit - self._size, 0)
+                cut = data.rfind(b"\n", 0, room) + 1
+                if cut == 0:
+                    cut = room if self._size == 0 else 0
+                piece = data[:cut]
+            self._file.write(piece)
+            self._size += len(piece)
+            data = data[len(piece) :]
+            if limit is not None and (data or self._size >= limit):
+                self.rotate()
+
+    def rotate(self) -> Path | None:
+        """Close the current file, archive it, and start a fresh one."""
+        if self._size == 0:
+            self._opened_at = self._clock()
+            return None
+        self._file.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+        segment = self.path.with_name(f"{self.path.name}.{stamp}")
+        os.replace(self.path, segment)
+        self._file = self.path.open("ab")
+        self._size = 0
+        self._opened_at = self._clock()
+
+        if self.policy.compress:
+            thread = threading.Thread(
+                target=self._compress, args=(segment,), name="flowgate-log-gzip"
+            )
+            self._compressors = [t for t in self._compressors if t.is_alive()]
+            self._compressors.append(thread)
+            thread.start()
+        else:
+            self._prune()
+        return segment
+
+    def _compress(self, segment: Path) -> None:
+        target = segment.with_name(segment.name + ".gz")
+        tmp = segment.with_name(segment.name + ".gz.tmp")
+        try:
+            with segment.open("rb") as src, gzip.open(tmp, "wb") as dst:
+                shutil.copyfileobj(src, dst, _CHUNK_SIZE)
+            os.replace(tmp, target)
+            segment.unlink()
+        except OSError:
+            tmp.unlink(missing_ok=True)
+        self._prune()
+
+    def _prune(self) -> None:
+        segments = rotated_segments(self.path)
+        for old in segments[: max(len(segments) - self.policy.keep, 0)]:
+            old.unlink(missing_ok=True)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m flowgate.core.logcollector")
+    parser.add_argument("--path", required=True, help="Log file to write")
+    parser.add_argument("--max-bytes", type=int, default=None)
+    parser.add_argument("--interval", type=float, default=None)
+    parser.add_argument("--keep", type=int, default=DEFAULT_KEEP)
+    parser.add_argument("--buffer-bytes", type=int, default=DEFAULT_BUFFER_BYTES)
+    parser.add_argument("--no-compress", action="store_true")
+    args = parser.parse_args(argv)
+
+    collector = LogCollector(
+        args.path,
+        LogRotationPolicy(
+            max_bytes=args.max_bytes,
+            interval=args.interval,
+            keep=args.keep,
+            compress=not args.no_compress,
+            buffer_bytes=args.buffer_bytes,
+        ),
+    )
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGHUP, lambda signum, frame: collector.request_rotation())
+    reader = threading.Thread(
+        target=collector.read_from,
+        args=(0,),
+        name="flowgate-log-reader",
+        daemon=True,
+    )
+    writer = threading.Thread(target=collector.run, name="flowgate-log-writer")
+    reader.start()
+    writer.start()
+    # The main thread only waits, so the SIGHUP handler never runs while it
+    # holds the collector's lock.
+    writer.join()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
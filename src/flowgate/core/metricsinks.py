@@ -0,0 +1,198 @@
+"""Destinations for performance metrics, and per-operation sampling.
+
+:func:`~flowgate.core.observability.log_performance_metric` hands every
+metric it keeps to the sinks chosen at startup from ``observability.metrics``
+(see :class:`MetricsPolicy`):
+
+- ``file``: append to the events log (the default; see
+  :class:`~flowgate.core.observability.EventsLogMetricSink`)
+- ``memory``: keep the newest ``capacity`` records in a ring buffer
+- ``statsd``: send one StatsD timer line per metric over UDP, with
+  DogStatsD tags when ``dogstatsd`` is set
+- ``null``: drop everything
+
+Each operation is kept with probability ``sample_rates[operation]``
+(default ``sample_rate``). Kept metrics of a sampled operation carry their
+``sample_rate``, so aggregators can scale counts back up.
+"""
+
+from __future__ import annotations
+
+import socket
+import threading
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+METRIC_SINK_TYPES = ("file", "memory", "statsd", "null")
+DEFAULT_MEMORY_CAPACITY = 1000
+DEFAULT_STATSD_ADDRESS = "127.0.0.1:8125"
+DEFAULT_STATSD_PREFIX = "flowgate"
+
+
+class MetricSink:
+    """Where kept performance metrics go. The base class drops them.
+
+    ``emit`` runs on the caller's thread for every kept metric, so sinks must
+    be cheap and must never raise.
+    """
+
+    def emit(self, metric: Mapping[str, Any]) -> None:
+        """Handle one ``performance_metric`` record."""
+
+    def flush(self) -> None:
+        """Deliver anything still buffered."""
+
+    def close(self) -> None:
+        """Release the sink's resources; it is not used afterwards."""
+
+
+class NullMetricSink(MetricSink):
+    """Drops every metric."""
+
+
+class MemoryMetricSink(MetricSink):
+    """Keeps the newest ``capacity`` metrics in memory."""
+
+    def __init__(self, capacity: int = DEFAULT_MEMORY_CAPACITY):
+        self._records: deque[dict[str, Any]] = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def emit(self, metric: Mapping[str, Any]) -> None:
+        with self._lock:
+            self._records.append(dict(metric))
+
+    def records(self, operation: str | None = None) -> list[dict[str, Any]]:
+        """Buffered metrics, oldest first, optionally for one operation."""
+        with self._lock:
+            records = list(self._records)
+        if operation is None:
+            return records
+        return [r for r in records if r.get("operation") == operation]
+
+
+def sample_weight(metric: Mapping[str, Any]) -> float:
+    """How many metrics one kept ``metric`` stands for: ``1 / sample_rate``.
+
+    Aggregates add this instead of 1 so sampled counts scale back up.
+    """
+    rate = metric.get("sample_rate")
+    if isinstance(rate, (int, float)) and not isinstance(rate, bool) and 0 < rate < 1:
+        return 1 / rate
+    return 1.0
+
+
+def parse_address(value: str) -> tuple[str, int]:
+    """Split ``HOST:PORT`` (IPv6 hosts may be bracketed).
+
+    Raises:
+        ValueError: If ``value`` is not a valid ``HOST:PORT``
+    """
+    host, sep, port = value.rpartition(":")
+    if not sep or not host or not port.isdigit() or int(port) > 65535:
+        raise ValueError(f"expected HOST:PORT, got {value!r}")
+    return host.strip("[]"), int(port)
+
+
+# Characters that delimit DogStatsD tags; they cannot appear inside one.
+_TAG_DELIMITERS = str.maketrans({",": "_", "|": "_", "#": "_", "\n": "_"})
+
+
+def _tag_text(value: object) -> str:
+    return str(value).translate(_TAG_DELIMITERS)
+
+
+class StatsdMetricSink(MetricSink):
+    """Sends each metric as a StatsD timer over UDP.
+
+    Lines look like ``flowgate.config_load:12.5|ms|@0.1|#function:load``;
+    the ``@rate`` part only for sampled operations and the ``#tags`` part
+    only with ``dogstatsd``. The address is resolved once, when the sink is
+    created. Sends never block and failures (including an address that
+    does not resolve) are ignored.
+    """
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        *,
+        prefix: str = DEFAULT_STATSD_PREFIX,
+        dogstatsd: bool = False,
+    ):
+        self.address = address
+        self.prefix = f"{prefix}." if prefix else ""
+        self.dogstatsd = dogstatsd
+        # Resolve once: a lookup per metric would block the caller.
+        family, self._sockaddr = socket.AF_INET, None
+        try:
+            info = socket.getaddrinfo(*address, type=socket.SOCK_DGRAM)
+        except OSError:
+            info = []
+        if info:
+            family, _type, _proto, _name, self._sockaddr = info[0]
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        self._socket.setblocking(False)
+
+    def line(self, metric: Mapping[str, Any]) -> str:
+        """The StatsD line for ``metric``."""
+        line = f"{self.prefix}{metric['operation']}:{metric['duration_ms']}|ms"
+        rate = metric.get("sample_rate")
+        if rate is not None:
+            line += f"|@{rate}"
+        if self.dogstatsd:
+            tags = []
+            if metric.get("function"):
+                tags.append(f"function:{_tag_text(metric['function'])}")
+            for key, value in (metric.get("context") or {}).items():
+                if isinstance(value, (str, int, float, bool)):
+                    tags.append(f"{_tag_text(key)}:{_tag_text(value)}")
+            if tags:
+                line += "|#" + ",".join(tags)
+        return line
+
+    def emit(self, metric: Mapping[str, Any]) -> None:
+        if self._sockaddr is None:
+            return
+        try:
+            self._socket.sendto(self.line(metric).encode("utf-8"), self._sockaddr)
+        except OSError:
+            return
+
+    def close(self) -> None:
+        self._socket.close()
+
+
+@dataclass(frozen=True)
+class MetricsPolicy:
+    """Which sinks get performance metrics and how often each is sampled."""
+
+    sinks: tuple[str, ...] = ("file",)
+    sample_rate: float = 1.0
+    sample_rates: Mapping[str, float] = field(default_factory=dict)
+    memory_capacity: int = DEFAULT_MEMORY_CAPACITY
+    statsd_address: str = DEFAULT_STATSD_ADDRESS
+    statsd_prefix: str = DEFAULT_STATSD_PREFIX
+    dogstatsd: bool = False
+
+    @classmethod
+    def from_config(cls, section: dict[str, Any]) -> MetricsPolicy:
+        """Build a policy from a validated ``observability.metrics``."""
+        memory = section.get("memory", {})
+        statsd = section.get("statsd", {})
+        return cls(
+            sinks=tuple(section.get("sinks", ("file",))),
+            sample_rate=float(section.get("sample_rate", 1.0)),
+            sample_rates={
+                operation: float(rate)
+                for operation, rate in section.get("sample_rates", {}).items()
+            },
+            memory_capacity=int(memory.get("capacity", DEFAULT_MEMORY_CAPACITY)),
+            statsd_address=str(statsd.get("address", DEFAULT_STATSD_ADDRESS)),
+            statsd_prefix=str(statsd.get("prefix", DEFAULT_STATSD_PREFIX)),
+            dogstatsd=bool(statsd.get("dogstatsd", False)),
+        )
+
+    def rate_for(self, operation: str) -> float:
+        """Probability that a metric of ``operation`` is kept."""
+        return self.sample_rates.get(operation, self.sample_rate)
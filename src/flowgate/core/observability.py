@@ -4,6 +4,25 @@ This module provides decorators and utilities for tracking operation performance
 and logging metrics to the events log. Performance data helps identify bottlenecks
 and optimize critical paths.
 
+All records go through a shared :class:`EventSink` per events log. By default
+each record is appended with a single ``O_APPEND`` write; inside
+:func:`event_sink_policy` (every CLI command, and so the daemon) records are
+queued and written in batches by a background thread, and flushed when the
+block ends or the interpreter exits. Once the events log reaches the
+sink's :class:`~flowgate.core.eventlog.SegmentPolicy` size it is sealed into
+an indexed segment (see :mod:`flowgate.core.eventlog`).
+
+Measurements nest: :func:`span` keeps the current span in a ``ContextVar``,
+so every ``performance_metric`` carries a ``trace_id``, its ``span_id`` and
+the ``parent_id`` of the measurement it ran inside. Within :func:`trace_to`
+finished spans are also collected and written as Chrome trace-event JSON,
+which Perfetto and chrome://tracing load directly.
+
+Where metrics go is chosen once per process (or CLI command) with
+:func:`metrics_policy`: the events log by default, or any of the sinks in
+:mod:`flowgate.core.metricsinks`, with a sample rate per operation. A
+measurement that no sink will see is not timed at all.
+
 Example usage:
     @measure_time("config_load")
     def load_config(path: str) -> dict:
@@ -11,15 +30,32 @@ Example usage:
         return config
 """
 
+import atexit
 import functools
 import json
+import os
+import random
+import threading
 import time
-from collections.abc import Callable
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from contextvars import ContextVar
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, TypeVar
+from typing import Any, Literal, TypeVar
+
+from flowgate.core.eventlog import SegmentPolicy, read_events, seal
+from flowgate.core.latency import latency_state_path, record_latencies
+from flowgate.core.metricsinks import (
+    MemoryMetricSink,
+    MetricSink,
+    MetricsPolicy,
+    NullMetricSink,
+    StatsdMetricSink,
+    parse_address,
+    sample_weight,
+)
 
 F = TypeVar("F", bound=Callable[..., Any])
 
@@ -28,6 +64,223 @@ _EVENTS_LOG_PATH: ContextVar[str | None] = ContextVar(
 )
 
 
+FsyncPolicy = Literal["never", "batch"]
+FSYNC_POLICIES: tuple[FsyncPolicy, ...] = ("never", "batch")
+# A batch is written early once this many records are queued.
+_MAX_BATCH = 1000
+# Write-through sinks save latency histograms at most this often (seconds);
+# the rest is saved on flush.
+_LATENCY_SAVE_INTERVAL = 1.0
+_DEFAULT_SEGMENTS = SegmentPolicy()
+
+
+class EventSink:
+    """Appends JSON records to one events log.
+
+    With ``flush_interval`` 0 every record is written right away; otherwise
+    records are queued and a background thread writes each batch with one
+    ``O_APPEND`` write every ``flush_interval`` seconds. ``fsync="batch"``
+    fsyncs after every write. A write that takes the log to
+    ``segments.max_bytes`` seals it. ``performance_metric`` records also
+    update the latency histograms next to the log (see
+    :mod:`flowgate.core.latency`), with each batch or, when writing through,
+    at most once a second and on :meth:`flush`.
+    Write failures are ignored: observability must never break the caller.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        flush_interval: float = 0.0,
+        fsync: FsyncPolicy = "never",
+        segments: SegmentPolicy = _DEFAULT_SEGMENTS,
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.segments = segments
+        self._pending: list[str] = []
+        # (operation, duration_ms, epoch seconds) of queued performance metrics
+        self._latencies: list[tuple[str, float, float]] = []
+        self._latencies_saved_at = 0.0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def emit(self, record: Mapping[str, Any]) -> None:
+        self.emit_many((record,))
+
+    def emit_many(self, records: Iterable[Mapping[str, Any]]) -> None:
+        records = list(records)
+        lines = [json.dumps(record, ensure_ascii=True) + "\n" for record in records]
+        if not lines:
+            return
+        latencies = _latency_samples(records)
+        if self.flush_interval <= 0:
+            with self._write_lock:
+                self._write("".join(lines))
+                if latencies:
+                    with self._lock:
+                        self._latencies.extend(latencies)
+                    if (
+                        time.monotonic() - self._latencies_saved_at
+                        >= _LATENCY_SAVE_INTERVAL
+                    ):
+                        self._save_latencies()
+            return
+        with self._lock:
+            self._pending.extend(lines)
+            self._latencies.extend(latencies)
+            full = len(self._pending) >= _MAX_BATCH
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="flowgate-events", daemon=True
+                )
+                self._thread.start()
+        if full:
+            self._wakeup.set()
+
+    def flush(self) -> None:
+        """Write every queued record now."""
+        with self._write_lock:
+            with self._lock:
+                payload = "".join(self._pending)
+                self._pending.clear()
+            if payload:
+                self._write(payload)
+            self._save_latencies()
+
+    def configure(
+        self, *, flush_interval: float, fsync: FsyncPolicy, segments: SegmentPolicy
+    ) -> None:
+        self.flush()
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.segments = segments
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        while self.flush_interval > 0:
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+        with self._lock:
+            self._thread = None
+        self.flush()
+
+    def _write(self, payload: str) -> None:
+        data = payload.encode("utf-8")
+        flags = os.O_WRONLY | os.O_APPEND | os.O_CREAT
+        try:
+            try:
+                fd = os.open(self.path, flags, 0o644)
+            except FileNotFoundError:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                fd = os.open(self.path, flags, 0o644)
+            try:
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view) :]
+                if self.fsync == "batch":
+                    os.fsync(fd)
+                size = os.fstat(fd).st_size
+            finally:
+                os.close(fd)
+            if size >= self.segments.max_bytes:
+                seal(self.path, self.segments)
+        except OSError:
+            return
+
+    def _save_latencies(self) -> None:
+        with self._lock:
+            samples, self._latencies = self._latencies, []
+        if not samples:
+            return
+        self._latencies_saved_at = time.monotonic()
+        try:
+            record_latencies(latency_state_path(self.path), samples)
+        except OSError:
+            return
+
+
+def _latency_samples(
+    records: Iterable[Mapping[str, Any]],
+) -> list[tuple[str, float, float, float]]:
+    now = time.time()
+    return [
+        (record["operation"], float(record["duration_ms"]), now, sample_weight(record))
+        for record in records
+        if record.get("event") == "performance_metric"
+        and isinstance(record.get("operation"), str)
+        and isinstance(record.get("duration_ms"), (int, float))
+    ]
+
+
+_SINKS: dict[str, EventSink] = {}
+_SINKS_LOCK = threading.Lock()
+_SINK_POLICY: dict[str, Any] = {
+    "flush_interval": 0.0,
+    "fsync": "never",
+    "segments": _DEFAULT_SEGMENTS,
+}
+
+
+def event_sink(path: str | Path) -> EventSink:
+    """The shared sink for the events log at ``path``."""
+    key = os.path.abspath(path)
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            sink = _SINKS[key] = EventSink(key, **_SINK_POLICY)
+        return sink
+
+
+def flush_event_sinks() -> None:
+    """Write everything still queued in any sink."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.flush()
+
+
+def _configure_sinks(
+    *, flush_interval: float, fsync: FsyncPolicy, segments: SegmentPolicy
+) -> None:
+    with _SINKS_LOCK:
+        _SINK_POLICY.update(
+            flush_interval=flush_interval, fsync=fsync, segments=segments
+        )
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.configure(flush_interval=flush_interval, fsync=fsync, segments=segments)
+
+
+@contextmanager
+def event_sink_policy(
+    *,
+    flush_interval: float,
+    fsync: FsyncPolicy = "never",
+    segments: SegmentPolicy = _DEFAULT_SEGMENTS,
+) -> Iterator[None]:
+    """Use this write and segment policy for every events log until the block
+    ends.
+
+    Everything queued is flushed on exit, so readers after the block (and
+    tests) see every record.
+    """
+    previous = dict(_SINK_POLICY)
+    _configure_sinks(flush_interval=flush_interval, fsync=fsync, segments=segments)
+    try:
+        yield
+    finally:
+        _configure_sinks(**previous)
+
+
+atexit.register(flush_event_sinks)
+
+
 def set_events_log_path(path: str | Path | None) -> None:
     """Set the events log path for the current execution context.
 
@@ -56,11 +309,272 @@ def _events_log_path() -> Path:
     return Path(".router/runtime/events.log")
 
 
+@dataclass(frozen=True)
+class Span:
+    """One measured operation and where it sits in its trace."""
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None = None
+
+    def ids(self) -> dict[str, str]:
+        """Trace, span and (if any) parent ids, as recorded with a metric."""
+        ids = {"trace_id": self.trace_id, "span_id": self.span_id}
+        if self.parent_id is not None:
+            ids["parent_id"] = self.parent_id
+        return ids
+
+
+_CURRENT_SPAN: ContextVar[Span | None] = ContextVar(
+    "flowgate_current_span", default=None
+)
+
+
+class TraceRecorder:
+    """Collects finished spans as Chrome trace events ("X" complete events).
+
+    Timestamps are microseconds since the recorder was created, taken from
+    ``time.perf_counter_ns`` so they are monotonic across threads.
+    """
+
+    def __init__(self) -> None:
+        self.origin_ns = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self._events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def add(
+        self, span: Span, start_ns: int, end_ns: int, error: str | None = None
+    ) -> None:
+        args: dict[str, Any] = span.ids()
+        if error is not None:
+            args["error"] = error
+        tid = threading.get_native_id()
+        event = {
+            "name": span.name,
+            "cat": "flowgate",
+            "ph": "X",
+            "ts": (start_ns - self.origin_ns) / 1000,
+            "dur": (end_ns - start_ns) / 1000,
+            "pid": self.pid,
+            "tid": tid,
+            "args": args,
+        }
+        with self._lock:
+            self._events.append(event)
+            self._threads.setdefault(tid, threading.current_thread().name)
+
+    def to_dict(self) -> dict[str, Any]:
+        """The trace in the JSON object format of the trace-event spec."""
+        with self._lock:
+            events = sorted(self._events, key=lambda event: event["ts"])
+            threads = dict(self._threads)
+        metadata: list[dict[str, Any]] = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self.pid,
+                "args": {"name": "flowgate"},
+            }
+        ]
+        metadata.extend(
+            {
+                "name": "thread_name",
+                "ph": "M",
+                "pid": self.pid,
+                "tid": tid,
+                "args": {"name": name},
+            }
+            for tid, name in sorted(threads.items())
+        )
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def write(self, path: str | Path) -> None:
+        """Write the trace to ``path``.
+
+        Raises:
+            OSError: If the file cannot be written
+        """
+        target = Path(path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+
+
+# Process-wide, so spans from worker threads land in the same trace.
+_TRACE_RECORDER: TraceRecorder | None = None
+
+
+@contextmanager
+def trace_to(
+    path: str | Path, *, on_error: Callable[[OSError], None] | None = None
+) -> Iterator[TraceRecorder]:
+    """Record every span finished in this process and write them to ``path``
+    as trace-event JSON when the block ends.
+
+    If ``on_error`` is given, a trace that cannot be written is handed to it
+    instead of raising, so the traced block's own outcome stands.
+
+    Raises:
+        OSError: If the trace file cannot be written and ``on_error`` is None
+    """
+    global _TRACE_RECORDER
+    recorder = TraceRecorder()
+    previous, _TRACE_RECORDER = _TRACE_RECORDER, recorder
+    try:
+        yield recorder
+    finally:
+        _TRACE_RECORDER = previous
+        try:
+            recorder.write(path)
+        except OSError as exc:
+            if on_error is None:
+                raise
+            on_error(exc)
+
+
+def current_span() -> Span | None:
+    """The innermost open span of the current context, if any."""
+    return _CURRENT_SPAN.get()
+
+
+def _new_id(nbytes: int) -> str:
+    # Ids only need to be unique within a trace; this avoids a syscall per span.
+    return f"{random.getrandbits(nbytes * 8):0{nbytes * 2}x}"
+
+
+@contextmanager
+def span(name: str) -> Iterator[Span]:
+    """Open a span named ``name`` as a child of the current one.
+
+    A span opened outside any other starts a new trace. Worker threads see
+    the caller's span only when they run in a copy of its context
+    (``contextvars.copy_context().run``).
+    """
+    parent = _CURRENT_SPAN.get()
+    current = Span(
+        name=name,
+        trace_id=parent.trace_id if parent is not None else _new_id(16),
+        span_id=_new_id(8),
+        parent_id=parent.span_id if parent is not None else None,
+    )
+    token = _CURRENT_SPAN.set(current)
+    start_ns = time.perf_counter_ns()
+    error: str | None = None
+    try:
+        yield current
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        end_ns = time.perf_counter_ns()
+        _CURRENT_SPAN.reset(token)
+        recorder = _TRACE_RECORDER
+        if recorder is not None:
+            recorder.add(current, start_ns, end_ns, error)
+
+
+class EventsLogMetricSink(MetricSink):
+    """Appends metrics to the context's events log (the ``file`` sink)."""
+
+    def emit(self, metric: Mapping[str, Any]) -> None:
+        event_sink(_events_log_path()).emit(dict(metric))
+
+    def flush(self) -> None:
+        flush_event_sinks()
+
+
+def build_metric_sinks(policy: MetricsPolicy) -> tuple[MetricSink, ...]:
+    """The sinks ``policy`` names, in order."""
+    sinks: list[MetricSink] = []
+    for name in policy.sinks:
+        if name == "file":
+            sinks.append(EventsLogMetricSink())
+        elif name == "memory":
+            sinks.append(MemoryMetricSink(policy.memory_capacity))
+        elif name == "statsd":
+            sinks.append(
+                StatsdMetricSink(
+                    parse_address(policy.statsd_address),
+                    prefix=policy.statsd_prefix,
+                    dogstatsd=policy.dogstatsd,
+                )
+            )
+        else:
+            sinks.append(NullMetricSink())
+    return tuple(sinks)
+
+
+class _MetricRouting:
+    """Sinks and sample rates in effect; read once per measurement."""
+
+    __slots__ = ("default_rate", "rates", "sinks")
+
+    def __init__(
+        self,
+        sinks: Sequence[MetricSink],
+        default_rate: float = 1.0,
+        rates: Mapping[str, float] | None = None,
+    ):
+        self.sinks = tuple(s for s in sinks if not isinstance(s, NullMetricSink))
+        # Without a sink every measurement is sampled out.
+        self.default_rate = default_rate if self.sinks else 0.0
+        self.rates = dict(rates or {}) if self.sinks else {}
+
+    def sample(self, operation: str) -> float | None:
+        """The sample rate if this measurement of ``operation`` is kept."""
+        rate = self.rates.get(operation, self.default_rate)
+        if rate >= 1.0:
+            return 1.0
+        if rate > 0.0 and random.random() < rate:
+            return rate
+        return None
+
+
+_METRIC_ROUTING = _MetricRouting((EventsLogMetricSink(),))
+_DEFAULT_METRICS = MetricsPolicy()
+
+
+def active_metric_sinks() -> tuple[MetricSink, ...]:
+    """The sinks metrics currently go to (``null`` sinks left out)."""
+    return _METRIC_ROUTING.sinks
+
+
+@contextmanager
+def metrics_policy(
+    policy: MetricsPolicy = _DEFAULT_METRICS,
+    *,
+    sinks: Sequence[MetricSink] | None = None,
+) -> Iterator[tuple[MetricSink, ...]]:
+    """Send metrics to ``policy``'s sinks, sampled at its rates, until the
+    block ends.
+
+    ``sinks`` replaces the sinks ``policy`` names. The sinks are flushed on
+    exit; those built from ``policy`` are also closed.
+    """
+    global _METRIC_ROUTING
+    active = build_metric_sinks(policy) if sinks is None else tuple(sinks)
+    previous = _METRIC_ROUTING
+    _METRIC_ROUTING = _MetricRouting(active, policy.sample_rate, policy.sample_rates)
+    try:
+        yield active
+    finally:
+        _METRIC_ROUTING = previous
+        for sink in active:
+            sink.flush()
+            if sinks is None:
+                sink.close()
+
+
 def measure_time(operation: str) -> Callable[[F], F]:
     """Decorator to measure and log function execution time.
 
     Measures the wall-clock time for a function call and logs it to the
-    events log. Does not affect the function's behavior - exceptions and
+    events log. The call runs in a :func:`span` named ``operation``, whose
+    ids are logged with the metric. Calls that are sampled out (see
+    :func:`metrics_policy`) run bare, without a span, unless a trace is being
+    recorded. Does not affect the function's behavior - exceptions and
     return values pass through unchanged.
 
     Args:
@@ -79,18 +593,25 @@ def measure_time(operation: str) -> Callable[[F], F]:
     def decorator(func: F) -> F:
         @functools.wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            start_time = time.perf_counter()
-            try:
-                result = func(*args, **kwargs)
-                return result
-            finally:
-                # Always log metrics, even if function raised exception
-                duration_ms = (time.perf_counter() - start_time) * 1000
-                log_performance_metric(
-                    operation=operation,
-                    duration_ms=duration_ms,
-                    function_name=func.__name__,
-                )
+            sample_rate = _METRIC_ROUTING.sample(operation)
+            if sample_rate is None and _TRACE_RECORDER is None:
+                return func(*args, **kwargs)
+            with span(operation) as current:
+                start_time = time.perf_counter()
+                try:
+                    result = func(*args, **kwargs)
+                    return result
+                finally:
+                    # Always log metrics, even if function raised exception
+                    if sample_rate is not None:
+                        duration_ms = (time.perf_counter() - start_time) * 1000
+                        log_performance_metric(
+                            operation=operation,
+                            duration_ms=duration_ms,
+                            function_name=func.__name__,
+                            span=current,
+                            sample_rate=sample_rate,
+                        )
 
         return wrapper  # type: ignore[return-value]
 
@@ -102,18 +623,24 @@ def log_performance_metric(
     duration_ms: float,
     function_name: str | None = None,
     context: dict[str, Any] | None = None,
+    span: Span | None = None,
+    sample_rate: float | None = None,
 ) -> None:
-    """Log a performance metric to the events log.
+    """Log a performance metric to the active metric sinks.
 
-    Writes a JSON line to .router/runtime/events.log with performance data.
-    If the events log doesn't exist yet (e.g., during tests or first run),
-    this function silently succeeds without creating directories.
+    By default that queues a JSON line for the context's events log (default
+    .router/runtime/events.log) on its shared :class:`EventSink`; see
+    :func:`metrics_policy`. The operation's sample rate decides whether the
+    metric is kept at all. Write failures are ignored.
 
     Args:
         operation: High-level operation name (e.g., "config_load")
         duration_ms: Execution time in milliseconds
         function_name: Name of the function measured (optional)
         context: Additional context data (optional)
+        span: Span the operation ran in; its ids are recorded (optional)
+        sample_rate: Rate at which the caller already sampled this metric;
+            when omitted, the operation's configured rate is applied here
 
     Example:
         log_performance_metric(
@@ -123,6 +650,12 @@ def log_performance_metric(
             context={"profile": "balanced"}
         )
     """
+    routing = _METRIC_ROUTING
+    if sample_rate is None:
+        sample_rate = routing.sample(operation)
+        if sample_rate is None:
+            return
+
     # Build metric record
     metric: dict[str, Any] = {
         "event": "performance_metric",
@@ -137,20 +670,31 @@ def log_performance_metric(
     if context:
         metric["context"] = context
 
-    # Try to append to events log
-    events_log = _events_log_path()
+    if span is not None:
+        metric.update(span.ids())
 
-    try:
-        # Create parent directories if they don't exist
-        events_log.parent.mkdir(parents=True, exist_ok=True)
+    if sample_rate < 1.0:
+        metric["sample_rate"] = sample_rate
 
-        # Append JSON line to events log
-        with events_log.open("a", encoding="utf-8") as f:
-            f.write(json.dumps(metric) + "\n")
-    except OSError:
-        # Silently fail if we can't write (e.g., permissions, disk full)
-        # Don't break the application for observability failures
-        pass
+    for sink in routing.sinks:
+        sink.emit(metric)
+
+
+def log_metric_records(
+    records: Iterable[dict[str, Any]], *, path: str | Path | None = None
+) -> None:
+    """Append pre-built metric records to the events log as one batch.
+
+    Background samplers run outside any ``events_log_context``, so they pass
+    the events log ``path`` explicitly. Write failures are ignored, as in
+    :func:`log_performance_metric`.
+
+    Args:
+        records: JSON-serializable records, one line each
+        path: Events log to append to (default: the context's events log)
+    """
+    events_log = Path(path) if path is not None else _events_log_path()
+    event_sink(events_log).emit_many(records)
 
 
 def get_recent_metrics(
@@ -158,8 +702,9 @@ def get_recent_metrics(
 ) -> list[dict[str, Any]]:
     """Retrieve recent performance metrics from the events log.
 
-    Reads the events log and returns performance_metric events, optionally
-    filtered by operation name. Most recent events are returned first.
+    Reads the events log, sealed segments included, newest first and returns
+    performance_metric events, optionally filtered by operation name. Reading
+    stops once ``limit`` metrics are found.
 
     Args:
         operation: Filter by operation name (None = return all)
@@ -173,28 +718,20 @@ def get_recent_metrics(
         metrics = get_recent_metrics("config_load", limit=50)
         avg_ms = sum(m["duration_ms"] for m in metrics) / len(metrics)
     """
-    events_log = _events_log_path()
-
-    if not events_log.exists():
-        return []
-
+    flush_event_sinks()
     metrics: list[dict[str, Any]] = []
 
     try:
-        with events_log.open("r", encoding="utf-8") as f:
-            # Read all lines (could optimize with tail for large files)
-            for line in f:
-                try:
-                    event = json.loads(line.strip())
-                    if event.get("event") == "performance_metric":
-                        if operation is None or event.get("operation") == operation:
-                            metrics.append(event)
-                except json.JSONDecodeError:
-                    # Skip malformed lines
-                    continue
+        for event in read_events(
+            _events_log_path(),
+            event="performance_metric",
+            operation=operation,
+            newest_first=True,
+            limit=limit,
+        ):
+            metrics.append(event)
     except OSError:
         # Return empty list if we can't read the file
         return []
 
-    # Return most recent first, limited
-    return list(reversed(metrics[-limit:]))
+    return metrics
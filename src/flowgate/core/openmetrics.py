@@ -0,0 +1,387 @@
+"""OpenMetrics (Prometheus) exposition of FlowGate telemetry.
+
+``flowgate daemon --metrics-listen HOST:PORT`` serves ``GET /metrics`` in the
+OpenMetrics text format. A follower thread reads the records appended to the
+events log (by the daemon and by every other ``flowgate`` process) about once
+a second and folds them into in-memory aggregates, so a scrape only renders
+what is already aggregated and never re-reads the log. Counters and
+histograms start at zero when the daemon starts. A record kept by metric
+sampling counts ``1 / sample_rate`` times, so counts estimate all events.
+
+Exposed families (all labelled by ``service`` or ``operation``):
+
+- ``flowgate_operation_duration_seconds`` (histogram): ``measure_time``
+  operations, from ``performance_metric`` records
+- ``flowgate_service_up`` (gauge): 1 while the service's pid file names a
+  live process, checked at scrape time
+- ``flowgate_service_restarts_total`` (counter): successful restarts, by
+  ``kind`` (``manual``, ``watchdog`` or ``failover``)
+- ``flowgate_events_total`` (counter): every ``record_event`` record, by
+  ``event`` and ``result``
+- ``flowgate_service_time_to_ready_seconds`` (histogram): readiness probe
+  latency from (re)start to the first passing probe
+- ``flowgate_process_cpu_percent``, ``flowgate_process_resident_memory_bytes``,
+  ``flowgate_process_threads``, ``flowgate_process_open_fds`` (gauges): the
+  latest ``resource_sample`` (``flowgate daemon --sample-interval``)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections.abc import Callable, Iterable, Mapping
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import IO, Any
+
+from flowgate.core.metricsinks import sample_weight
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+DEFAULT_METRICS_POLL_INTERVAL = 1.0
+# Histogram bucket upper bounds in seconds.
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+_RESTART_KINDS = {
+    "service_restart": "manual",
+    "watchdog_restart": "watchdog",
+    "service_failover": "failover",
+}
+# resource_sample field -> (metric name, unit, scale)
+_RESOURCE_GAUGES = {
+    "cpu_pct": ("flowgate_process_cpu_percent", None, 1),
+    "rss_kb": ("flowgate_process_resident_memory_bytes", "bytes", 1024),
+    "threads": ("flowgate_process_threads", None, 1),
+    "fds": ("flowgate_process_open_fds", None, 1),
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class _Histogram:
+    __slots__ = ("buckets", "count", "sum")
+
+    def __init__(self, bounds: int) -> None:
+        self.buckets: list[float] = [0] * bounds
+        self.sum = 0.0
+        self.count: float = 0
+
+
+class MetricsRegistry:
+    """In-memory aggregates of events log records, rendered on scrape."""
+
+    def __init__(self, *, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = buckets
+        self._lock = threading.Lock()
+        self._durations: dict[Labels, _Histogram] = {}
+        self._readiness: dict[Labels, _Histogram] = {}
+        # Sampled records count 1 / sample_rate; see sample_weight.
+        self._events: dict[Labels, float] = {}
+        self._restarts: dict[Labels, int] = {}
+        self._gauges: dict[str, dict[Labels, float]] = {
+            name: {} for name, _, _ in _RESOURCE_GAUGES.values()
+        }
+
+    def observe_many(self, records: Iterable[Mapping[str, Any]]) -> None:
+        with self._lock:
+            for record in records:
+                self._observe(record)
+
+    def _observe(self, record: Mapping[str, Any]) -> None:
+        event = record.get("event")
+        if not isinstance(event, str):
+            return
+        service = record.get("service")
+        weight = sample_weight(record)
+        if event == "performance_metric":
+            operation, duration = record.get("operation"), record.get("duration_ms")
+            if isinstance(operation, str) and _is_number(duration):
+                self._observe_histogram(
+                    self._durations,
+                    (("operation", operation),),
+                    duration / 1000,
+                    weight,
+                )
+            return
+        if event == "resource_sample":
+            if isinstance(service, str):
+                for field, (name, _, scale) in _RESOURCE_GAUGES.items():
+                    value = record.get(field)
+                    if _is_number(value):
+                        self._gauges[name][(("service", service),)] = value * scale
+            return
+        if "result" not in record:
+            return  # not a record_event record
+        result = record.get("result")
+        labels = (
+            ("event", event),
+            ("service", service if isinstance(service, str) else ""),
+            ("result", result if isinstance(result, str) else ""),
+        )
+        self._events[labels] = self._events.get(labels, 0) + weight
+        if not isinstance(service, str):
+            return
+        kind = _RESTART_KINDS.get(event)
+        if kind is not None and result == "success":
+            key = (("service", service), ("kind", kind))
+            self._restarts[key] = self._restarts.get(key, 0) + 1
+        ready_ms = record.get("time_to_ready_ms")
+        if _is_number(ready_ms):
+            self._observe_histogram(
+                self._readiness, (("service", service),), ready_ms / 1000, weight
+            )
+
+    def _observe_histogram(
+        self,
+        family: dict[Labels, _Histogram],
+        labels: Labels,
+        value: float,
+        weight: float = 1,
+    ) -> None:
+        histogram = family.get(labels)
+        if histogram is None:
+            histogram = family[labels] = _Histogram(len(self.bounds))
+        for index, bound in enumerate(self.bounds):
+            if value <= bound:
+                histogram.buckets[index] += weight
+                break
+        histogram.sum += value * weight
+        histogram.count += weight
+
+    def render(self, services_up: Mapping[str, bool] | None = None) -> str:
+        """The OpenMetrics text exposition, ``# EOF`` included."""
+        lines: list[str] = []
+        with self._lock:
+            self._render_histograms(
+                lines,
+                "flowgate_operation_duration_seconds",
+                "Duration of measured FlowGate operations.",
+                self._durations,
+            )
+            if services_up is not None:
+                _family(lines, "flowgate_service_up", "gauge", "Service is running.")
+                for service, up in sorted(services_up.items()):
+                    lines.append(
+                        _sample("flowgate_service_up", (("service", service),), int(up))
+                    )
+            _family(
+                lines,
+                "flowgate_service_restarts",
+                "counter",
+                "Successful service restarts.",
+            )
+            for labels, value in sorted(self._restarts.items()):
+                lines.append(_sample("flowgate_service_restarts_total", labels, value))
+            _family(lines, "flowgate_events", "counter", "Recorded lifecycle events.")
+            for labels, value in sorted(self._events.items()):
+                lines.append(_sample("flowgate_events_total", labels, round(value)))
+            self._render_histograms(
+                lines,
+                "flowgate_service_time_to_ready_seconds",
+                "Time from (re)start until the readiness probe passed.",
+                self._readiness,
+            )
+            for name, unit, _ in _RESOURCE_GAUGES.values():
+                _family(lines, name, "gauge", "Latest resource sample.", unit=unit)
+                for labels, value in sorted(self._gauges[name].items()):
+                    lines.append(_sample(name, labels, value))
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _render_histograms(
+        self,
+        lines: list[str],
+        name: str,
+        help_text: str,
+        family: dict[Labels, _Histogram],
+    ) -> None:
+        _family(lines, name, "histogram", help_text, unit="seconds")
+        for labels, histogram in sorted(family.items()):
+            cumulative = 0.0
+            for bound, count in zip(self.bounds, histogram.buckets, strict=True):
+                cumulative += count
+                le = (("le", _format_value(bound)),)
+                lines.append(_sample(f"{name}_bucket", labels + le, round(cumulative)))
+            count = round(histogram.count)
+            lines.append(_sample(f"{name}_bucket", labels + (("le", "+Inf"),), count))
+            lines.append(_sample(f"{name}_sum", labels, histogram.sum))
+            lines.append(_sample(f"{name}_count", labels, count))
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _family(
+    lines: list[str], name: str, kind: str, help_text: str, *, unit: str | None = None
+) -> None:
+    lines.append(f"# TYPE {name} {kind}")
+    if unit is not None:
+        lines.append(f"# UNIT {name} {unit}")
+    lines.append(f"# HELP {name} {help_text}")
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+def _sample(name: str, labels: Labels, value: float) -> str:
+    if not labels:
+        return f"{name} {_format_value(value)}"
+    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+    return f"{name}{{{rendered}}} {_format_value(value)}"
+
+
+class EventsFollower:
+    """Read records appended to an events log since the last :meth:`poll`.
+
+    Follows the log across segment seals (see :mod:`flowgate.core.eventlog`):
+    once the path names a new file, the rest of the old one is read first.
+    """
+
+    def __init__(self, path: str | Path, *, from_start: bool = False):
+        self.path = Path(path)
+        self._file: IO[bytes] | None = None
+        self._partial = b""
+        self._open(at_end=not from_start)
+
+    def _open(self, *, at_end: bool) -> None:
+        try:
+            self._file = self.path.open("rb")
+        except OSError:
+            self._file = None
+            return
+        if at_end:
+            self._file.seek(0, os.SEEK_END)
+
+    def poll(self) -> list[dict[str, Any]]:
+        if self._file is None:
+            # The log did not exist yet: everything in it is new.
+            self._open(at_end=False)
+            if self._file is None:
+                return []
+        records = self._drain(self._file)
+        try:
+            moved = os.stat(self.path).st_ino != os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            moved = True
+        if moved:
+            records += self._drain(self._file)
+            self._file.close()
+            self._partial = b""
+            self._open(at_end=False)
+            if self._file is not None:
+                records += self._drain(self._file)
+        return records
+
+    def _drain(self, file: IO[bytes]) -> list[dict[str, Any]]:
+        data = self._partial + file.read()
+        lines = data.split(b"\n")
+        # The last piece is a line still being written (or empty).
+        self._partial = lines.pop()
+        records = []
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if isinstance(record, dict):
+                records.append(record)
+        return records
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MetricsServer:
+    """Serve ``GET /metrics`` and keep the registry fed from the events log."""
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        events_log: str | Path,
+        *,
+        services_up: Callable[[], Mapping[str, bool]] | None = None,
+        poll_interval: float = DEFAULT_METRICS_POLL_INTERVAL,
+        registry: MetricsRegistry | None = None,
+    ):
+        self.registry = registry or MetricsRegistry()
+        self.follower = EventsFollower(events_log)
+        self.poll_interval = poll_interval
+        self._services_up = services_up
+        self._stop = threading.Event()
+        self._threads: list[threading.Thread] = []
+
+        render = self._render
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                pass  # scrapes are not worth a log line each
+
+        self.httpd = ThreadingHTTPServer(address, _Handler)
+        self.httpd.daemon_threads = True
+
+    @property
+    def address(self) -> tuple[str, int]:
+        host, port = self.httpd.server_address[:2]
+        return str(host), int(port)
+
+    def _render(self) -> str:
+        services_up = self._services_up() if self._services_up is not None else None
+        return self.registry.render(services_up)
+
+    def _follow(self) -> None:
+        while not self._stop.is_set():
+            self.registry.observe_many(self.follower.poll())
+            self._stop.wait(self.poll_interval)
+
+    def start(self) -> None:
+        for target, name in (
+            (self.httpd.serve_forever, "flowgate-metrics-http"),
+            (self._follow, "flowgate-metrics-follow"),
+        ):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self) -> None:
+        self._stop.set()
+        self.httpd.shutdown()
+        for thread in self._threads:
+            thread.join(timeout=5)
+        self.httpd.server_close()
+        self.follower.close()
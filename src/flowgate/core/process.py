@@ -1,25 +1,174 @@
 from __future__ import annotations
 
+import fcntl
+import functools
 import json
+import math
 import os
+import select
 import signal
 import socket
 import subprocess
+import sys
+import tempfile
+import threading
 import time
-from collections.abc import Mapping
+from collections.abc import Iterator, Mapping
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import IO, Any
 
-from flowgate.core.observability import measure_time
+from flowgate.core.logcollector import PIPE_BUFFER_BYTES, LogRotationPolicy
+from flowgate.core.observability import event_sink, measure_time
+from flowgate.core.tuning import ProcessControls, verify_controls
 
 
 class ProcessError(RuntimeError):
     """Raised when a process operation fails (start, stop, restart, port conflicts)."""
 
 
+class ServiceBusyError(ProcessError):
+    """Raised when another operation holds a service's lock past the lock timeout."""
+
+
+# How long start/stop/restart wait for another operation on the same service.
+DEFAULT_LOCK_TIMEOUT = 60.0
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+@functools.cache
+def _boot_id() -> str | None:
+    """Kernel boot id; pid start times are only comparable within one boot."""
+    try:
+        return (
+            Path("/proc/sys/kernel/random/boot_id").read_text("ascii").strip() or None
+        )
+    except OSError:
+        return None
+
+
+def _proc_start_time(pid: int) -> int | None:
+    """Start time of ``pid`` in clock ticks after boot (``/proc/<pid>/stat`` field 22).
+
+    Returns None when the process is gone, is a zombie, or /proc is unavailable.
+    """
+    try:
+        raw = Path(f"/proc/{pid}/stat").read_bytes()
+    except OSError:
+        return None
+    # comm may contain spaces and parens; field 3 starts after the last ')'.
+    fields = raw[raw.rfind(b")") + 2 :].split()
+    try:
+        if fields[0] == b"Z":
+            return None
+        return int(fields[19])
+    except (IndexError, ValueError):
+        return None
+
+
+_TCP_ESTABLISHED = "01"
+_TCP_LISTEN = "0A"
+# How often connection counts are re-read while a stopping service drains.
+_DRAIN_POLL_SECONDS = 0.1
+
+
+def _socket_inodes(pid: int) -> set[int]:
+    """Inodes of the sockets ``pid`` holds open (empty if its fds are unreadable)."""
+    inodes: set[int] = set()
+    try:
+        entries = list(os.scandir(f"/proc/{pid}/fd"))
+    except OSError:
+        return inodes
+    for entry in entries:
+        try:
+            target = os.readlink(entry.path)
+        except OSError:
+            continue
+        if target.startswith("socket:["):
+            inodes.add(int(target[8:-1]))
+    return inodes
+
+
+def _tcp_sockets(pid: int) -> list[tuple[str, int, str, int]]:
+    """``(local_address, local_port, state, inode)`` for every TCP socket in
+    ``pid``'s namespace; addresses stay in the kernel's hex form."""
+    sockets: list[tuple[str, int, str, int]] = []
+    for table in ("tcp", "tcp6"):
+        try:
+            lines = Path(f"/proc/{pid}/net/{table}").read_text("ascii").splitlines()
+        except OSError:
+            continue
+        for line in lines[1:]:
+            fields = line.split()
+            try:
+                address, port = fields[1].rsplit(":", 1)
+                sockets.append((address, int(port, 16), fields[3], int(fields[9])))
+            except (IndexError, ValueError):
+                continue
+    return sockets
+
+
+def _endpoint(address: str, port: int) -> tuple[str | None, int]:
+    """``(address, port)`` with wildcard addresses (``0.0.0.0``, ``::``) as None."""
+    return (None if address.strip("0") == "" else address), port
+
+
+def _listening_endpoints(pid: int) -> set[tuple[str | None, int]]:
+    """Local ``(address, port)`` pairs ``pid`` is listening on (None: any address)."""
+    inodes = _socket_inodes(pid)
+    return {
+        _endpoint(address, port)
+        for address, port, state, inode in _tcp_sockets(pid)
+        if state == _TCP_LISTEN and inode in inodes
+    }
+
+
+def _established_connections(pid: int, endpoints: set[tuple[str | None, int]]) -> int:
+    """Established connections ``pid`` holds on any of ``endpoints`` (inbound traffic).
+
+    Connections still waiting in the listen backlog count too: they have no
+    file yet, so their inode is 0 rather than one of ``pid``'s sockets. Other
+    processes' orphaned sockets look the same, so an inode-0 row only counts
+    when its local address and port are one of ``endpoints``.
+    """
+    if not endpoints:
+        return 0
+    ports = {port for _, port in endpoints}
+    inodes = _socket_inodes(pid)
+    count = 0
+    for address, port, state, inode in _tcp_sockets(pid):
+        if state != _TCP_ESTABLISHED or port not in ports:
+            continue
+        if inode in inodes or (
+            inode == 0 and ((address, port) in endpoints or (None, port) in endpoints)
+        ):
+            count += 1
+    return count
+
+
 class ProcessSupervisor:
+    """Start, stop and track services through pid files under ``runtime_dir``.
+
+    Operations on one service are serialized across threads and processes by
+    an ``flock`` on ``pids/<name>.lock``; different services never contend.
+    Pid files are replaced atomically, so readers (``is_running``, ``status``)
+    take no lock. A caller waiting on the lock sees the outcome of the
+    operation ahead of it: a second ``start`` finds the service running, a
+    second ``stop`` finds it stopped, and a ``restart`` requested before a
+    concurrent restart completed is coalesced into it. Waiting is bounded by
+    ``lock_timeout`` (0 fails fast) and raises :class:`ServiceBusyError`.
+    """
+
     def __init__(
-        self, runtime_dir: str | Path, *, events_log: str | Path | None = None
+        self,
+        runtime_dir: str | Path,
+        *,
+        events_log: str | Path | None = None,
+        lock_timeout: float = DEFAULT_LOCK_TIMEOUT,
     ):
         self.runtime_dir = Path(runtime_dir)
         self.pid_dir = self.runtime_dir / "pids"
@@ -30,12 +179,85 @@ class ProcessSupervisor:
             else (self.runtime_dir / "events.log")
         )
         self._children: dict[str, subprocess.Popen[bytes]] = {}
+        self.lock_timeout = lock_timeout
+        self._held = threading.local()
         self.pid_dir.mkdir(parents=True, exist_ok=True)
         self.log_dir.mkdir(parents=True, exist_ok=True)
 
     def _pid_path(self, name: str) -> Path:
         return self.pid_dir / f"{name}.pid"
 
+    def _write_pid_record(self, name: str, record: Mapping[str, Any]) -> None:
+        """Atomically replace the pid file (temp file + rename)."""
+        target = self._pid_path(name)
+        fd, tmp = tempfile.mkstemp(dir=self.pid_dir, prefix=f".{target.name}.")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(record, handle)
+            os.replace(tmp, target)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    @contextmanager
+    def locked(self, name: str, *, timeout: float | None = None) -> Iterator[None]:
+        """Hold the per-service lock; re-entrant within a thread.
+
+        Raises ServiceBusyError when the lock is still held by another
+        operation after ``timeout`` seconds (default: ``lock_timeout``).
+        """
+        held: dict[str, list[int]] = self._held.__dict__.setdefault("locks", {})
+        entry = held.get(name)
+        if entry is not None:
+            entry[1] += 1
+            try:
+                yield
+            finally:
+                entry[1] -= 1
+            return
+
+        wait = self.lock_timeout if timeout is None else timeout
+        fd = os.open(self.pid_dir / f"{name}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            deadline = time.monotonic() + max(wait, 0.0)
+            delay = 0.005
+            while True:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        holder = os.pread(fd, 32, 0).decode("ascii", "ignore").strip()
+                        raise ServiceBusyError(
+                            f"{name} is busy with another flowgate operation"
+                            + (f" (pid {holder})" if holder else "")
+                        ) from None
+                    time.sleep(min(delay, remaining))
+                    delay = min(delay * 2, 0.1)
+            os.ftruncate(fd, 0)
+            os.pwrite(fd, str(os.getpid()).encode("ascii"), 0)
+            held[name] = [fd, 1]
+            try:
+                yield
+            finally:
+                del held[name]
+        finally:
+            # Closing the descriptor releases the flock.
+            os.close(fd)
+
+    def restarted_since(self, name: str, since: datetime) -> int | None:
+        """Pid of the running instance if it was started at or after ``since``."""
+        record = self._read_pid_record(name)
+        started = record.get("started_at") if record else None
+        if not isinstance(started, str) or not self.is_running(name):
+            return None
+        try:
+            started_at = datetime.fromisoformat(started)
+        except ValueError:
+            return None
+        return self._read_pid(name) if started_at >= since else None
+
     def _read_pid_record(self, name: str) -> dict[str, object] | None:
         path = self._pid_path(name)
         if not path.exists():
@@ -59,6 +281,14 @@ class ProcessSupervisor:
         pid = record.get("pid")
         return pid if isinstance(pid, int) else None
 
+    def read_pid(self, name: str) -> int | None:
+        """Pid recorded for ``name``, or None.
+
+        The pid is not verified; use :meth:`is_running` to check that it is
+        still the process that was started.
+        """
+        return self._read_pid(name)
+
     @staticmethod
     def _safe_basename(value: str) -> str:
         try:
@@ -91,6 +321,13 @@ class ProcessSupervisor:
         return cmd.split() if cmd else None
 
     def _pid_matches_record(self, pid: int, record: dict[str, object]) -> bool:
+        start_time = record.get("start_time")
+        boot_id = record.get("boot_id")
+        if isinstance(start_time, int) and isinstance(boot_id, str):
+            # Exact and O(1): a reused pid cannot share the same start tick.
+            return boot_id == _boot_id() and _proc_start_time(pid) == start_time
+
+        # Legacy records (or no /proc at start time): compare the command name.
         expected = record.get("command")
         if not isinstance(expected, list) or not expected:
             # No expectation recorded; can't validate.
@@ -117,6 +354,112 @@ class ProcessSupervisor:
         except PermissionError:
             return True
 
+    @staticmethod
+    def _open_pidfd(pid: int) -> int | None:
+        """Return a pidfd for ``pid`` or None when pidfds are unsupported.
+
+        Raises ProcessLookupError when the process no longer exists.
+        """
+        pidfd_open = getattr(os, "pidfd_open", None)
+        if pidfd_open is None:
+            return None
+        try:
+            return pidfd_open(pid)
+        except ProcessLookupError:
+            raise
+        except OSError:
+            # ENOSYS (old kernel), EPERM (seccomp) and friends.
+            return None
+
+    @staticmethod
+    def _reap(pid: int, child: subprocess.Popen[bytes] | None) -> None:
+        if child is not None:
+            child.poll()
+            return
+        try:
+            os.waitpid(pid, os.WNOHANG)
+        except (ChildProcessError, OSError):
+            # Not our child; init (or the original parent) reaps it.
+            pass
+
+    def pid_alive(self, pid: int) -> bool:
+        """True while ``pid`` exists (including zombies not yet reaped)."""
+        return self._is_pid_running(pid)
+
+    def open_pidfd(self, pid: int) -> int | None:
+        """Return a pidfd for ``pid`` or None when pidfds are unsupported.
+
+        The caller owns the descriptor. Raises ProcessLookupError when the
+        process no longer exists.
+        """
+        return self._open_pidfd(pid)
+
+    def reap(self, name: str, pid: int) -> int | None:
+        """Collect ``pid`` if it has exited so it does not linger as a zombie.
+
+        Returns its exit code when ``pid`` is the child started for ``name``
+        by this supervisor and it has exited, otherwise None.
+        """
+        child = self._children.get(name)
+        if child is None or child.pid != pid:
+            self._reap(pid, None)
+            return None
+        return child.poll()
+
+    def _wait_for_exit(
+        self,
+        pid: int,
+        timeout: float,
+        *,
+        child: subprocess.Popen[bytes] | None = None,
+    ) -> bool:
+        """Block until ``pid`` exits or ``timeout`` elapses; True if it exited.
+
+        Prefers a pidfd so the wakeup happens as soon as the process exits.
+        Without pidfd support, tracked children are waited on via ``waitpid``
+        and adopted pids are polled with a short exponential backoff.
+        """
+        deadline = time.monotonic() + max(timeout, 0.0)
+        gone = False
+        try:
+            pidfd = self._open_pidfd(pid)
+        except ProcessLookupError:
+            pidfd = None
+            gone = True
+
+        if gone:
+            self._reap(pid, child)
+        elif pidfd is not None:
+            try:
+                poller = select.poll()
+                poller.register(pidfd, select.POLLIN)
+                remaining_ms = math.ceil(max(deadline - time.monotonic(), 0.0) * 1000)
+                ready = poller.poll(remaining_ms)
+            finally:
+                os.close(pidfd)
+            if not ready:
+                return False
+            self._reap(pid, child)
+            if not self._is_pid_running(pid):
+                return True
+            # Liveness disagrees with the pidfd (e.g. a reused pid); fall
+            # through to polling for the rest of the deadline.
+        elif child is not None:
+            try:
+                child.wait(timeout=max(deadline - time.monotonic(), 0.0))
+            except subprocess.TimeoutExpired:
+                return False
+            return True
+
+        delay = 0.001
+        while self._is_pid_running(pid):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.05)
+        return True
+
     def record_event(
         self,
         event: str,
@@ -126,8 +469,9 @@ class ProcessSupervisor:
         provider: str | None = None,
         result: str = "success",
         detail: str | None = None,
+        extra: Mapping[str, Any] | None = None,
     ) -> None:
-        payload = {
+        payload: dict[str, Any] = {
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "event": event,
             "service": service,
@@ -136,13 +480,9 @@ class ProcessSupervisor:
             "result": result,
             "detail": detail,
         }
-        try:
-            self.events_log.parent.mkdir(parents=True, exist_ok=True)
-            with self.events_log.open("a", encoding="utf-8") as fp:
-                fp.write(json.dumps(payload, ensure_ascii=True) + "\n")
-        except OSError:
-            # Observability logging must never block service control path.
-            return
+        if extra:
+            payload.update(extra)
+        event_sink(self.events_log).emit(payload)
 
     def is_running(self, name: str) -> bool:
         record = self._read_pid_record(name)
@@ -157,6 +497,36 @@ class ProcessSupervisor:
             return False
         return self._pid_matches_record(pid, record)
 
+    def controls_drift(self, name: str) -> list[str] | None:
+        """Process controls recorded at start that no longer hold for the live pid.
+
+        Returns None when the service is not running or was started without
+        process controls.
+        """
+        record = self._read_pid_record(name)
+        controls = record.get("controls") if record else None
+        if not isinstance(controls, dict) or not self.is_running(name):
+            return None
+        pid = self._read_pid(name)
+        return verify_controls(pid, controls) if pid is not None else None
+
+    def service_port(self, name: str) -> int | None:
+        """Return the port recorded for a service at start time, if any."""
+        record = self._read_pid_record(name)
+        port = record.get("port") if record else None
+        return port if isinstance(port, int) else None
+
+    def rename(self, source: str, target: str) -> None:
+        """Re-key a tracked process from ``source`` to ``target``.
+
+        Used to promote a standby instance once it has taken over traffic.
+        Any pid record still registered under ``target`` is replaced.
+        """
+        os.replace(self._pid_path(source), self._pid_path(target))
+        child = self._children.pop(source, None)
+        if child is not None:
+            self._children[target] = child
+
     @measure_time("service_start")
     def start(
         self,
@@ -165,139 +535,294 @@ class ProcessSupervisor:
         *,
         cwd: str | None = None,
         env: Mapping[str, str] | None = None,
+        metadata: Mapping[str, Any] | None = None,
+        log_name: str | None = None,
+        log_rotation: LogRotationPolicy | None = None,
+        controls: ProcessControls | None = None,
+        drain_timeout: float | None = None,
     ) -> int:
-        if self.is_running(name):
-            pid = self._read_pid(name)
-            if pid is None:
-                raise RuntimeError(f"{name} appears running but no pid is available")
+        with self.locked(name):
+            if self.is_running(name):
+                pid = self._read_pid(name)
+                if pid is None:
+                    raise RuntimeError(
+                        f"{name} appears running but no pid is available"
+                    )
+                self.record_event(
+                    "service_start",
+                    service=name,
+                    result="already-running",
+                    detail=f"pid={pid}",
+                )
+                return pid
+
+            spawn_command = list(command)
+            if controls is not None:
+                problems = controls.problems()
+                if problems:
+                    detail = "; ".join(problems)
+                    self.record_event(
+                        "service_start", service=name, result="failed", detail=detail
+                    )
+                    raise ProcessError(
+                        f"Cannot apply process controls to {name}: {detail}"
+                    )
+                spawn_command = controls.wrap(spawn_command)
+
+            log_path = self.log_dir / f"{log_name or name}.log"
+            collector: subprocess.Popen[bytes] | None = None
+            log_file: IO[bytes]
+            if log_rotation is not None:
+                collector = self._start_log_collector(log_path, log_rotation)
+                assert collector.stdin is not None
+                log_file = collector.stdin
+            else:
+                log_file = log_path.open("ab")
+            run_env = os.environ.copy()
+            if env:
+                run_env.update(env)
+
+            try:
+                process = subprocess.Popen(
+                    spawn_command,
+                    cwd=cwd,
+                    env=run_env,
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    start_new_session=True,
+                )
+            except Exception as exc:  # noqa: BLE001
+                self.record_event(
+                    "service_start", service=name, result="failed", detail=str(exc)
+                )
+                log_file.close()
+                raise
+
+            pid_record: dict[str, Any] = {
+                "pid": process.pid,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "command": list(command),
+                "cwd": str(cwd) if cwd is not None else None,
+            }
+            start_time = _proc_start_time(process.pid)
+            boot_id = _boot_id()
+            if start_time is not None and boot_id is not None:
+                pid_record["start_time"] = start_time
+                pid_record["boot_id"] = boot_id
+            if collector is not None:
+                pid_record["log_collector_pid"] = collector.pid
+            if controls is not None:
+                pid_record["controls"] = controls.to_record()
+            if drain_timeout:
+                pid_record["drain_timeout"] = drain_timeout
+            if metadata:
+                pid_record.update(metadata)
+            self._write_pid_record(name, pid_record)
+            self._children[name] = process
+            log_file.close()
             self.record_event(
                 "service_start",
                 service=name,
-                result="already-running",
-                detail=f"pid={pid}",
+                result="success",
+                detail=f"pid={process.pid}",
             )
-            return pid
-
-        log_path = self.log_dir / f"{name}.log"
-        log_file = log_path.open("ab")
-        run_env = os.environ.copy()
-        if env:
-            run_env.update(env)
+            return process.pid
 
-        try:
-            process = subprocess.Popen(
-                command,
-                cwd=cwd,
-                env=run_env,
-                stdin=subprocess.DEVNULL,
-                stdout=log_file,
-                stderr=subprocess.STDOUT,
-                start_new_session=True,
-            )
-        except Exception as exc:  # noqa: BLE001
-            self.record_event(
-                "service_start", service=name, result="failed", detail=str(exc)
-            )
-            log_file.close()
-            raise
-
-        pid_record = {
-            "pid": process.pid,
-            "started_at": datetime.now(timezone.utc).isoformat(),
-            "command": list(command),
-            "cwd": str(cwd) if cwd is not None else None,
-        }
-        self._pid_path(name).write_text(json.dumps(pid_record), encoding="utf-8")
-        self._children[name] = process
-        log_file.close()
-        self.record_event(
-            "service_start", service=name, result="success", detail=f"pid={process.pid}"
+    @staticmethod
+    def _start_log_collector(
+        log_path: Path, policy: LogRotationPolicy
+    ) -> subprocess.Popen[bytes]:
+        """Spawn the rotating log collector; the child writes into its stdin."""
+        collector = subprocess.Popen(
+            [
+                sys.executable,
+                "-m",
+                "flowgate.core.logcollector",
+                "--path",
+                str(log_path),
+                *policy.to_args(),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            # Own session: Ctrl-C on the CLI must not take the collector (and
+            # with it the child's stdout) down.
+            start_new_session=True,
         )
-        return process.pid
+        set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)  # Linux only
+        if set_pipe_size is not None and collector.stdin is not None:
+            try:
+                fcntl.fcntl(collector.stdin.fileno(), set_pipe_size, PIPE_BUFFER_BYTES)
+            except OSError:
+                # Capped by /proc/sys/fs/pipe-max-size; the default still works.
+                pass
+        return collector
 
     @measure_time("service_stop")
-    def stop(self, name: str, *, timeout: float = 5.0) -> bool:
-        child = self._children.get(name)
-        if child is not None:
-            if child.poll() is None:
-                child.terminate()
-                try:
-                    child.wait(timeout=timeout)
-                except subprocess.TimeoutExpired:
-                    child.kill()
-                    child.wait(timeout=1)
-            self._pid_path(name).unlink(missing_ok=True)
-            self._children.pop(name, None)
-            self.record_event("service_stop", service=name, result="success")
-            return True
-
-        pid = self._read_pid(name)
-        if pid is None:
-            self.record_event("service_stop", service=name, result="not-running")
-            return True
-
-        record = self._read_pid_record(name) or {"pid": pid}
-        if not self._is_pid_running(pid):
-            self._pid_path(name).unlink(missing_ok=True)
-            self.record_event(
-                "service_stop", service=name, result="stale-pid", detail=f"pid={pid}"
-            )
-            return True
+    def stop(
+        self, name: str, *, timeout: float = 5.0, drain_timeout: float | None = None
+    ) -> bool:
+        """SIGTERM a service and escalate to SIGKILL if it does not exit.
+
+        When a drain deadline is set (``drain_timeout``, or the one recorded at
+        start), a service still holding established connections on its ports
+        after ``timeout`` gets until the drain deadline (counted from SIGTERM)
+        to finish them before it is killed.
+        """
+        with self.locked(name):
+            record = self._read_pid_record(name)
+            if drain_timeout is None:
+                recorded = record.get("drain_timeout") if record else None
+                drain_timeout = (
+                    float(recorded)
+                    if isinstance(recorded, (int, float))
+                    and not isinstance(recorded, bool)
+                    else 0.0
+                )
 
-        if not self._pid_matches_record(pid, record):
-            # Safer default: don't kill a PID that doesn't look like the service we started.
-            self._pid_path(name).unlink(missing_ok=True)
-            self.record_event(
-                "service_stop",
-                service=name,
-                result="stale-pid-mismatch",
-                detail=f"pid={pid}",
-            )
-            return True
+            child = self._children.get(name)
+            if child is not None:
+                result = "success"
+                extra: dict[str, Any] = {}
+                if child.poll() is None:
+                    result, extra = self._terminate(
+                        child.pid,
+                        record,
+                        timeout=timeout,
+                        drain_timeout=drain_timeout,
+                        child=child,
+                    )
+                    if result == "timeout":
+                        self.record_event(
+                            "service_stop",
+                            service=name,
+                            result=result,
+                            detail=f"pid={child.pid}",
+                            extra=extra,
+                        )
+                        return False
+                self._pid_path(name).unlink(missing_ok=True)
+                self._children.pop(name, None)
+                self.record_event(
+                    "service_stop", service=name, result=result, extra=extra
+                )
+                return True
 
-        try:
-            os.kill(pid, signal.SIGTERM)
-        except ProcessLookupError:
-            self._pid_path(name).unlink(missing_ok=True)
-            self.record_event(
-                "service_stop",
-                service=name,
-                result="already-exited",
-                detail=f"pid={pid}",
-            )
-            return True
+            pid = self._read_pid(name)
+            if pid is None:
+                self.record_event("service_stop", service=name, result="not-running")
+                return True
 
-        deadline = time.time() + timeout
-        while time.time() < deadline:
+            record = record or {"pid": pid}
             if not self._is_pid_running(pid):
                 self._pid_path(name).unlink(missing_ok=True)
                 self.record_event(
-                    "service_stop", service=name, result="success", detail=f"pid={pid}"
+                    "service_stop",
+                    service=name,
+                    result="stale-pid",
+                    detail=f"pid={pid}",
                 )
                 return True
-            time.sleep(0.1)
-
-        try:
-            os.kill(pid, signal.SIGKILL)
-        except ProcessLookupError:
-            pass
 
-        for _ in range(10):
-            if not self._is_pid_running(pid):
+            if not self._pid_matches_record(pid, record):
+                # Safer default: don't kill a PID that doesn't look like the service we started.
                 self._pid_path(name).unlink(missing_ok=True)
                 self.record_event(
                     "service_stop",
                     service=name,
-                    result="success-after-kill",
+                    result="stale-pid-mismatch",
                     detail=f"pid={pid}",
                 )
                 return True
-            time.sleep(0.1)
 
-        self.record_event(
-            "service_stop", service=name, result="timeout", detail=f"pid={pid}"
-        )
-        return False
+            result, extra = self._terminate(
+                pid, record, timeout=timeout, drain_timeout=drain_timeout
+            )
+            if result != "timeout":
+                self._pid_path(name).unlink(missing_ok=True)
+            self.record_event(
+                "service_stop",
+                service=name,
+                result=result,
+                detail=f"pid={pid}",
+                extra=extra,
+            )
+            return result != "timeout"
+
+    def _terminate(
+        self,
+        pid: int,
+        record: Mapping[str, Any] | None,
+        *,
+        timeout: float,
+        drain_timeout: float,
+        child: subprocess.Popen[bytes] | None = None,
+    ) -> tuple[str, dict[str, Any]]:
+        """SIGTERM ``pid``, let it drain, then SIGKILL; return (result, event extras).
+
+        Connections are counted from ``/proc/<pid>/net/tcp{,6}``, restricted to
+        sockets owned by ``pid`` on the ports it listened on when the stop began
+        (services usually close their listener on SIGTERM) or the recorded port;
+        backlog connections must also match the listening address.
+        """
+        draining = drain_timeout > 0
+        endpoints: set[tuple[str | None, int]] = set()
+        open_at_stop = 0
+        if draining:
+            port = record.get("port") if record else None
+            endpoints = _listening_endpoints(pid)
+            if isinstance(port, int) and all(p != port for _, p in endpoints):
+                endpoints.add((None, port))
+            open_at_stop = _established_connections(pid, endpoints)
+
+        signalled_at = time.perf_counter()
+        try:
+            if child is not None:
+                child.terminate()
+            else:
+                os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            return "already-exited", {}
+
+        exited = self._wait_for_exit(pid, timeout, child=child)
+        remaining = 0
+        if not exited and draining:
+            deadline = signalled_at + drain_timeout
+            while True:
+                remaining = _established_connections(pid, endpoints)
+                left = deadline - time.perf_counter()
+                if remaining == 0 or left <= 0:
+                    break
+                if self._wait_for_exit(
+                    pid, min(_DRAIN_POLL_SECONDS, left), child=child
+                ):
+                    exited = True
+                    remaining = 0
+                    break
+        drain_ms = _elapsed_ms(signalled_at)
+
+        result = "success"
+        if not exited:
+            try:
+                if child is not None:
+                    child.kill()
+                else:
+                    os.kill(pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+            exited = self._wait_for_exit(pid, 1.0, child=child)
+            result = "success-after-kill" if exited else "timeout"
+
+        extra: dict[str, Any] = {"time_to_exit_ms": _elapsed_ms(signalled_at)}
+        if draining:
+            extra.update(
+                connections_at_stop=open_at_stop,
+                drained_connections=max(open_at_stop - remaining, 0),
+                connections_at_kill=remaining if result != "success" else 0,
+                drain_ms=drain_ms,
+            )
+        return result, extra
 
     @measure_time("service_restart")
     def restart(
@@ -307,18 +832,44 @@ class ProcessSupervisor:
         *,
         cwd: str | None = None,
         env: Mapping[str, str] | None = None,
+        log_rotation: LogRotationPolicy | None = None,
+        controls: ProcessControls | None = None,
+        drain_timeout: float | None = None,
     ) -> int:
-        stopped = self.stop(name)
-        if not stopped:
+        requested_at = datetime.now(timezone.utc)
+        with self.locked(name):
+            pid = self.restarted_since(name, requested_at)
+            if pid is not None:
+                # Another caller restarted it while we waited for the lock.
+                self.record_event(
+                    "service_restart",
+                    service=name,
+                    result="coalesced",
+                    detail=f"pid={pid}",
+                )
+                return pid
+            stopped = self.stop(name)
+            if not stopped:
+                self.record_event(
+                    "service_restart",
+                    service=name,
+                    result="failed",
+                    detail="stop-timeout",
+                )
+                raise RuntimeError(f"Failed to stop service before restart: {name}")
+            pid = self.start(
+                name,
+                command,
+                cwd=cwd,
+                env=env,
+                log_rotation=log_rotation,
+                controls=controls,
+                drain_timeout=drain_timeout,
+            )
             self.record_event(
-                "service_restart", service=name, result="failed", detail="stop-timeout"
+                "service_restart", service=name, result="success", detail=f"pid={pid}"
             )
-            raise RuntimeError(f"Failed to stop service before restart: {name}")
-        pid = self.start(name, command, cwd=cwd, env=env)
-        self.record_event(
-            "service_restart", service=name, result="success", detail=f"pid={pid}"
-        )
-        return pid
+            return pid
 
 
 def is_port_available(host: str, port: int) -> bool:
@@ -0,0 +1,133 @@
+"""On-demand CPU and memory profiling of one FlowGate command.
+
+``flowgate --profile <command>`` runs the command under :mod:`cProfile` and
+``--profile-memory`` under :mod:`tracemalloc`. When the command ends,
+:func:`profile_command` writes, to ``<runtime_dir>/profiles/``:
+
+    <command>-<UTC timestamp>.pstats   raw cProfile stats (``--profile``)
+    <command>-<UTC timestamp>.txt      top functions by cumulative time, and
+                                       peak memory with the top allocation
+                                       sites (``--profile-memory``)
+
+The ``.pstats`` file loads with ``python -m pstats`` or snakeviz. cProfile
+only sees the thread that enabled it, so work done by worker threads shows
+up as time waiting for them; ``--trace-out`` covers those threads.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import io
+import pstats
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROFILES_DIR = "profiles"
+DEFAULT_PROFILE_TOP = 30
+# Frames kept per allocation; enough to see the caller of a library call.
+_TRACEMALLOC_FRAMES = 10
+
+
+@dataclass
+class ProfileSession:
+    """Where a :func:`profile_command` run writes its artifacts.
+
+    ``directory`` may be changed while the command runs, e.g. once its
+    configured runtime dir is known. ``artifacts`` lists the files written.
+    """
+
+    name: str
+    directory: Path
+    top: int = DEFAULT_PROFILE_TOP
+    artifacts: list[Path] = field(default_factory=list)
+
+
+@contextmanager
+def profile_command(
+    name: str,
+    directory: str | Path,
+    *,
+    cpu: bool = True,
+    memory: bool = False,
+    top: int = DEFAULT_PROFILE_TOP,
+) -> Iterator[ProfileSession]:
+    """Profile the block and write its artifacts when it ends.
+
+    Raises:
+        OSError: If the profiles directory or a file cannot be written
+    """
+    session = ProfileSession(name=name, directory=Path(directory), top=top)
+    started_tracemalloc = False
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start(_TRACEMALLOC_FRAMES)
+        started_tracemalloc = True
+    profiler = cProfile.Profile() if cpu else None
+    if profiler is not None:
+        profiler.enable()
+    try:
+        yield session
+    finally:
+        if profiler is not None:
+            profiler.disable()
+        peak, snapshot = 0, None
+        if memory and tracemalloc.is_tracing():
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracemalloc:
+                tracemalloc.stop()
+        _write_artifacts(session, profiler, peak, snapshot)
+
+
+def _write_artifacts(
+    session: ProfileSession,
+    profiler: cProfile.Profile | None,
+    peak: int,
+    snapshot: tracemalloc.Snapshot | None,
+) -> None:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S.%fZ")
+    base = f"{session.name}-{stamp}"
+    session.directory.mkdir(parents=True, exist_ok=True)
+    sections = [f"# flowgate {session.name} profile ({stamp})"]
+    if profiler is not None:
+        stats_path = session.directory / f"{base}.pstats"
+        profiler.dump_stats(stats_path)
+        session.artifacts.append(stats_path)
+        sections.append(_cpu_summary(profiler, session.top))
+    if snapshot is not None:
+        sections.append(_memory_summary(peak, snapshot, session.top))
+    summary_path = session.directory / f"{base}.txt"
+    summary_path.write_text("\n\n".join(sections) + "\n", encoding="utf-8")
+    session.artifacts.append(summary_path)
+
+
+def _cpu_summary(profiler: cProfile.Profile, top: int) -> str:
+    buffer = io.StringIO()
+    stats = pstats.Stats(profiler, stream=buffer)
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return f"## Top {top} functions by cumulative time\n{buffer.getvalue()}"
+
+
+def _memory_summary(peak: int, snapshot: tracemalloc.Snapshot, top: int) -> str:
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        )
+    )
+    lines = [
+        "## Memory",
+        f"peak_traced_bytes={peak} ({peak / 1024 / 1024:.1f} MiB)",
+        f"### Top {top} allocation sites still live at exit",
+    ]
+    for stat in snapshot.statistics("lineno")[:top]:
+        frame = stat.traceback[0]
+        lines.append(
+            f"{stat.size / 1024:10.1f} KiB {stat.count:8d} blocks  "
+            f"{frame.filename}:{frame.lineno}"
+        )
+    return "\n".join(lines)
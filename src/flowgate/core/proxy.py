@@ -0,0 +1,481 @@
+"""FlowGate front proxy: owns the public port and forwards to backends.
+
+The proxy is a small asyncio TCP forwarder that runs as a supervised service
+(``flowgate_proxy``). Its backend table lives in a JSON routes file that
+FlowGate rewrites atomically (temp file + rename). The proxy checks the file
+on every accepted connection, so switching traffic to a new backend never
+touches the listening socket and established connections keep flowing to the
+backend they were opened against.
+
+Each new connection goes to the backend with the fewest open connections.
+Backends whose readiness probe (``check_http_health``) fails, or that refuse a
+connection, are taken out of rotation until a later probe passes. Bytes are
+spliced through as they arrive, so keep-alive connections stay pinned to one
+upstream connection and streaming (SSE) responses are never buffered.
+
+Backends marked ``standby`` (hot spares) only get connections while no regular
+backend is healthy, so a crashed backend's traffic moves to its spare on the
+very next connection.
+
+With a ``lazy`` section in the routes file the proxy also starts the backends
+on the first connection and stops them when idle (see ``lazystart``).
+
+Run with:
+    python -m flowgate.core.proxy --routes <runtime_dir>/proxy/routes.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from flowgate.core.constants import DEFAULT_PROXY_HEALTH_INTERVAL
+from flowgate.core.health import check_http_health
+
+if TYPE_CHECKING:
+    from flowgate.core.lazystart import LazyBackends
+
+_CHUNK_SIZE = 64 * 1024
+DEFAULT_PROXY_DRAIN_TIMEOUT = 5.0
+
+
+def write_routes(path: str | Path, routes: dict[str, Any]) -> None:
+    """Atomically replace the routes file so the proxy never sees a partial write."""
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(routes, handle, sort_keys=True)
+        os.replace(tmp, target)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def read_routes(path: str | Path) -> dict[str, Any] | None:
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def proxy_state_path(routes_path: str | Path, pid: int) -> Path:
+    """Path of the state file a proxy process writes once it is listening."""
+    return Path(routes_path).parent / f"proxy-{pid}.state.json"
+
+
+def proxy_handoff_path(routes_path: str | Path, pid: int) -> Path:
+    """Unix socket a running proxy uses to hand its listener to a replacement."""
+    return Path(routes_path).parent / f"proxy-{pid}.handoff.sock"
+
+
+def _receive_listener(path: Path) -> socket.socket | None:
+    """Take over the listening socket of the proxy serving ``path``."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(5.0)
+            conn.connect(str(path))
+            _msg, fds, _flags, _addr = socket.recv_fds(conn, 16, 1)
+    except OSError:
+        return None
+    if not fds:
+        return None
+    return socket.socket(fileno=fds[0])
+
+
+@dataclass
+class Backend:
+    """One upstream in rotation, with its live connection count and health."""
+
+    name: str
+    host: str
+    port: int
+    readiness_url: str | None = None
+    active: int = 0
+    healthy: bool = True
+    standby: bool = False
+
+    @property
+    def address(self) -> tuple[str, int]:
+        return (self.host, self.port)
+
+
+def _parse_backends(entries: Iterable[Any]) -> list[Backend]:
+    backends: list[Backend] = []
+    for entry in entries:
+        if not isinstance(entry, dict):
+            continue
+        host = entry.get("host")
+        port = entry.get("port")
+        if isinstance(host, str) and isinstance(port, int):
+            url = entry.get("readiness_url")
+            backends.append(
+                Backend(
+                    name=str(entry.get("name", f"{host}:{port}")),
+                    host=host,
+                    port=port,
+                    readiness_url=url if isinstance(url, str) else None,
+                    standby=entry.get("standby") is True,
+                )
+            )
+    return backends
+
+
+def _set_nodelay(sock: socket.socket | None) -> None:
+    # Small SSE events must not wait for Nagle to coalesce them.
+    if sock is None or sock.family not in (socket.AF_INET, socket.AF_INET6):
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+    except OSError:
+        pass
+
+
+async def _pipe(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    """Copy bytes until EOF without buffering whole responses (SSE-safe)."""
+    try:
+        while True:
+            data = await reader.read(_CHUNK_SIZE)
+            if not data:
+                break
+            writer.write(data)
+            await writer.drain()
+        if writer.can_write_eof():
+            writer.write_eof()
+    except (ConnectionError, OSError):
+        # Tear down the other direction too; its read will see EOF/reset.
+        writer.close()
+
+
+class FrontProxy:
+    """Asyncio TCP forwarder driven by a hot-reloadable routes file.
+
+    Accepting is driven by a plain reader callback on the listening socket
+    instead of ``asyncio.start_server``: ``Server.close()`` can strand a
+    connection accepted in the same loop iteration, which the kernel then
+    resets when the process exits. With the callback, stopping is just
+    ``remove_reader`` and everything not yet accepted stays queued for
+    whoever holds the socket next.
+    """
+
+    def __init__(self, routes_path: str | Path, *, lazy: LazyBackends | None = None):
+        self.routes_path = Path(routes_path)
+        self.lazy = lazy
+        self.routes: dict[str, Any] = {}
+        self.active_connections = 0
+        self.backends: list[Backend] = []
+        self._rotation = 0
+        self._health_task: asyncio.Task[None] | None = None
+        self._lazy_task: asyncio.Task[None] | None = None
+        self._routes_stamp: tuple[int, int, int] | None = None
+        self._listener: socket.socket | None = None
+        self._tasks: set[asyncio.Task[None]] = set()
+        self._drained: asyncio.Event | None = None
+        self.reload()
+
+    def reload(self, *, force: bool = False) -> bool:
+        """Re-read the routes file if it changed; returns True when applied."""
+        try:
+            st = os.stat(self.routes_path)
+        except OSError:
+            return False
+        stamp = (st.st_mtime_ns, st.st_size, st.st_ino)
+        if stamp == self._routes_stamp and not force:
+            return False
+        routes = read_routes(self.routes_path)
+        if routes is None:
+            return False
+        self._routes_stamp = stamp
+        self.routes = routes
+        # Keep counters and health for backends that survive the reload, so
+        # in-flight connections are still accounted against them.
+        known = {b.address: b for b in self.backends}
+        backends = []
+        for backend in _parse_backends(routes.get("backends", [])):
+            previous = known.get(backend.address)
+            if previous is not None:
+                previous.name = backend.name
+                previous.readiness_url = backend.readiness_url
+                previous.standby = backend.standby
+                backend = previous
+            backends.append(backend)
+        self.backends = backends
+        return True
+
+    def pick_backend(self, exclude: Iterable[Backend] = ()) -> Backend | None:
+        """Least-connections choice among healthy backends.
+
+        Standby backends are only used while no regular backend is healthy.
+        Falls back to unhealthy ones when nothing healthy is left: a stale
+        probe result is better than refusing every connection. Ties rotate so
+        idle backends share load evenly.
+        """
+        skip = {id(b) for b in exclude}
+        candidates = [b for b in self.backends if id(b) not in skip]
+        healthy = [b for b in candidates if b.healthy and not b.standby]
+        standby = [b for b in candidates if b.healthy and b.standby]
+        pool = healthy or standby or candidates
+        if not pool:
+            return None
+        self._rotation = (self._rotation + 1) % len(pool)
+        rotated = pool[self._rotation :] + pool[: self._rotation]
+        return min(rotated, key=lambda b: b.active)
+
+    async def check_backends(self) -> None:
+        """Probe every backend's readiness URL and update its rotation state."""
+        probed = [b for b in self.backends if b.readiness_url]
+        results = await asyncio.gather(
+            *(
+                asyncio.to_thread(check_http_health, b.readiness_url or "", timeout=1.0)
+                for b in probed
+            )
+        )
+        for backend, result in zip(probed, results, strict=True):
+            backend.healthy = bool(result["ok"])
+        for backend in self.backends:
+            if not backend.readiness_url:
+                # Nothing to probe: give it another chance each interval.
+                backend.healthy = True
+
+    async def _health_loop(self) -> None:
+        while True:
+            self.reload()
+            await self.check_backends()
+            await asyncio.sleep(
+                float(self.routes.get("health_interval", DEFAULT_PROXY_HEALTH_INTERVAL))
+            )
+
+    def _on_readable(self) -> None:
+        listener = self._listener
+        while listener is not None:
+            try:
+                conn, _addr = listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                # EMFILE and friends: leave the rest queued for the next wakeup.
+                return
+            conn.setblocking(False)
+            _set_nodelay(conn)
+            self.active_connections += 1
+            task = asyncio.get_running_loop().create_task(self._serve(conn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _serve(self, conn: socket.socket) -> None:
+        try:
+            try:
+                reader, writer = await asyncio.open_connection(sock=conn)
+            except OSError:
+                conn.close()
+                return
+            await self._forward(reader, writer)
+        finally:
+            self.active_connections -= 1
+            if self.lazy is not None:
+                self.lazy.touch()
+            if self.active_connections == 0 and self._drained is not None:
+                self._drained.set()
+
+    def _backends_started(self) -> None:
+        # Fresh instances: forget health verdicts about the stopped ones.
+        self.reload(force=True)
+        for backend in self.backends:
+            backend.healthy = True
+
+    async def _forward(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            if self.lazy is not None:
+                await self.lazy.ensure_started(self._backends_started)
+            self.reload()
+            tried: list[Backend] = []
+            while (backend := self.pick_backend(exclude=tried)) is not None:
+                try:
+                    up_reader, up_writer = await asyncio.open_connection(
+                        *backend.address
+                    )
+                except OSError:
+                    # Fail over; the health loop puts it back once it recovers.
+                    backend.healthy = False
+                    tried.append(backend)
+                    continue
+                break
+            else:
+                return
+            _set_nodelay(up_writer.get_extra_info("socket"))
+            backend.active += 1
+            try:
+                await asyncio.gather(_pipe(reader, up_writer), _pipe(up_reader, writer))
+            finally:
+                backend.active -= 1
+                up_writer.close()
+        finally:
+            writer.close()
+
+    async def start(
+        self,
+        host: str | None = None,
+        port: int | None = None,
+        *,
+        sock: socket.socket | None = None,
+    ) -> int:
+        """Bind (or adopt ``sock`` as) the listener and return its port."""
+        if sock is None:
+            listen = self.routes.get("listen", {})
+            bind_host = (
+                host if host is not None else str(listen.get("host", "127.0.0.1"))
+            )
+            bind_port = port if port is not None else int(listen.get("port", 0))
+            sock = socket.create_server(
+                (bind_host, bind_port),
+                family=socket.AF_INET6 if ":" in bind_host else socket.AF_INET,
+                backlog=socket.SOMAXCONN,
+                # Fallback overlap when a replacement cannot take over the socket.
+                reuse_port=hasattr(socket, "SO_REUSEPORT"),
+            )
+        sock.setblocking(False)
+        self._listener = sock
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+        return int(sock.getsockname()[1])
+
+    def _stop_accepting(self) -> None:
+        if self._listener is None:
+            return
+        asyncio.get_running_loop().remove_reader(self._listener.fileno())
+        self._listener.close()
+        self._listener = None
+
+    def start_health_checks(self) -> None:
+        """Probe backends every ``health_interval`` seconds until shutdown."""
+        if self._health_task is None:
+            self._health_task = asyncio.get_running_loop().create_task(
+                self._health_loop()
+            )
+
+    def start_idle_stop(self) -> None:
+        """With lazy backends, stop them once the proxy has been idle long enough."""
+        if self.lazy is not None and self._lazy_task is None:
+            self._lazy_task = asyncio.get_running_loop().create_task(
+                self.lazy.run(lambda: self.active_connections)
+            )
+
+    async def shutdown(self, *, drain_timeout: float | None = None) -> None:
+        """Stop accepting, then wait for in-flight connections to finish."""
+        self._stop_accepting()
+        for task in (self._health_task, self._lazy_task):
+            if task is not None:
+                task.cancel()
+        self._health_task = None
+        self._lazy_task = None
+        if drain_timeout is None:
+            drain_timeout = float(
+                self.routes.get("drain_timeout", DEFAULT_PROXY_DRAIN_TIMEOUT)
+            )
+        if self.active_connections:
+            self._drained = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._drained.wait(), timeout=drain_timeout)
+            except TimeoutError:
+                pass
+
+    async def _handoff(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Pass the listening socket to a replacement proxy, then stop accepting.
+
+        The kernel socket (and its accept queue) lives on in the replacement,
+        so no queued connection is reset, unlike closing one of two
+        SO_REUSEPORT listeners.
+        """
+        try:
+            if self._listener is None:
+                return
+            conn = writer.get_extra_info("socket")
+            with socket.socket(fileno=os.dup(conn.fileno())) as raw:
+                socket.send_fds(raw, [b"L"], [self._listener.fileno()])
+            self._stop_accepting()
+        finally:
+            writer.close()
+
+    async def serve(self, *, takeover: int | None = None) -> None:
+        """Run until SIGTERM/SIGINT; SIGHUP forces a routes reload.
+
+        With ``takeover``, the listener is inherited from that proxy pid.
+        """
+        loop = asyncio.get_running_loop()
+        sock = None
+        if takeover is not None:
+            sock = await loop.run_in_executor(
+                None, _receive_listener, proxy_handoff_path(self.routes_path, takeover)
+            )
+        port = await self.start(sock=sock)
+        self.start_health_checks()
+        self.start_idle_stop()
+
+        handoff_path = proxy_handoff_path(self.routes_path, os.getpid())
+        handoff_path.unlink(missing_ok=True)
+        try:
+            handoff = await asyncio.start_unix_server(
+                self._handoff, path=str(handoff_path)
+            )
+        except OSError:
+            # e.g. the path exceeds the AF_UNIX limit; replacements overlap instead.
+            handoff = None
+        state_path = proxy_state_path(self.routes_path, os.getpid())
+        write_routes(state_path, {"pid": os.getpid(), "port": port, "listening": True})
+
+        stop = asyncio.Event()
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+        loop.add_signal_handler(signal.SIGINT, stop.set)
+        loop.add_signal_handler(signal.SIGHUP, lambda: self.reload(force=True))
+        try:
+            await stop.wait()
+            if handoff is not None:
+                handoff.close()
+            await self.shutdown()
+        finally:
+            state_path.unlink(missing_ok=True)
+            handoff_path.unlink(missing_ok=True)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m flowgate.core.proxy")
+    parser.add_argument("--routes", required=True, help="Path to the routes file")
+    parser.add_argument(
+        "--takeover",
+        type=int,
+        default=None,
+        help="Inherit the listening socket from the proxy with this pid",
+    )
+    args = parser.parse_args(argv)
+
+    proxy = FrontProxy(args.routes)
+    if not proxy.routes:
+        print(f"flowgate-proxy: cannot read routes file {args.routes}", file=sys.stderr)
+        return 2
+    lazy = proxy.routes.get("lazy")
+    if isinstance(lazy, dict):
+        # Deferred: only lazy mode needs the supervisor and config loader.
+        from flowgate.core.lazystart import LazyBackends
+
+        proxy.lazy = LazyBackends.from_routes(lazy)
+    asyncio.run(proxy.serve(takeover=args.takeover))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
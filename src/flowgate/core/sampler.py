@@ -0,0 +1,188 @@
+"""Per-service resource sampler backed by ``/proc``.
+
+Every ``interval`` seconds the sampler reads ``/proc/<pid>/stat``,
+``/proc/<pid>/status`` and ``/proc/<pid>/fd`` for each supervised pid and
+appends one compact ``resource_sample`` record per service to the events log:
+
+    {"event": "resource_sample", "service": "cliproxyapi_plus", "pid": 4242,
+     "cpu_pct": 3.1, "rss_kb": 51234, "threads": 12, "fds": 37, "timestamp": ...}
+
+CPU usage is the delta of ``utime + stime`` between two samples of the same
+pid, so the first sample after a (re)start reports ``cpu_pct: null``. The
+latest sample per service is also kept in ``resources.json`` for ``status``.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from flowgate.core.observability import log_metric_records
+from flowgate.core.process import ProcessSupervisor
+
+RESOURCES_STATE_FILE = "resources.json"
+_CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+
+
+@dataclass(frozen=True)
+class ProcSample:
+    """Raw counters for one pid at one instant."""
+
+    pid: int
+    cpu_ticks: int
+    rss_kb: int | None
+    threads: int | None
+    fds: int | None
+    taken_at: float
+
+
+def read_proc_sample(
+    pid: int,
+    *,
+    proc_root: str | Path = "/proc",
+    clock: Callable[[], float] = time.monotonic,
+) -> ProcSample | None:
+    """Read CPU ticks, RSS, thread and fd counts for ``pid``; None if it is gone."""
+    base = Path(proc_root) / str(pid)
+    try:
+        stat = (base / "stat").read_text(encoding="utf-8")
+        status = (base / "status").read_text(encoding="utf-8")
+    except OSError:
+        return None
+
+    # comm (field 2) may contain spaces and parens; fields resume after the last ')'.
+    fields = stat[stat.rfind(")") + 2 :].split()
+    try:
+        cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+    except (IndexError, ValueError):
+        return None
+
+    rss_kb: int | None = None
+    threads: int | None = None
+    for line in status.splitlines():
+        key, _, value = line.partition(":")
+        if key == "VmRSS":
+            rss_kb = int(value.split()[0])
+        elif key == "Threads":
+            threads = int(value.strip())
+
+    try:
+        fds: int | None = sum(1 for _ in os.scandir(base / "fd"))
+    except OSError:
+        # Another user's process: counters are readable, the fd table is not.
+        fds = None
+
+    return ProcSample(
+        pid=pid,
+        cpu_ticks=cpu_ticks,
+        rss_kb=rss_kb,
+        threads=threads,
+        fds=fds,
+        taken_at=clock(),
+    )
+
+
+def cpu_percent(previous: ProcSample | None, current: ProcSample) -> float | None:
+    """CPU usage between two samples of the same pid (100.0 = one full core)."""
+    if previous is None or previous.pid != current.pid:
+        return None
+    elapsed = current.taken_at - previous.taken_at
+    if elapsed <= 0:
+        return None
+    used = (current.cpu_ticks - previous.cpu_ticks) / _CLK_TCK
+    return round(max(used, 0.0) / elapsed * 100.0, 2)
+
+
+def read_resource_state(runtime_dir: str | Path) -> dict[str, Any]:
+    """Latest persisted sample per service; empty when no sampler has run."""
+    try:
+        data = json.loads((Path(runtime_dir) / RESOURCES_STATE_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class ResourceSampler:
+    """Sample every configured service's pid at a fixed interval."""
+
+    def __init__(
+        self,
+        source: Callable[[], tuple[dict[str, Any], ProcessSupervisor]],
+        *,
+        interval: float = 10.0,
+        proc_root: str | Path = "/proc",
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._source = source
+        self.interval = interval
+        self._proc_root = proc_root
+        self._clock = clock
+        self._previous: dict[str, ProcSample] = {}
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Sample until :meth:`stop` is called."""
+        while not self._stop.is_set():
+            started = self._clock()
+            self.tick()
+            self._stop.wait(max(self.interval - (self._clock() - started), 0.0))
+
+    def tick(self) -> list[dict[str, Any]]:
+        """Take one sample of every running service and emit the records."""
+        config, supervisor = self._source()
+        timestamp = datetime.now(timezone.utc).isoformat()
+        records: list[dict[str, Any]] = []
+        for name in config["services"]:
+            # A stale pid file may name a pid now reused by another process.
+            pid = supervisor.read_pid(name) if supervisor.is_running(name) else None
+            if pid is None:
+                self._previous.pop(name, None)
+                continue
+            sample = read_proc_sample(pid, proc_root=self._proc_root, clock=self._clock)
+            if sample is None:
+                self._previous.pop(name, None)
+                continue
+            records.append(
+                {
+                    "event": "resource_sample",
+                    "service": name,
+                    "pid": pid,
+                    "cpu_pct": cpu_percent(self._previous.get(name), sample),
+                    "rss_kb": sample.rss_kb,
+                    "threads": sample.threads,
+                    "fds": sample.fds,
+                    "timestamp": timestamp,
+                }
+            )
+            self._previous[name] = sample
+
+        if records:
+            log_metric_records(records, path=supervisor.events_log)
+        self._persist(supervisor, records)
+        return records
+
+    @staticmethod
+    def _persist(supervisor: ProcessSupervisor, records: list[dict[str, Any]]) -> None:
+        payload = {
+            r["service"]: {k: v for k, v in r.items() if k not in ("event", "service")}
+            for r in records
+        }
+        target = supervisor.runtime_dir / RESOURCES_STATE_FILE
+        try:
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, sort_keys=True)
+            os.replace(tmp, target)
+        except OSError:
+            return
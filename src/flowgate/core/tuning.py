@@ -0,0 +1,292 @@
+"""CPU placement, scheduling priority and resource limits for services.
+
+With ``process_controls`` configured, ``ProcessSupervisor.start`` launches the
+service through a tiny exec wrapper instead of running it directly:
+
+    python -m flowgate.core.tuning --cpus 0,1 --nice 5 ... -- <command>
+
+The wrapper applies the settings to itself and then ``exec``s the command, so
+the service keeps the wrapper's pid and every thread it ever creates inherits
+the CPU mask, nice value and I/O priority (applying them from the parent after
+spawning would only reach the main thread). Settings are:
+
+- ``cpus``: CPU affinity (``sched_setaffinity``)
+- ``nice``: scheduling priority (``setpriority``)
+- ``io_priority``: I/O scheduling class and level (``ioprio_set``)
+- ``max_open_files`` / ``max_address_space``: ``RLIMIT_NOFILE`` / ``RLIMIT_AS``
+
+The applied settings are stored in the pid record and :func:`verify_controls`
+compares them with what the kernel reports for the live pid, so ``status`` can
+flag drift (e.g. someone ran ``renice`` or ``taskset`` on the service).
+"""
+
+from __future__ import annotations
+
+import argparse
+import ctypes
+import os
+import platform
+import resource
+import sys
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+IO_CLASSES = {"realtime": 1, "best-effort": 2, "idle": 3}
+DEFAULT_IO_LEVEL = 4  # the kernel's default best-effort level
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+# (ioprio_set, ioprio_get) syscall numbers; absent architectures skip I/O priority.
+_IOPRIO_SYSCALLS = {
+    "x86_64": (251, 252),
+    "aarch64": (30, 31),
+    "riscv64": (30, 31),
+    "i386": (289, 290),
+    "i686": (289, 290),
+    "armv7l": (314, 315),
+    "ppc64le": (273, 274),
+    "s390x": (282, 283),
+}
+_RLIMITS = {
+    "max_open_files": resource.RLIMIT_NOFILE,
+    "max_address_space": resource.RLIMIT_AS,
+}
+
+
+def _ioprio_syscall(index: int, *args: int) -> int:
+    numbers = _IOPRIO_SYSCALLS.get(platform.machine())
+    if numbers is None or not sys.platform.startswith("linux"):
+        raise OSError(f"ioprio is not supported on {platform.machine()}")
+    libc = ctypes.CDLL(None, use_errno=True)
+    result = libc.syscall(numbers[index], *args)
+    if result < 0:
+        errno = ctypes.get_errno()
+        raise OSError(errno, os.strerror(errno))
+    return int(result)
+
+
+def split_cpus(cpus: Sequence[int], parts: int) -> list[list[int]]:
+    """Split ``cpus`` into ``parts`` disjoint, contiguous core sets.
+
+    With fewer CPUs than parts, sets wrap around and cores are shared.
+    """
+    ordered = sorted(set(cpus))
+    if len(ordered) < parts:
+        return [[ordered[i % len(ordered)]] for i in range(parts)]
+    size, extra = divmod(len(ordered), parts)
+    chunks: list[list[int]] = []
+    start = 0
+    for index in range(parts):
+        end = start + size + (1 if index < extra else 0)
+        chunks.append(ordered[start:end])
+        start = end
+    return chunks
+
+
+@dataclass(frozen=True)
+class ProcessControls:
+    """Scheduling and resource settings applied to a service at spawn time."""
+
+    cpus: tuple[int, ...] | None = None
+    nice: int | None = None
+    io_class: str | None = None
+    io_level: int | None = None
+    max_open_files: int | None = None
+    max_address_space: int | None = None
+
+    @classmethod
+    def from_config(cls, section: dict[str, Any]) -> ProcessControls:
+        """Build controls from a validated ``process_controls`` config section."""
+        cpus = section.get("cpus")
+        io_priority = section.get("io_priority") or {}
+        return cls(
+            cpus=tuple(sorted(cpus)) if isinstance(cpus, list) else None,
+            nice=section.get("nice"),
+            io_class=io_priority.get("class"),
+            io_level=(
+                io_priority.get("level", DEFAULT_IO_LEVEL) if io_priority else None
+            ),
+            max_open_files=section.get("max_open_files"),
+            max_address_space=section.get("max_address_space"),
+        )
+
+    def to_record(self) -> dict[str, Any]:
+        """The configured settings, as stored in the pid record."""
+        record: dict[str, Any] = {}
+        if self.cpus is not None:
+            record["cpus"] = list(self.cpus)
+        if self.nice is not None:
+            record["nice"] = self.nice
+        if self.io_class is not None:
+            record["io_class"] = self.io_class
+            record["io_level"] = self.io_level
+        for key in _RLIMITS:
+            if getattr(self, key) is not None:
+                record[key] = getattr(self, key)
+        return record
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> ProcessControls:
+        cpus = record.get("cpus")
+        return cls(
+            cpus=tuple(cpus) if isinstance(cpus, list) else None,
+            nice=record.get("nice"),
+            io_class=record.get("io_class"),
+            io_level=record.get("io_level"),
+            max_open_files=record.get("max_open_files"),
+            max_address_space=record.get("max_address_space"),
+        )
+
+    def to_args(self) -> list[str]:
+        """Command-line flags for the exec wrapper."""
+        args: list[str] = []
+        if self.cpus is not None:
+            args += ["--cpus", ",".join(str(cpu) for cpu in self.cpus)]
+        if self.nice is not None:
+            args += ["--nice", str(self.nice)]
+        if self.io_class is not None:
+            args += ["--io-class", self.io_class]
+            if self.io_level is not None:
+                args += ["--io-level", str(self.io_level)]
+        if self.max_open_files is not None:
+            args += ["--max-open-files", str(self.max_open_files)]
+        if self.max_address_space is not None:
+            args += ["--max-address-space", str(self.max_address_space)]
+        return args
+
+    def wrap(self, command: list[str]) -> list[str]:
+        """``command`` prefixed with the exec wrapper that applies these controls."""
+        return [
+            sys.executable,
+            "-m",
+            "flowgate.core.tuning",
+            *self.to_args(),
+            "--",
+            *command,
+        ]
+
+    def problems(self) -> list[str]:
+        """Settings the current process cannot grant a child (checked before spawn)."""
+        found: list[str] = []
+        privileged = os.geteuid() == 0
+        if self.cpus is not None and hasattr(os, "sched_getaffinity"):
+            missing = sorted(set(self.cpus) - os.sched_getaffinity(0))
+            if missing:
+                found.append(f"cpus {missing} are not available to flowgate")
+        if self.nice is not None and not privileged:
+            current = os.getpriority(os.PRIO_PROCESS, 0)
+            if self.nice < current:
+                found.append(f"nice {self.nice} is below the current {current}")
+        if self.io_class == "realtime" and not privileged:
+            found.append("io_priority class realtime requires root")
+        for key, limit in _RLIMITS.items():
+            value = getattr(self, key)
+            hard = resource.getrlimit(limit)[1]
+            if (
+                value is not None
+                and not privileged
+                and hard != resource.RLIM_INFINITY
+                and value > hard
+            ):
+                found.append(f"{key} {value} exceeds the hard limit {hard}")
+        return found
+
+    def apply(self) -> None:
+        """Apply the settings to the calling process (run by the exec wrapper)."""
+        for key, limit in _RLIMITS.items():
+            value = getattr(self, key)
+            if value is not None:
+                hard = resource.getrlimit(limit)[1]
+                if hard != resource.RLIM_INFINITY and value > hard:
+                    hard = value
+                resource.setrlimit(limit, (value, hard))
+        if self.cpus is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, self.cpus)
+        if self.nice is not None:
+            os.setpriority(os.PRIO_PROCESS, 0, self.nice)
+        if self.io_class is not None:
+            value = (IO_CLASSES[self.io_class] << _IOPRIO_CLASS_SHIFT) | (
+                self.io_level or 0
+            )
+            _ioprio_syscall(0, _IOPRIO_WHO_PROCESS, 0, value)
+
+
+def verify_controls(pid: int, record: dict[str, Any]) -> list[str]:
+    """Names of recorded settings that no longer match the live process.
+
+    Settings the kernel does not let us read back are assumed to hold.
+    """
+    expected = ProcessControls.from_record(record)
+    drift: list[str] = []
+    if expected.cpus is not None and hasattr(os, "sched_getaffinity"):
+        try:
+            if sorted(os.sched_getaffinity(pid)) != list(expected.cpus):
+                drift.append("cpus")
+        except OSError:
+            pass
+    if expected.nice is not None:
+        try:
+            if os.getpriority(os.PRIO_PROCESS, pid) != expected.nice:
+                drift.append("nice")
+        except OSError:
+            pass
+    if expected.io_class is not None:
+        try:
+            value = _ioprio_syscall(1, _IOPRIO_WHO_PROCESS, pid)
+        except OSError:
+            pass
+        else:
+            want = (IO_CLASSES[expected.io_class], expected.io_level or 0)
+            if (value >> _IOPRIO_CLASS_SHIFT, value & 0xFF) != want:
+                drift.append("io_priority")
+    prlimit = getattr(resource, "prlimit", None)  # Linux only
+    for key, limit in _RLIMITS.items():
+        value = getattr(expected, key)
+        if value is None or prlimit is None:
+            continue
+        try:
+            if prlimit(pid, limit)[0] != value:
+                drift.append(key)
+        except OSError:
+            pass
+    return drift
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m flowgate.core.tuning")
+    parser.add_argument("--cpus", default=None, help="Comma-separated CPU ids")
+    parser.add_argument("--nice", type=int, default=None)
+    parser.add_argument("--io-class", choices=sorted(IO_CLASSES), default=None)
+    parser.add_argument("--io-level", type=int, default=None)
+    parser.add_argument("--max-open-files", type=int, default=None)
+    parser.add_argument("--max-address-space", type=int, default=None)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    command = args.command[1:] if args.command[:1] == ["--"] else args.command
+    if not command:
+        parser.error("a command to run is required after --")
+
+    controls = ProcessControls(
+        cpus=(tuple(int(cpu) for cpu in args.cpus.split(",")) if args.cpus else None),
+        nice=args.nice,
+        io_class=args.io_class,
+        io_level=args.io_level,
+        max_open_files=args.max_open_files,
+        max_address_space=args.max_address_space,
+    )
+    try:
+        controls.apply()
+    except OSError as exc:
+        # Goes to the service log; the supervisor sees the process exit.
+        print(f"flowgate: cannot apply process controls: {exc}", file=sys.stderr)
+        return 126
+    try:
+        os.execvp(command[0], command)
+    except OSError as exc:
+        print(f"flowgate: cannot exec {command[0]}: {exc}", file=sys.stderr)
+        return 127
+    return 0  # pragma: no cover - execvp does not return
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,162 @@
+"""Warm-up requests that prime a freshly started CLIProxyAPIPlus instance.
+
+The first requests a new instance serves are slow: upstream connections, TLS
+sessions and provider tokens are all set up lazily. With
+``cliproxyapi_plus.warmup`` configured, FlowGate fires a few cheap requests at
+the instance after it passes readiness and before it is considered ready
+(``service start/restart --wait``, the standby of a blue/green restart, and
+lazy starts by the front proxy).
+
+Requests are sent in ``rounds``; every round sends the whole set, at most
+``concurrency`` at a time, and starts once the previous one finished. The
+median latency of the first round is the cold latency and that of the last
+round the steady-state latency, so the effect of warming is visible in the
+``service_warmup`` event.
+"""
+
+from __future__ import annotations
+
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, TypedDict
+from urllib.error import HTTPError, URLError
+from urllib.request import Request, urlopen
+
+from flowgate.core.config import ConfigError, parse_yaml_like
+
+DEFAULT_WARMUP_CONCURRENCY = 4
+DEFAULT_WARMUP_TIMEOUT = 10.0
+DEFAULT_WARMUP_ROUNDS = 2
+
+
+class WarmupResult(TypedDict):
+    """Outcome of one warm-up run."""
+
+    ok: bool
+    requests: int
+    failures: int
+    duration_ms: float
+    first_latency_ms: float | None
+    steady_latency_ms: float | None
+
+
+@dataclass(frozen=True)
+class WarmupRequest:
+    path: str
+    method: str = "GET"
+    body: Any = None
+    headers: tuple[tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_config(cls, entry: str | dict[str, Any]) -> WarmupRequest:
+        if isinstance(entry, str):
+            return cls(path=entry)
+        body = entry.get("body")
+        return cls(
+            path=entry["path"],
+            method=str(entry.get("method", "POST" if body is not None else "GET")),
+            body=body,
+            headers=tuple(sorted(entry.get("headers", {}).items())),
+        )
+
+
+@dataclass(frozen=True)
+class WarmupPlan:
+    """Validated ``warmup`` section of a service."""
+
+    requests: tuple[WarmupRequest, ...]
+    concurrency: int = DEFAULT_WARMUP_CONCURRENCY
+    timeout: float = DEFAULT_WARMUP_TIMEOUT
+    rounds: int = DEFAULT_WARMUP_ROUNDS
+    api_keys_from: str | None = None
+
+    @classmethod
+    def from_config(cls, section: dict[str, Any]) -> WarmupPlan:
+        return cls(
+            requests=tuple(
+                WarmupRequest.from_config(entry) for entry in section["requests"]
+            ),
+            concurrency=int(section.get("concurrency", DEFAULT_WARMUP_CONCURRENCY)),
+            timeout=float(section.get("timeout", DEFAULT_WARMUP_TIMEOUT)),
+            rounds=int(section.get("rounds", DEFAULT_WARMUP_ROUNDS)),
+            api_keys_from=section.get("api_keys_from"),
+        )
+
+    def api_key(self) -> str | None:
+        """First client API key from the CLIProxyAPIPlus config, if any."""
+        if self.api_keys_from is None:
+            return None
+        try:
+            keys = parse_yaml_like(Path(self.api_keys_from)).get("api-keys")
+        except (ConfigError, OSError):
+            return None  # warm up unauthenticated
+        if isinstance(keys, list) and keys and isinstance(keys[0], str):
+            return keys[0]
+        return None
+
+
+def _send(
+    base_url: str, request: WarmupRequest, *, timeout: float, api_key: str | None
+) -> tuple[bool, float]:
+    headers = dict(request.headers)
+    if api_key is not None:
+        headers.setdefault("Authorization", f"Bearer {api_key}")
+    data = None
+    if request.body is not None:
+        data = json.dumps(request.body).encode("utf-8")
+        headers.setdefault("Content-Type", "application/json")
+    http_request = Request(
+        base_url + request.path, data=data, headers=headers, method=request.method
+    )
+    started = time.perf_counter()
+    try:
+        with urlopen(http_request, timeout=timeout) as response:  # nosec B310
+            response.read()
+            ok = 200 <= response.status < 300
+    except (HTTPError, TimeoutError, URLError, OSError):
+        ok = False
+    return ok, (time.perf_counter() - started) * 1000
+
+
+def _median(latencies: list[float]) -> float | None:
+    return round(statistics.median(latencies), 2) if latencies else None
+
+
+def run_warmup(base_url: str, plan: WarmupPlan) -> WarmupResult:
+    """Send the plan's requests to ``base_url`` (e.g. ``http://127.0.0.1:8317``).
+
+    Failed requests are counted, not raised: a provider that is down must not
+    keep the instance from becoming ready.
+    """
+    api_key = plan.api_key()
+    started = time.perf_counter()
+    sent = failures = 0
+    per_round: list[list[float]] = []
+    with ThreadPoolExecutor(
+        max_workers=max(1, min(plan.concurrency, len(plan.requests))),
+        thread_name_prefix="flowgate-warmup",
+    ) as pool:
+        for _ in range(plan.rounds):
+            outcomes = list(
+                pool.map(
+                    lambda request: _send(
+                        base_url, request, timeout=plan.timeout, api_key=api_key
+                    ),
+                    plan.requests,
+                )
+            )
+            sent += len(outcomes)
+            failures += sum(1 for ok, _ in outcomes if not ok)
+            per_round.append([latency for _, latency in outcomes])
+    return {
+        "ok": failures == 0,
+        "requests": sent,
+        "failures": failures,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+        "first_latency_ms": _median(per_round[0]) if per_round else None,
+        "steady_latency_ms": (_median(per_round[-1]) if len(per_round) > 1 else None),
+    }
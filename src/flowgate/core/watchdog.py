@@ -0,0 +1,376 @@
+"""Crash-loop watchdog for supervised services.
+
+The watchdog adopts every configured service it sees running and waits on a
+pidfd per process (falling back to liveness polling), so an unexpected exit is
+noticed immediately. Crashed services are restarted after an exponential,
+jittered backoff; too many failures inside ``crash_loop_window`` put the
+service into a ``crash-loop`` state where it is left alone until someone
+starts it again.
+
+A backend with a hot spare (``front_proxy.hot_spare``) is failed over to the
+spare without any backoff; the spare is replaced, readied and warmed up in the
+background. The watchdog also respawns spares that die on their own.
+
+A service whose pid file disappears (``service stop``) or now points at a
+different live process (blue/green restart) is treated as an intentional
+change, not a crash.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import select
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from flowgate.core.lifecycle import (
+    ensure_spare,
+    failover,
+    has_hot_spare,
+    spare_name,
+    start_service,
+)
+from flowgate.core.process import ProcessSupervisor, ServiceBusyError
+
+WATCHDOG_STATE_FILE = "watchdog.json"
+
+
+@dataclass(frozen=True)
+class WatchdogPolicy:
+    """Restart/backoff tuning; defaults suit a single long-lived service."""
+
+    initial_backoff: float = 1.0
+    max_backoff: float = 60.0
+    multiplier: float = 2.0
+    jitter: float = 0.2
+    crash_loop_threshold: int = 5
+    crash_loop_window: float = 300.0
+    poll_interval: float = 1.0
+
+    def backoff(
+        self, attempt: int, *, rng: Callable[[], float] = random.random
+    ) -> float:
+        """Delay before restart ``attempt`` (1-based), with +/- ``jitter`` spread."""
+        base = min(
+            self.max_backoff, self.initial_backoff * self.multiplier ** (attempt - 1)
+        )
+        return base * (1.0 + self.jitter * (2.0 * rng() - 1.0))
+
+
+@dataclass
+class _ServiceWatch:
+    state: str = "unwatched"
+    pid: int | None = None
+    pidfd: int | None = None
+    failures: list[float] = field(default_factory=list)
+    restart_at: float | None = None
+    # time.perf_counter() when the last crash was noticed (failover metric).
+    exited_at: float | None = None
+
+
+def read_watchdog_state(runtime_dir: str | Path) -> dict[str, Any]:
+    """Persisted per-service watchdog state; empty when no watchdog has run."""
+    try:
+        data = json.loads((Path(runtime_dir) / WATCHDOG_STATE_FILE).read_text("utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+class Watchdog:
+    """Restart crashed services with backoff; see the module docstring."""
+
+    def __init__(
+        self,
+        source: Callable[[], tuple[dict[str, Any], ProcessSupervisor]],
+        *,
+        policy: WatchdogPolicy | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self._source = source
+        self.policy = policy or WatchdogPolicy()
+        self._clock = clock
+        self._watches: dict[str, _ServiceWatch] = {}
+        self._stop = threading.Event()
+        # Hot spares: background preparation threads, the pid last seen ready
+        # and when to retry after a spare failed to become ready.
+        self._spare_threads: dict[str, threading.Thread] = {}
+        self._ready_spares: dict[str, int] = {}
+        self._spare_retry_at: dict[str, float] = {}
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def run(self) -> None:
+        """Loop until :meth:`stop` is called."""
+        try:
+            while not self._stop.is_set():
+                self.tick()
+        finally:
+            for watch in self._watches.values():
+                self._unwatch(watch)
+
+    def tick(self) -> None:
+        """Adopt running services, wait for exits, and run due restarts."""
+        config, supervisor = self._source()
+        names = list(config["services"].keys())
+        for name in names:
+            watch = self._watches.setdefault(name, _ServiceWatch())
+            if watch.pid is None and watch.restart_at is None:
+                self._adopt(supervisor, name, watch)
+
+        now = self._clock()
+        timeout = self.policy.poll_interval
+        for name in names:
+            watch = self._watches[name]
+            if watch.restart_at is not None:
+                timeout = min(timeout, max(watch.restart_at - now, 0.0))
+
+        for name in self._wait_for_exits(supervisor, names, timeout):
+            self._on_exit(supervisor, name, self._watches[name])
+
+        now = self._clock()
+        for name in names:
+            watch = self._watches[name]
+            if watch.restart_at is not None and now >= watch.restart_at:
+                self._restart(config, supervisor, name, watch)
+            if watch.state == "running" and has_hot_spare(config["services"][name]):
+                self._maintain_spare(config, supervisor, name)
+
+    def _maintain_spare(
+        self, config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+    ) -> None:
+        """Ready a hot spare in the background unless one is ready already."""
+        thread = self._spare_threads.get(name)
+        if thread is not None and thread.is_alive():
+            return
+        if self._clock() < self._spare_retry_at.get(name, 0.0):
+            return
+        spare = spare_name(name)
+        if supervisor.is_running(spare) and supervisor.read_pid(
+            spare
+        ) == self._ready_spares.get(name):
+            return
+        thread = threading.Thread(
+            target=self._prepare_spare,
+            args=(config, supervisor, name),
+            name=f"flowgate-spare-{name}",
+            daemon=True,
+        )
+        self._spare_threads[name] = thread
+        thread.start()
+
+    def _prepare_spare(
+        self, config: dict[str, Any], supervisor: ProcessSupervisor, name: str
+    ) -> None:
+        try:
+            pid = ensure_spare(config, supervisor, name)
+        except Exception as exc:  # noqa: BLE001
+            supervisor.record_event(
+                "hot_spare_ready",
+                service=name,
+                result="failed",
+                detail=f"{type(exc).__name__}: {exc}",
+            )
+            pid = None
+        if pid is None:
+            self._spare_retry_at[name] = self._clock() + self.policy.max_backoff
+        else:
+            self._ready_spares[name] = pid
+
+    def _adopt(
+        self, supervisor: ProcessSupervisor, name: str, watch: _ServiceWatch
+    ) -> None:
+        pid = supervisor.read_pid(name)
+        if pid is None or not supervisor.is_running(name):
+            return
+        if watch.state == "crash-loop":
+            # Someone started it by hand; give it a clean slate.
+            watch.failures.clear()
+        self._watch_pid(supervisor, name, watch, pid)
+
+    def _watch_pid(
+        self, supervisor: ProcessSupervisor, name: str, watch: _ServiceWatch, pid: int
+    ) -> None:
+        watch.pid = pid
+        try:
+            watch.pidfd = supervisor.open_pidfd(pid)
+        except ProcessLookupError:
+            # Died before we could watch it.
+            self._on_exit(supervisor, name, watch)
+            return
+        if watch.state != "running":
+            watch.state = "running"
+            supervisor.record_event(
+                "watchdog_watch", service=name, result="success", detail=f"pid={pid}"
+            )
+            self._persist(supervisor)
+
+    def _unwatch(self, watch: _ServiceWatch) -> None:
+        if watch.pidfd is not None:
+            os.close(watch.pidfd)
+        watch.pid = None
+        watch.pidfd = None
+
+    def _wait_for_exits(
+        self, supervisor: ProcessSupervisor, names: list[str], timeout: float
+    ) -> list[str]:
+        watched = [n for n in names if self._watches[n].pid is not None]
+        with_fd = {
+            self._watches[n].pidfd: n
+            for n in watched
+            if self._watches[n].pidfd is not None
+        }
+        if with_fd and len(with_fd) == len(watched):
+            poller = select.poll()
+            for fd in with_fd:
+                poller.register(fd, select.POLLIN)
+            ready = poller.poll(max(int(timeout * 1000), 0))
+            return [with_fd[fd] for fd, _event in ready]
+
+        # No pidfd for at least one process: poll liveness instead.
+        self._stop.wait(timeout)
+        exited = []
+        for name in watched:
+            pid = self._watches[name].pid
+            assert pid is not None
+            supervisor.reap(name, pid)
+            if not supervisor.pid_alive(pid):
+                exited.append(name)
+        return exited
+
+    def _on_exit(
+        self, supervisor: ProcessSupervisor, name: str, watch: _ServiceWatch
+    ) -> None:
+        pid = watch.pid
+        assert pid is not None
+        returncode = supervisor.reap(name, pid)
+        self._unwatch(watch)
+        if self._intentional(supervisor, name, pid):
+            watch.state = "unwatched"
+            self._persist(supervisor)
+            return
+
+        watch.exited_at = time.perf_counter()
+        now = self._clock()
+        window_start = now - self.policy.crash_loop_window
+        watch.failures = [t for t in watch.failures if t >= window_start] + [now]
+        supervisor.record_event(
+            "watchdog_exit",
+            service=name,
+            result="crashed",
+            detail=f"pid={pid} returncode={returncode}",
+        )
+
+        if len(watch.failures) >= self.policy.crash_loop_threshold:
+            watch.state = "crash-loop"
+            watch.restart_at = None
+            supervisor.record_event(
+                "watchdog_crash_loop",
+                service=name,
+                result="failed",
+                detail=f"failures={len(watch.failures)}",
+                extra={"window_s": self.policy.crash_loop_window},
+            )
+        else:
+            attempt = len(watch.failures)
+            # A hot spare takes over right away; only cold starts back off.
+            delay = (
+                0.0
+                if supervisor.is_running(spare_name(name))
+                else self.policy.backoff(attempt)
+            )
+            watch.state = "backoff"
+            watch.restart_at = now + delay
+            supervisor.record_event(
+                "watchdog_backoff",
+                service=name,
+                result="scheduled",
+                detail=f"attempt={attempt}",
+                extra={"delay_ms": round(delay * 1000, 2)},
+            )
+        self._persist(supervisor)
+
+    @staticmethod
+    def _intentional(supervisor: ProcessSupervisor, name: str, pid: int) -> bool:
+        """True when the exit was a stop or a replacement, not a crash.
+
+        ``service stop`` and restarts hold the service lock until the pid file
+        reflects the outcome, so it is only read once the lock is free.
+        """
+        try:
+            with supervisor.locked(name):
+                current = supervisor.read_pid(name)
+                if current is None:
+                    return True
+                return current != pid and supervisor.is_running(name)
+        except ServiceBusyError:
+            # Still held after lock_timeout: the operation holding it owns the
+            # outcome. A running service is adopted again on a later tick.
+            return True
+
+    def _restart(
+        self,
+        config: dict[str, Any],
+        supervisor: ProcessSupervisor,
+        name: str,
+        watch: _ServiceWatch,
+    ) -> None:
+        watch.restart_at = None
+        dead_pid = supervisor.read_pid(name)
+        if dead_pid is None:
+            # Stopped on purpose while we were backing off.
+            watch.state = "unwatched"
+            self._persist(supervisor)
+            return
+        attempt = len(watch.failures)
+        try:
+            pid = failover(config, supervisor, name, detected_at=watch.exited_at)
+            if pid is None:
+                pid = start_service(config, supervisor, name)
+        except Exception as exc:  # noqa: BLE001
+            supervisor.record_event(
+                "watchdog_restart",
+                service=name,
+                result="failed",
+                detail=f"{type(exc).__name__}: {exc}",
+                extra={"attempt": attempt},
+            )
+            # A failed spawn counts as another crash.
+            watch.pid = dead_pid
+            self._on_exit(supervisor, name, watch)
+            return
+        supervisor.record_event(
+            "watchdog_restart",
+            service=name,
+            result="success",
+            detail=f"pid={pid}",
+            extra={"attempt": attempt},
+        )
+        self._watch_pid(supervisor, name, watch, pid)
+
+    def _persist(self, supervisor: ProcessSupervisor) -> None:
+        payload = {
+            name: {
+                "state": watch.state,
+                "pid": watch.pid,
+                "recent_failures": len(watch.failures),
+            }
+            for name, watch in self._watches.items()
+        }
+        target = supervisor.runtime_dir / WATCHDOG_STATE_FILE
+        try:
+            fd, tmp = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(payload, handle, sort_keys=True)
+            os.replace(tmp, target)
+        except OSError:
+            # Observability must never block the restart path.
+            return
@@ -0,0 +1,193 @@
+"""Integration tests: blue/green restart behind the FlowGate front proxy.
+
+A fake CLIProxyAPIPlus (a tiny Python HTTP server that reads ``-config``) runs
+behind a real ``flowgate.core.proxy`` process while a client keeps sending
+requests to the public port.
+
+Run with:
+    pytest tests/integration/test_blue_green_restart.py -v -m integration
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+from urllib.request import urlopen
+
+import pytest
+
+import flowgate
+from flowgate.core.config import load_router_config
+from flowgate.core.health import wait_for_readiness
+from flowgate.core.lifecycle import restart_service, start_service
+from flowgate.core.process import ProcessError, ProcessSupervisor
+
+from tests.integration.base import IntegrationTestBase
+
+_FAKE_CLIPROXY = """
+import json, sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+cfg = json.load(open(sys.argv[sys.argv.index("-config") + 1]))
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = json.dumps({"port": cfg["port"]}).encode()
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+ThreadingHTTPServer((cfg["host"], cfg["port"]), Handler).serve_forever()
+"""
+
+
+def _free_ports(count: int) -> list[int]:
+    sockets = [socket.socket() for _ in range(count)]
+    try:
+        for sock in sockets:
+            sock.bind(("127.0.0.1", 0))
+        return [sock.getsockname()[1] for sock in sockets]
+    finally:
+        for sock in sockets:
+            sock.close()
+
+
+@pytest.mark.integration
+class TestBlueGreenRestart(IntegrationTestBase):
+    def _config(self) -> dict:
+        public, blue, green = _free_ports(3)
+        cfg_dir = self.root / "config"
+        cfg_dir.mkdir()
+        (cfg_dir / "cliproxyapi.yaml").write_text(
+            json.dumps({"host": "127.0.0.1", "port": public}), encoding="utf-8"
+        )
+        (cfg_dir / "flowgate.yaml").write_text(
+            json.dumps(
+                {
+                    "config_version": 3,
+                    "paths": {
+                        "runtime_dir": str(self.root / "runtime"),
+                        "log_file": str(self.root / "runtime" / "events.log"),
+                    },
+                    "cliproxyapi_plus": {
+                        "config_file": "cliproxyapi.yaml",
+                        "front_proxy": {
+                            "enabled": True,
+                            "backend_ports": [blue, green],
+                            "drain_seconds": 0.2,
+                        },
+                    },
+                }
+            ),
+            encoding="utf-8",
+        )
+        config = load_router_config(cfg_dir / "flowgate.yaml")
+        fake = self.root / "fake_cliproxy.py"
+        fake.write_text(_FAKE_CLIPROXY, encoding="utf-8")
+        backend = config["services"]["cliproxyapi_plus"]
+        backend["command"]["args"] = [sys.executable, str(fake)] + backend["command"][
+            "args"
+        ][1:]
+        return config
+
+    def test_restart_under_load_drops_no_requests(self) -> None:
+        config = self._config()
+        supervisor = ProcessSupervisor(
+            config["paths"]["runtime_dir"], events_log=config["paths"]["log_file"]
+        )
+        src_dir = str(Path(flowgate.__file__).resolve().parents[1])
+        public = config["services"]["flowgate_proxy"]["port"]
+        url = f"http://127.0.0.1:{public}/v1/models"
+
+        with mock.patch.dict(os.environ, {"PYTHONPATH": src_dir}):
+            try:
+                start_service(config, supervisor, "cliproxyapi_plus")
+                start_service(config, supervisor, "flowgate_proxy")
+                self.assertTrue(wait_for_readiness(url, timeout=10.0)["ok"])
+
+                stop = threading.Event()
+                ok: list[int] = []
+                failures: list[str] = []
+
+                def client() -> None:
+                    while not stop.is_set():
+                        try:
+                            with urlopen(url, timeout=5.0) as resp:
+                                ok.append(json.loads(resp.read())["port"])
+                        except Exception as exc:  # noqa: BLE001
+                            failures.append(repr(exc))
+
+                thread = threading.Thread(target=client)
+                thread.start()
+                try:
+                    restart_service(config, supervisor, "cliproxyapi_plus")
+                    restart_service(config, supervisor, "flowgate_proxy")
+                    restart_service(config, supervisor, "cliproxyapi_plus")
+                finally:
+                    stop.set()
+                    thread.join(timeout=10)
+            finally:
+                supervisor.stop("flowgate_proxy", timeout=5)
+                supervisor.stop("cliproxyapi_plus", timeout=5)
+
+        self.assertEqual(failures, [])
+        blue, green = config["services"]["cliproxyapi_plus"]["proxy"]["ports"]
+        self.assertIn(green, ok)
+        self.assertEqual(ok[-1], blue)
+        restarts = [
+            e
+            for e in self.read_events()
+            if e["event"] == "service_restart" and e["result"] == "success"
+        ]
+        self.assertEqual(len(restarts), 3)
+
+    def test_failed_retire_keeps_the_old_backend_routed(self) -> None:
+        config = self._config()
+        supervisor = ProcessSupervisor(
+            config["paths"]["runtime_dir"], events_log=config["paths"]["log_file"]
+        )
+        src_dir = str(Path(flowgate.__file__).resolve().parents[1])
+        public = config["services"]["flowgate_proxy"]["port"]
+        url = f"http://127.0.0.1:{public}/v1/models"
+        blue, _ = config["services"]["cliproxyapi_plus"]["proxy"]["ports"]
+        real_stop = ProcessSupervisor.stop
+
+        def stop_times_out(self, name, *args, **kwargs):
+            if name == "cliproxyapi_plus":
+                return False
+            return real_stop(self, name, *args, **kwargs)
+
+        with mock.patch.dict(os.environ, {"PYTHONPATH": src_dir}):
+            try:
+                start_service(config, supervisor, "cliproxyapi_plus")
+                start_service(config, supervisor, "flowgate_proxy")
+                self.assertTrue(wait_for_readiness(url, timeout=10.0)["ok"])
+
+                with (
+                    mock.patch.object(ProcessSupervisor, "stop", stop_times_out),
+                    self.assertRaises(ProcessError),
+                ):
+                    restart_service(config, supervisor, "cliproxyapi_plus")
+
+                # The proxy reloads its routes; the old backend still answers.
+                self.assertTrue(wait_for_readiness(url, timeout=10.0)["ok"])
+                with urlopen(url, timeout=5.0) as resp:
+                    self.assertEqual(json.loads(resp.read())["port"], blue)
+                self.assertFalse(supervisor.is_running("cliproxyapi_plus.standby"))
+            finally:
+                supervisor.stop("flowgate_proxy", timeout=5)
+                supervisor.stop("cliproxyapi_plus", timeout=5)
+
+
+if __name__ == "__main__":
+    unittest.main()
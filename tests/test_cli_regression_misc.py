@@ -9,6 +9,7 @@ from __future__ import annotations
 import io
 import json
 import tempfile
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -16,6 +17,7 @@ from unittest import mock
 import pytest
 
 from flowgate.cli import run_cli
+from flowgate.core.latency import record_latencies
 
 
 def write_minimal_v3_config(root: Path) -> Path:
@@ -90,6 +92,80 @@ class TestDiagnosticCommandRegression(unittest.TestCase):
         self.assertIn("cliproxyapi_plus_config=", output)
         self.assertIn("secret_permission_issues=0", output)
 
+    def test_metrics_reports_percentiles_per_window(self) -> None:
+        record_latencies(
+            self.root / "runtime" / "latency.json",
+            [("oauth_poll_status", float(ms), time.time()) for ms in range(1, 101)],
+        )
+
+        stdout = io.StringIO()
+        args = ["--config", str(self.config), "--format", "json", "metrics"]
+        args += ["--window", "1h", "--operation", "oauth_poll_status"]
+
+        exit_code = run_cli(args, stdout=stdout, stderr=io.StringIO())
+
+        self.assertEqual(exit_code, 0)
+        report = json.loads(stdout.getvalue())["data"]["windows"]
+        self.assertEqual(list(report), ["1h"])
+        poll = report["1h"]["oauth_poll_status"]
+        self.assertEqual((poll["count"], poll["max_ms"]), (100, 100.0))
+        self.assertAlmostEqual(poll["p90_ms"], 90.0, delta=3.0)
+        self.assertEqual(poll["mean_ms"], 50.5)
+        self.assertEqual(list(report["1h"]), ["oauth_poll_status"])
+
+    def test_metrics_rejects_windows_beyond_retention(self) -> None:
+        with self.assertRaises(SystemExit):
+            run_cli(
+                ["--config", str(self.config), "metrics", "--window", "30d"],
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+    def test_trace_out_nests_config_load_under_the_command(self) -> None:
+        trace_file = self.root / "trace.json"
+        args = ["--config", str(self.config), "--trace-out", str(trace_file)]
+
+        exit_code = run_cli(
+            args + ["metrics"], stdout=io.StringIO(), stderr=io.StringIO()
+        )
+
+        self.assertEqual(exit_code, 0)
+        events = json.loads(trace_file.read_text())["traceEvents"]
+        spans = {e["name"]: e["args"] for e in events if e["ph"] == "X"}
+        self.assertIn("config_load", spans)
+        self.assertEqual(spans["config_load"]["parent_id"], spans["metrics"]["span_id"])
+        self.assertEqual(
+            spans["config_normalize"]["parent_id"], spans["config_load"]["span_id"]
+        )
+
+    def test_unwritable_trace_out_keeps_the_command_result(self) -> None:
+        trace_file = self.root / "trace-dir"
+        trace_file.mkdir()
+        stderr = io.StringIO()
+        args = ["--config", str(self.config), "--trace-out", str(trace_file)]
+
+        exit_code = run_cli(args + ["metrics"], stdout=io.StringIO(), stderr=stderr)
+
+        self.assertEqual(exit_code, 0)
+        self.assertIn(f"trace: cannot write {trace_file}:", stderr.getvalue())
+        self.assertNotIn("Internal error", stderr.getvalue())
+
+    def test_profile_writes_artifacts_to_the_runtime_dir(self) -> None:
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        args = ["--config", str(self.config), "--format", "json", "--profile"]
+
+        exit_code = run_cli(args + ["metrics"], stdout=stdout, stderr=stderr)
+
+        self.assertEqual(exit_code, 0)
+        json.loads(stdout.getvalue())  # command output is untouched
+        paths = [Path(line.split("=", 1)[1]) for line in stderr.getvalue().split()]
+        self.assertEqual([p.suffix for p in paths], [".pstats", ".txt"])
+        for path in paths:
+            self.assertEqual(path.parent, self.root / "runtime" / "profiles")
+            self.assertTrue(path.name.startswith("metrics-"))
+        self.assertIn("_load_and_resolve_config", paths[1].read_text())
+
     @mock.patch("flowgate.cli.health.ProcessSupervisor")
     @mock.patch("flowgate.cli.health.check_http_health")
     @mock.patch("flowgate.cli.health.comprehensive_health_check")
@@ -8,6 +8,8 @@ from __future__ import annotations
 import io
 import json
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
@@ -15,6 +17,13 @@ from unittest import mock
 import pytest
 
 from flowgate.cli import run_cli
+from flowgate.cli.helpers import _load_and_resolve_config
+from flowgate.cli.service import (
+    _run_backends_first,
+    _run_for_services,
+    _ServiceOutcome,
+)
+from flowgate.core.observability import current_span, span
 
 
 def write_minimal_v3_config(root: Path) -> Path:
@@ -305,5 +314,240 @@ class TestServiceCommandOutput(unittest.TestCase):
         self.assertIn("port=5000", error_output, "Error should include port number")
 
 
+@pytest.mark.unit
+class TestServiceStartWait(unittest.TestCase):
+    """Regression tests for readiness-gated service start"""
+
+    def setUp(self) -> None:
+        self.root = Path(tempfile.mkdtemp())
+        self.cfg = write_minimal_v3_config(self.root)
+
+    def _events(self) -> list[dict]:
+        log = self.root / "runtime" / "events.log"
+        return [json.loads(line) for line in log.read_text().splitlines() if line]
+
+    def test_service_start_wait_reports_time_to_ready(self) -> None:
+        """service start --wait reports time_to_ready_ms in JSON and events"""
+        out = io.StringIO()
+        with (
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.start", return_value=12345
+            ),
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.is_running",
+                return_value=False,
+            ),
+            mock.patch("flowgate.cli.service.is_port_available", return_value=True),
+            mock.patch(
+                "flowgate.core.health.check_http_health",
+                return_value={"ok": True, "status_code": 200, "error": None},
+            ) as probe,
+        ):
+            result = run_cli(
+                [
+                    "--config",
+                    str(self.cfg),
+                    "--format",
+                    "json",
+                    "service",
+                    "start",
+                    "--wait",
+                ],
+                stdout=out,
+            )
+
+        self.assertEqual(result, 0)
+        probe.assert_called_once()
+        self.assertEqual(probe.call_args.args[0], "http://127.0.0.1:5000/v1/models")
+        entry = json.loads(out.getvalue())["data"]["results"][0]
+        self.assertTrue(entry["ready"])
+        self.assertIsInstance(entry["time_to_ready_ms"], float)
+        ready_events = [e for e in self._events() if e["event"] == "service_ready"]
+        self.assertEqual(ready_events[-1]["result"], "success")
+        self.assertEqual(
+            ready_events[-1]["time_to_ready_ms"], entry["time_to_ready_ms"]
+        )
+
+    def test_service_start_wait_includes_warmup(self) -> None:
+        """service start --wait is only ready after the warm-up requests ran"""
+        data = json.loads(self.cfg.read_text())
+        data["cliproxyapi_plus"]["warmup"] = {"requests": ["/v1/models"]}
+        self.cfg.write_text(json.dumps(data), encoding="utf-8")
+        warmup = {
+            "ok": True,
+            "requests": 2,
+            "failures": 0,
+            "duration_ms": 12.5,
+            "first_latency_ms": 10.0,
+            "steady_latency_ms": 2.5,
+        }
+        out = io.StringIO()
+        with (
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.start", return_value=12345
+            ),
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.is_running",
+                return_value=False,
+            ),
+            mock.patch("flowgate.cli.service.is_port_available", return_value=True),
+            mock.patch(
+                "flowgate.core.health.check_http_health",
+                return_value={"ok": True, "status_code": 200, "error": None},
+            ),
+            mock.patch(
+                "flowgate.core.lifecycle.run_warmup", return_value=warmup
+            ) as run_warmup,
+        ):
+            result = run_cli(
+                ["--config", str(self.cfg), "service", "start", "--wait"],
+                stdout=out,
+            )
+
+        self.assertEqual(result, 0)
+        self.assertEqual(run_warmup.call_args.args[0], "http://127.0.0.1:5000")
+        self.assertIn("warmup_ms=12.5", out.getvalue())
+        event = [e for e in self._events() if e["event"] == "service_warmup"][-1]
+        self.assertEqual(event["first_latency_ms"], 10.0)
+        self.assertEqual(event["steady_latency_ms"], 2.5)
+
+    def test_service_start_wait_fails_when_process_exits(self) -> None:
+        """service start --wait fails fast when the child dies before ready"""
+        out = io.StringIO()
+        err = io.StringIO()
+        with (
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.start", return_value=12345
+            ),
+            mock.patch(
+                "flowgate.core.process.ProcessSupervisor.is_running",
+                return_value=False,
+            ),
+            mock.patch("flowgate.cli.service.is_port_available", return_value=True),
+            mock.patch(
+                "flowgate.core.health.check_http_health",
+                return_value={"ok": False, "status_code": None, "error": "URLError"},
+            ),
+        ):
+            result = run_cli(
+                ["--config", str(self.cfg), "service", "start", "--wait"],
+                stdout=out,
+                stderr=err,
+            )
+
+        self.assertEqual(result, 1)
+        self.assertIn("cliproxyapi_plus:started pid=12345", out.getvalue())
+        self.assertIn("cliproxyapi_plus:not-ready reason=exited", err.getvalue())
+
+
+@pytest.mark.unit
+class TestParallelServiceExecution(unittest.TestCase):
+    """Parallel per-service execution keeps deterministic result order"""
+
+    def test_results_follow_service_order(self) -> None:
+        delays = {"a": 0.2, "b": 0.05, "c": 0.1}
+
+        def operation(name: str) -> _ServiceOutcome:
+            time.sleep(delays[name])
+            return _ServiceOutcome(result={"service": name, "ok": True})
+
+        started = time.perf_counter()
+        outcomes = _run_for_services(["a", "b", "c"], operation, max_parallel=3)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual([o.result["service"] for o in outcomes], ["a", "b", "c"])
+        self.assertLess(elapsed, sum(delays.values()))
+
+    def test_max_parallel_bounds_concurrency(self) -> None:
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def operation(name: str) -> _ServiceOutcome:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return _ServiceOutcome(result={"service": name, "ok": True})
+
+        _run_for_services([f"svc-{i}" for i in range(6)], operation, max_parallel=2)
+
+        self.assertLessEqual(peak, 2)
+
+    def test_parallel_workers_log_to_the_configured_events_log(self) -> None:
+        root = Path(tempfile.mkdtemp())
+        cfg = write_minimal_v3_config(root)
+        load = _load_and_resolve_config
+
+        def load_two_services(path: str) -> dict:
+            config = load(path)
+            config["services"]["second"] = dict(config["services"]["cliproxyapi_plus"])
+            return config
+
+        with mock.patch("flowgate.cli._load_and_resolve_config", load_two_services):
+            result = run_cli(
+                ["--config", str(cfg), "service", "stop", "all", "--max-parallel", "2"],
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+        self.assertEqual(result, 0)
+        records = [
+            json.loads(line)
+            for line in (root / "runtime" / "events.log").read_text().splitlines()
+        ]
+        stops = [r for r in records if r.get("operation") == "service_stop"]
+        self.assertEqual(len(stops), 2)
+
+    def test_workers_nest_under_the_callers_span(self) -> None:
+        def operation(name: str) -> _ServiceOutcome:
+            return _ServiceOutcome(result={"service": name, "parent": current_span()})
+
+        with span("service_restart") as parent:
+            outcomes = _run_for_services(["a", "b"], operation, max_parallel=2)
+
+        self.assertEqual([o.result["parent"] for o in outcomes], [parent, parent])
+
+    def test_front_proxy_starts_after_its_backends(self) -> None:
+        config = {
+            "services": {
+                "flowgate_proxy": {"backends": ["a", "b"]},
+                "a": {},
+                "b": {},
+            }
+        }
+        finished: list[str] = []
+        seen_at_start: dict[str, list[str]] = {}
+        lock = threading.Lock()
+
+        def operation(name: str) -> _ServiceOutcome:
+            with lock:
+                seen_at_start[name] = list(finished)
+            time.sleep(0.05)
+            with lock:
+                finished.append(name)
+            return _ServiceOutcome(result={"service": name, "ok": True})
+
+        outcomes = _run_backends_first(
+            config, ["flowgate_proxy", "a", "b"], operation, max_parallel=3
+        )
+
+        self.assertEqual(
+            [o.result["service"] for o in outcomes], ["flowgate_proxy", "a", "b"]
+        )
+        self.assertEqual(sorted(seen_at_start["flowgate_proxy"]), ["a", "b"])
+
+    def test_max_parallel_rejects_zero(self) -> None:
+        with self.assertRaises(SystemExit):
+            run_cli(
+                ["service", "stop", "--max-parallel", "0"],
+                stdout=io.StringIO(),
+                stderr=io.StringIO(),
+            )
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,12 +1,17 @@
 import json
+import os
+import stat
 import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 import pytest
 
+from flowgate.cli.helpers import effective_secret_files
 from flowgate.core.config import ConfigError, load_router_config, merge_dicts
 from flowgate.core.constants import DEFAULT_SERVICE_HOST, DEFAULT_SERVICE_PORTS
+from flowgate.core.lifecycle import materialize_backend_config, start_service
 from tests.fixtures import ConfigFactory
 
 
@@ -87,6 +92,323 @@ class ConfigTests(unittest.TestCase):
         cfg = load_router_config(path)
         self.assertIn("codex", cfg["auth"]["providers"])
 
+    def test_front_proxy_splits_public_port_from_backend(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {
+            "enabled": True,
+            "backend_ports": [18317, 18318],
+        }
+        path = self._write_project_config(data)
+        cfg = load_router_config(path)
+
+        proxy = cfg["services"]["flowgate_proxy"]
+        backend = cfg["services"]["cliproxyapi_plus"]
+        self.assertEqual(proxy["port"], DEFAULT_SERVICE_PORTS["cliproxyapi_plus"])
+        self.assertEqual(proxy["backends"], ["cliproxyapi_plus"])
+        self.assertEqual(backend["port"], 18317)
+        self.assertEqual(backend["proxy"]["ports"], [18317, 18318])
+        self.assertTrue(
+            backend["command"]["args"][-1].endswith("cliproxyapi_plus-18317.yaml")
+        )
+
+    def test_front_proxy_rejects_duplicate_backend_ports(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {
+            "enabled": True,
+            "backend_ports": [18317, 18317],
+        }
+        path = self._write_project_config(data)
+
+        with self.assertRaises(ConfigError):
+            load_router_config(path)
+
+    def test_lazy_front_proxy_points_back_at_the_config(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {
+            "enabled": True,
+            "lazy": True,
+            "idle_seconds": 120,
+        }
+        path = self._write_project_config(data)
+        proxy = load_router_config(path)["services"]["flowgate_proxy"]
+
+        self.assertEqual(
+            proxy["lazy"], {"config": str(Path(path).resolve()), "idle_seconds": 120.0}
+        )
+
+    def test_hot_spare_is_marked_on_backends_and_excludes_lazy(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {"enabled": True, "hot_spare": True}
+        services = load_router_config(self._write_project_config(data))["services"]
+        self.assertTrue(services["cliproxyapi_plus"]["proxy"]["hot_spare"])
+
+        data["cliproxyapi_plus"]["front_proxy"]["lazy"] = True
+        with self.assertRaises(ConfigError):
+            load_router_config(self._write_project_config(data))
+
+    def test_replicas_derive_one_service_per_port(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 3
+        data["cliproxyapi_plus"]["base_port"] = 9000
+        path = self._write_project_config(data)
+        cfg = load_router_config(path)
+
+        self.assertEqual(
+            sorted(cfg["services"]),
+            ["cliproxyapi_plus", "cliproxyapi_plus_2", "cliproxyapi_plus_3"],
+        )
+        self.assertEqual(
+            [cfg["services"][n]["port"] for n in sorted(cfg["services"])],
+            [9000, 9001, 9002],
+        )
+        self.assertTrue(
+            cfg["services"]["cliproxyapi_plus_3"]["command"]["args"][-1].endswith(
+                "cliproxyapi_plus_3-9002.yaml"
+            )
+        )
+        self.assertEqual(cfg["cliproxyapi_plus"]["replicas"], 3)
+
+    def test_replicas_behind_front_proxy_get_their_own_slots(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        data["cliproxyapi_plus"]["front_proxy"] = {"enabled": True}
+        path = self._write_project_config(data)
+        cfg = load_router_config(path)
+
+        base = DEFAULT_SERVICE_PORTS["cliproxyapi_plus"] + 10000
+        self.assertEqual(
+            cfg["services"]["flowgate_proxy"]["backends"],
+            ["cliproxyapi_plus", "cliproxyapi_plus_2"],
+        )
+        self.assertEqual(
+            cfg["services"]["cliproxyapi_plus_2"]["proxy"]["ports"],
+            [base + 2, base + 3],
+        )
+
+    def test_starting_a_replica_writes_its_derived_config(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        path = self._write_project_config(data)
+        cfg = load_router_config(path)
+        supervisor = mock.MagicMock()
+        supervisor.is_running.return_value = False
+
+        start_service(cfg, supervisor, "cliproxyapi_plus_2")
+
+        args = supervisor.start.call_args.args[1]
+        derived = json.loads(Path(args[-1]).read_text(encoding="utf-8"))
+        self.assertEqual(derived["port"], DEFAULT_SERVICE_PORTS["cliproxyapi_plus"] + 1)
+
+    def test_every_replica_config_copy_is_private(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 3
+        cfg = load_router_config(self._write_project_config(data))
+        supervisor = mock.MagicMock()
+        supervisor.is_running.return_value = False
+
+        previous = os.umask(0o022)
+        try:
+            for name in (
+                "cliproxyapi_plus",
+                "cliproxyapi_plus_2",
+                "cliproxyapi_plus_3",
+            ):
+                start_service(cfg, supervisor, name)
+        finally:
+            os.umask(previous)
+
+        copies = [Path(c.args[1][-1]) for c in supervisor.start.call_args_list]
+        self.assertEqual(len(copies), 3)
+        secret_files = effective_secret_files(cfg)
+        for copy in copies:
+            self.assertEqual(stat.S_IMODE(copy.stat().st_mode), 0o600)
+            self.assertIn(str(copy.resolve()), secret_files)
+
+    def test_derived_backend_config_is_private(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {"enabled": True}
+        cfg = load_router_config(self._write_project_config(data))
+        service = cfg["services"]["cliproxyapi_plus"]
+
+        previous = os.umask(0o022)
+        try:
+            derived = materialize_backend_config("cliproxyapi_plus", service, 19000)
+        finally:
+            os.umask(previous)
+
+        self.assertEqual(stat.S_IMODE(derived.stat().st_mode), 0o600)
+        self.assertIn(str(derived.resolve()), effective_secret_files(cfg))
+
+    def test_rejects_invalid_replicas(self):
+        for replicas in (0, True, "2"):
+            data = self._base_config()
+            data["cliproxyapi_plus"]["replicas"] = replicas
+            path = self._write_project_config(data)
+            with self.subTest(replicas=replicas), self.assertRaises(ConfigError):
+                load_router_config(path)
+
+    def test_log_rotation_applies_to_every_service(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        data["cliproxyapi_plus"]["log_rotation"] = {"max_bytes": 1048576, "keep": 3}
+        path = self._write_project_config(data)
+        cfg = load_router_config(path)
+
+        for service in cfg["services"].values():
+            self.assertEqual(service["log_rotation"], {"max_bytes": 1048576, "keep": 3})
+
+    def test_log_rotation_requires_a_trigger(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["log_rotation"] = {"keep": 3}
+        path = self._write_project_config(data)
+
+        with self.assertRaises(ConfigError):
+            load_router_config(path)
+
+    def test_stop_drain_seconds_applies_to_every_service(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        data["cliproxyapi_plus"]["stop_drain_seconds"] = 30
+        cfg = load_router_config(self._write_project_config(data))
+
+        for service in cfg["services"].values():
+            self.assertEqual(service["stop_drain_seconds"], 30.0)
+
+        data["cliproxyapi_plus"]["stop_drain_seconds"] = -1
+        with self.assertRaises(ConfigError):
+            load_router_config(self._write_project_config(data))
+
+    def test_process_controls_pin_replicas_to_distinct_cores(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        data["cliproxyapi_plus"]["process_controls"] = {
+            "cpus": [0, 1, 2, 3, 4],
+            "nice": 5,
+            "io_priority": {"class": "best-effort", "level": 6},
+        }
+        path = self._write_project_config(data)
+        services = load_router_config(path)["services"]
+
+        self.assertEqual(
+            services["cliproxyapi_plus"]["process_controls"]["cpus"], [0, 1, 2]
+        )
+        self.assertEqual(
+            services["cliproxyapi_plus_2"]["process_controls"]["cpus"], [3, 4]
+        )
+        self.assertEqual(services["cliproxyapi_plus_2"]["process_controls"]["nice"], 5)
+
+    def test_replicas_are_pinned_to_distinct_cores_by_default(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["replicas"] = 2
+        with mock.patch("os.sched_getaffinity", return_value={0, 1, 2, 3}, create=True):
+            services = load_router_config(self._write_project_config(data))["services"]
+            data["cliproxyapi_plus"]["process_controls"] = {"cpus": None}
+            unpinned = load_router_config(self._write_project_config(data))["services"]
+
+        self.assertEqual(
+            services["cliproxyapi_plus"]["process_controls"]["cpus"], [0, 1]
+        )
+        self.assertEqual(
+            services["cliproxyapi_plus_2"]["process_controls"]["cpus"], [2, 3]
+        )
+        self.assertNotIn("process_controls", unpinned["cliproxyapi_plus_2"])
+
+    def test_rejects_invalid_process_controls(self):
+        for controls in (
+            {"cpus": []},
+            {"nice": 20},
+            {"io_priority": {"class": "fast"}},
+            {"max_open_files": 0},
+        ):
+            with self.subTest(controls=controls):
+                data = self._base_config()
+                data["cliproxyapi_plus"]["process_controls"] = controls
+                with self.assertRaises(ConfigError):
+                    load_router_config(self._write_project_config(data))
+
+    def test_warmup_applies_to_backends_only(self):
+        data = self._base_config()
+        data["cliproxyapi_plus"]["front_proxy"] = {"enabled": True}
+        data["cliproxyapi_plus"]["warmup"] = {
+            "requests": ["/v1/models", {"path": "/v1/chat/completions", "body": {}}],
+            "concurrency": 2,
+        }
+        path = self._write_project_config(data)
+        services = load_router_config(path)["services"]
+
+        warmup = services["cliproxyapi_plus"]["warmup"]
+        self.assertEqual(warmup["concurrency"], 2)
+        self.assertEqual(warmup["api_keys_from"], str(path.parent / "cliproxyapi.yaml"))
+        self.assertNotIn("warmup", services["flowgate_proxy"])
+
+        for warmup in ({"requests": []}, {"requests": ["v1/models"]}):
+            with self.subTest(warmup=warmup):
+                data["cliproxyapi_plus"]["warmup"] = warmup
+                with self.assertRaises(ConfigError):
+                    load_router_config(self._write_project_config(data))
+
+    def test_observability_events_defaults_and_validation(self):
+        data = self._base_config()
+        cfg = load_router_config(self._write_project_config(data))
+        self.assertEqual(
+            cfg["observability"]["events"],
+            {
+                "flush_interval": 1.0,
+                "fsync": "never",
+                "segments": {
+                    "max_bytes": 64 * 1024 * 1024,
+                    "keep": 20,
+                    "compress": True,
+                },
+            },
+        )
+
+        for events in (
+            {"flush_interval": -1},
+            {"fsync": "always"},
+            {"segments": {"max_bytes": 0}},
+            {"segments": {"compress": "yes"}},
+        ):
+            with self.subTest(events=events):
+                data["observability"] = {"events": events}
+                with self.assertRaises(ConfigError):
+                    load_router_config(self._write_project_config(data))
+
+    def test_observability_metrics_defaults_and_validation(self):
+        data = self._base_config()
+        metrics = load_router_config(self._write_project_config(data))["observability"][
+            "metrics"
+        ]
+        self.assertEqual(metrics["sinks"], ["file"])
+        self.assertEqual(metrics["sample_rate"], 1.0)
+        self.assertEqual(metrics["statsd"]["address"], "127.0.0.1:8125")
+
+        data["observability"] = {
+            "metrics": {
+                "sinks": ["file", "statsd"],
+                "sample_rates": {"oauth_poll_status": 0.1},
+                "statsd": {"address": "[::1]:8125", "dogstatsd": True},
+            }
+        }
+        metrics = load_router_config(self._write_project_config(data))["observability"][
+            "metrics"
+        ]
+        self.assertEqual(metrics["sample_rates"], {"oauth_poll_status": 0.1})
+        self.assertTrue(metrics["statsd"]["dogstatsd"])
+
+        for invalid in (
+            {"sinks": []},
+            {"sinks": ["kafka"]},
+            {"sample_rate": 1.5},
+            {"sample_rates": {"config_load": True}},
+            {"memory": {"capacity": 0}},
+            {"statsd": {"address": "localhost"}},
+        ):
+            with self.subTest(metrics=invalid):
+                data["observability"] = {"metrics": invalid}
+                with self.assertRaises(ConfigError):
+                    load_router_config(self._write_project_config(data))
+
     def test_merge_dicts_deep(self):
         base = {
             "settings": {"retries": 1, "cooldown": 10},
@@ -0,0 +1,150 @@
+import io
+import json
+import os
+import stat
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flowgate.cli import run_cli
+from flowgate.cli.daemon import DaemonState
+from flowgate.cli.helpers import _load_and_resolve_config
+from flowgate.core.daemon import DaemonServer, default_socket_path, request_daemon
+from flowgate.core.process import ProcessError
+from tests.fixtures import ConfigFactory
+
+
+@pytest.mark.unit
+class DaemonTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        self.cfg = ConfigFactory.write_minimal_v3(self.root)
+        env = mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(self.root)})
+        env.start()
+        self.addCleanup(env.stop)
+
+    def _serve(self) -> tuple[DaemonState, DaemonServer]:
+        state = DaemonState(_load_and_resolve_config(str(self.cfg)), health_ttl=60.0)
+        server = DaemonServer(default_socket_path(self.cfg), state.dispatch)
+        thread = threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        )
+        thread.start()
+
+        def stop():
+            server.shutdown()
+            server.server_close()
+            thread.join(timeout=5)
+
+        self.addCleanup(stop)
+        return state, server
+
+    def test_status_is_answered_by_running_daemon(self):
+        self._serve()
+        out = io.StringIO()
+        with mock.patch(
+            "flowgate.cli._load_and_resolve_config",
+            side_effect=AssertionError("config loaded locally"),
+        ):
+            code = run_cli(
+                ["--config", str(self.cfg), "--format", "json", "status"], stdout=out
+            )
+
+        self.assertEqual(code, 0)
+        payload = json.loads(out.getvalue())
+        self.assertEqual(payload["command"], "status")
+        self.assertEqual(payload["data"]["services"], {"cliproxyapi_plus": False})
+
+    def test_no_daemon_flag_runs_locally(self):
+        self._serve()
+        out = io.StringIO()
+        with mock.patch("flowgate.cli.daemon.request_daemon") as request:
+            code = run_cli(
+                ["--config", str(self.cfg), "--no-daemon", "status"], stdout=out
+            )
+
+        self.assertEqual(code, 0)
+        request.assert_not_called()
+        self.assertIn("services.cliproxyapi_plus_running=no", out.getvalue())
+
+    def test_response_reports_server_time(self):
+        self._serve()
+        response = request_daemon(
+            default_socket_path(self.cfg), {"argv": ["status"], "format": "json"}
+        )
+
+        self.assertEqual(response["exit_code"], 0)
+        self.assertIsInstance(response["server_ms"], float)
+
+    def test_health_results_are_reused_within_ttl(self):
+        state, _server = self._serve()
+        with (
+            mock.patch(
+                "flowgate.cli.health.comprehensive_health_check",
+                return_value={
+                    "overall_status": "healthy",
+                    "status_counts": {"healthy": 0, "degraded": 0, "unhealthy": 0},
+                    "checks": {},
+                },
+            ) as check,
+            mock.patch(
+                "flowgate.cli.health.check_http_health",
+                return_value={"ok": True, "status_code": 200, "error": None},
+            ),
+        ):
+            first = state.dispatch({"argv": ["health"], "format": "legacy"})
+            second = state.dispatch({"argv": ["health"], "format": "legacy"})
+
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(first, second)
+
+    def test_mutating_commands_are_declined(self):
+        state, _server = self._serve()
+        response = state.dispatch({"argv": ["service", "stop"], "format": "json"})
+        self.assertNotIn("exit_code", response)
+
+    def test_second_daemon_on_same_socket_is_refused(self):
+        self._serve()
+        with self.assertRaises(ProcessError):
+            DaemonServer(default_socket_path(self.cfg), lambda request: {})
+
+    def test_client_returns_none_without_daemon(self):
+        self.assertIsNone(request_daemon(self.root / "missing.sock", {"op": "ping"}))
+
+    def test_socket_is_private_to_the_user(self):
+        _state, server = self._serve()
+        self.assertEqual(stat.S_IMODE(os.stat(server.socket_path).st_mode), 0o600)
+
+    def test_client_ignores_a_socket_owned_by_another_user(self):
+        _state, server = self._serve()
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(request_daemon(server.socket_path, {"op": "ping"}))
+
+    def test_without_runtime_dir_socket_lives_in_a_private_tmp_dir(self):
+        with (
+            mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}),
+            mock.patch("tempfile.tempdir", str(self.root)),
+        ):
+            path = default_socket_path(self.cfg)
+            self.assertEqual(path.parent, self.root / f"flowgate-{os.getuid()}")
+            server = DaemonServer(path, lambda request: {})
+            server.server_close()
+        self.assertEqual(stat.S_IMODE(os.stat(path.parent).st_mode), 0o700)
+
+    def test_tmp_dir_owned_by_another_user_is_refused(self):
+        with (
+            mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": ""}),
+            mock.patch("tempfile.tempdir", str(self.root)),
+            mock.patch("os.getuid", return_value=os.getuid() + 1),
+        ):
+            (self.root / f"flowgate-{os.getuid()}").mkdir(mode=0o700)
+            with self.assertRaises(ProcessError):
+                DaemonServer(default_socket_path(self.cfg), lambda request: {})
+
+
+if __name__ == "__main__":
+    unittest.main()
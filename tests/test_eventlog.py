@@ -0,0 +1,197 @@
+import gzip
+import json
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flowgate.core import eventlog
+from flowgate.core.eventlog import (
+    SegmentPolicy,
+    read_events,
+    sealed_segments,
+    wait_for_sealing,
+)
+from flowgate.core.observability import (
+    EventSink,
+    events_log_context,
+    get_recent_metrics,
+)
+
+
+def _record(i: int, operation: str = "config_load") -> dict:
+    return {
+        "event": "performance_metric" if i % 2 == 0 else "service_start",
+        "operation": operation,
+        "duration_ms": float(i),
+        "timestamp": f"2026-01-01T00:00:{i:02d}+00:00",
+    }
+
+
+@pytest.mark.unit
+class SegmentedEventLogTests(unittest.TestCase):
+    def setUp(self):
+        self.log = Path(tempfile.mkdtemp()) / "events.log"
+
+    def _sink(self, **policy) -> EventSink:
+        return EventSink(self.log, segments=SegmentPolicy(**policy))
+
+    def test_full_segment_is_sealed_indexed_and_compressed(self):
+        sink = self._sink(max_bytes=400, keep=10)
+        for i in range(10):
+            sink.emit(_record(i))
+
+        wait_for_sealing()
+        segments = sealed_segments(self.log)
+        self.assertGreaterEqual(len(segments), 2)
+        segment, index = segments[0]
+        self.assertEqual(segment.suffix, ".gz")
+        raw = gzip.decompress(segment.read_bytes())
+        self.assertEqual(index["bytes"], len(raw))
+        self.assertEqual(index["first_ts"], "2026-01-01T00:00:00+00:00")
+        metrics = index["events"]["performance_metric"]
+        first = json.loads(raw[metrics["start"] :].split(b"\n")[0])
+        self.assertEqual(first["event"], "performance_metric")
+        self.assertEqual(raw[: metrics["end"]].count(b"performance_metric"), 2)
+        # Nothing is lost or duplicated across segments.
+        self.assertEqual(
+            [r["duration_ms"] for r in read_events(self.log)],
+            [float(i) for i in range(10)],
+        )
+
+    def test_retention_drops_the_oldest_segments(self):
+        sink = self._sink(max_bytes=150, keep=2, compress=False)
+        for i in range(10):
+            sink.emit(_record(i))
+
+        wait_for_sealing()
+        segments = sealed_segments(self.log)
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(all(segment.exists() for segment, _ in segments))
+        kept = sorted(p.name for p in self.log.parent.iterdir())
+        self.assertEqual(len([n for n in kept if n.endswith(".idx.json")]), 2)
+        self.assertEqual([r["duration_ms"] for r in read_events(self.log)][-1], 9.0)
+
+    def test_queries_open_only_matching_segments(self):
+        sink = self._sink(max_bytes=300, keep=20)
+        for i in range(6):
+            sink.emit(_record(i, operation="config_load"))
+        for i in range(6, 12):
+            sink.emit(_record(i, operation="profile_switch"))
+        sink.emit(_record(12, operation="profile_switch"))
+
+        wait_for_sealing()
+        opened = []
+        real = eventlog._segment_lines
+
+        def tracking(segment, start, end):
+            opened.append(segment.name)
+            return real(segment, start, end)
+
+        with mock.patch.object(eventlog, "_segment_lines", tracking):
+            loads = list(read_events(self.log, operation="config_load"))
+            config_segments = set(opened)
+            opened.clear()
+            recent = list(read_events(self.log, since="2026-01-01T00:00:10+00:00"))
+
+        self.assertEqual(
+            [r["duration_ms"] for r in loads], [float(i) for i in range(6)]
+        )
+        all_segments = {segment.name for segment, _ in sealed_segments(self.log)}
+        self.assertLess(len(config_segments), len(all_segments))
+        self.assertEqual([r["duration_ms"] for r in recent], [10.0, 11.0, 12.0])
+        self.assertLessEqual(len(opened), 1)
+
+    def test_recent_metrics_span_sealed_segments(self):
+        sink = self._sink(max_bytes=300)
+        for i in range(12):
+            sink.emit(_record(i))
+        wait_for_sealing()
+        self.assertTrue(sealed_segments(self.log))
+
+        with events_log_context(self.log):
+            metrics = get_recent_metrics(limit=4)
+
+        self.assertEqual([m["duration_ms"] for m in metrics], [10.0, 8.0, 6.0, 4.0])
+
+    def test_newest_first_matches_forward_order_reversed(self):
+        for compress in (True, False):
+            with self.subTest(compress=compress):
+                self.log = Path(tempfile.mkdtemp()) / "events.log"
+                sink = self._sink(max_bytes=300, compress=compress)
+                for i in range(12):
+                    sink.emit(_record(i))
+                wait_for_sealing()
+                self.assertGreaterEqual(len(sealed_segments(self.log)), 2)
+
+                forward = [r["duration_ms"] for r in read_events(self.log)]
+                backward = [
+                    r["duration_ms"] for r in read_events(self.log, newest_first=True)
+                ]
+                newest = read_events(
+                    self.log, event="performance_metric", newest_first=True, limit=3
+                )
+
+                self.assertEqual(backward, forward[::-1])
+                self.assertEqual([r["duration_ms"] for r in newest], [10.0, 8.0, 6.0])
+
+    def test_sealing_work_runs_off_the_writing_thread(self):
+        release = threading.Event()
+        real = eventlog.build_index
+
+        def slow_index(lines, file):
+            release.wait(5)
+            return real(lines, file)
+
+        sink = self._sink(max_bytes=300)
+        with mock.patch.object(eventlog, "build_index", slow_index):
+            started = time.monotonic()
+            for i in range(6):
+                sink.emit(_record(i))
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertEqual(sealed_segments(self.log), [])
+            # Records in the segment being sealed stay readable.
+            self.assertEqual(
+                [r["duration_ms"] for r in read_events(self.log)],
+                [float(i) for i in range(6)],
+            )
+            release.set()
+            wait_for_sealing()
+
+        self.assertTrue(sealed_segments(self.log))
+        self.assertEqual(eventlog.pending_segments(self.log), [])
+
+    def test_segments_left_unfinished_are_picked_up(self):
+        self.log.parent.mkdir(parents=True, exist_ok=True)
+        leftover = self.log.with_name("events.log.20260101T000000.000000Z")
+        leftover.write_text(json.dumps(_record(0)) + "\n")
+
+        self.assertEqual(
+            [r["duration_ms"] for r in read_events(self.log, newest_first=True)], [0.0]
+        )
+        eventlog.finish_sealed(self.log, SegmentPolicy())
+
+        [(segment, index)] = sealed_segments(self.log)
+        self.assertEqual(segment.name, leftover.name + ".gz")
+        self.assertEqual(index["lines"], 1)
+        self.assertFalse(leftover.exists())
+
+    def test_time_bounds_compare_instants_not_strings(self):
+        sink = self._sink(max_bytes=300)
+        for i in range(12):
+            sink.emit(_record(i))
+
+        wait_for_sealing()
+        since_z = read_events(self.log, since="2026-01-01T00:00:10Z")
+        until_offset = read_events(self.log, until="2026-01-01T01:00:01+01:00")
+
+        self.assertEqual([r["duration_ms"] for r in since_z], [10.0, 11.0])
+        self.assertEqual([r["duration_ms"] for r in until_offset], [0.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
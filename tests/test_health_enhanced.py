@@ -17,6 +17,8 @@ from flowgate.core.health import (
     check_port_availability,
     check_service_ports,
     comprehensive_health_check,
+    service_readiness_url,
+    wait_for_readiness,
 )
 
 
@@ -445,5 +447,71 @@ class TestComprehensiveHealthCheck(unittest.TestCase):
             self.assertGreater(result["status_counts"]["degraded"], 0)
 
 
+@pytest.mark.unit
+class TestWaitForReadiness(unittest.TestCase):
+    """Test readiness-gated waiting."""
+
+    _READY = {"ok": True, "status_code": 200, "error": None}
+    _REFUSED = {"ok": False, "status_code": None, "error": "URLError"}
+
+    def test_service_readiness_url(self):
+        """Test readiness URL derivation from a service entry."""
+        self.assertEqual(
+            service_readiness_url({"host": "127.0.0.1", "port": 8317}),
+            "http://127.0.0.1:8317/v1/models",
+        )
+        self.assertEqual(
+            service_readiness_url({"port": 9000, "readiness_path": "/healthz"}),
+            "http://127.0.0.1:9000/healthz",
+        )
+        self.assertIsNone(service_readiness_url({"host": "127.0.0.1"}))
+
+    def test_wait_returns_once_probe_succeeds(self):
+        """Test wait retries with backoff until the probe passes."""
+        with (
+            patch(
+                "flowgate.core.health.check_http_health",
+                side_effect=[self._REFUSED, self._REFUSED, self._READY],
+            ) as probe,
+            patch("flowgate.core.health.time.sleep") as sleep,
+        ):
+            result = wait_for_readiness("http://127.0.0.1:1/v1/models", timeout=5)
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["reason"], "ready")
+        self.assertEqual(result["attempts"], 3)
+        self.assertIsNotNone(result["time_to_ready_ms"])
+        self.assertEqual(probe.call_count, 3)
+        delays = [c.args[0] for c in sleep.call_args_list]
+        self.assertEqual(delays, [0.05, 0.1])
+
+    def test_wait_fails_fast_when_process_exits(self):
+        """Test wait stops probing once the liveness callback fails."""
+        with patch(
+            "flowgate.core.health.check_http_health", return_value=self._REFUSED
+        ) as probe:
+            result = wait_for_readiness(
+                "http://127.0.0.1:1/v1/models", timeout=30, is_alive=lambda: False
+            )
+
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["reason"], "exited")
+        self.assertIsNone(result["time_to_ready_ms"])
+        self.assertEqual(probe.call_count, 1)
+
+    def test_wait_times_out(self):
+        """Test wait reports timeout once the deadline passes."""
+        with patch(
+            "flowgate.core.health.check_http_health", return_value=self._REFUSED
+        ):
+            result = wait_for_readiness(
+                "http://127.0.0.1:1/v1/models", timeout=0.05, initial_delay=0.01
+            )
+
+        self.assertFalse(result["ok"])
+        self.assertEqual(result["reason"], "timeout")
+        self.assertEqual(result["error"], "URLError")
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,120 @@
+import random
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flowgate.core import latency
+from flowgate.core.latency import (
+    BUCKET_COUNT,
+    LatencyHistogram,
+    LatencyStore,
+    bucket_bounds,
+    bucket_index,
+    read_latency_store,
+    record_latencies,
+    window_seconds,
+)
+
+
+@pytest.mark.unit
+class LatencyHistogramTests(unittest.TestCase):
+    def test_buckets_are_contiguous_and_cover_their_values(self):
+        previous_high = 0
+        for index in range(BUCKET_COUNT):
+            low, high = bucket_bounds(index)
+            self.assertEqual(low, previous_high)
+            self.assertEqual(bucket_index(low), index)
+            self.assertEqual(bucket_index(high - 1), index)
+            previous_high = high
+
+    def test_percentiles_are_within_bucket_precision(self):
+        rng = random.Random(7)
+        values = sorted(rng.lognormvariate(3, 1.5) for _ in range(5000))
+        histogram = LatencyHistogram()
+        for value in values:
+            histogram.record(value)
+
+        for q in (50, 90, 99):
+            exact = values[int(q / 100 * len(values)) - 1]
+            self.assertAlmostEqual(histogram.percentile(q), exact, delta=exact * 0.04)
+        summary = histogram.summary()
+        self.assertEqual(summary["count"], 5000)
+        self.assertEqual(summary["max_ms"], round(values[-1], 2))
+        self.assertAlmostEqual(summary["mean_ms"], sum(values) / 5000, places=1)
+
+    def test_only_hit_buckets_are_stored(self):
+        histogram = LatencyHistogram()
+        for value in (1.0, 1.0, 250.0):
+            histogram.record(value)
+        self.assertEqual(sorted(histogram.counts.values()), [1, 2])
+
+    def test_round_trips_through_dict(self):
+        histogram = LatencyHistogram()
+        for value in (0.0, 0.5, 12.0, 3_600_000.0):
+            histogram.record(value)
+        restored = LatencyHistogram.from_dict(histogram.to_dict())
+        self.assertEqual(restored.summary(), histogram.summary())
+
+
+@pytest.mark.unit
+class LatencyStoreTests(unittest.TestCase):
+    def test_windows_select_slots_and_persist_across_writers(self):
+        now = 1_800_000_000.0
+        state = Path(tempfile.mkdtemp()) / "latency.json"
+        record_latencies(state, [("config_load", 10.0, now - 30)])
+        record_latencies(
+            state,
+            [("config_load", 20.0, now - 2 * 3600), ("service_start", 5.0, now - 30)],
+        )
+        store = read_latency_store(state)
+
+        recent = store.window(window_seconds("5m"), now)
+        self.assertEqual(recent["config_load"].count, 1)
+        self.assertEqual(recent["service_start"].count, 1)
+        day = store.window(window_seconds("24h"), now)
+        self.assertEqual(day["config_load"].count, 2)
+
+        store.prune(now + 8 * 86400)
+        self.assertEqual(store.window(window_seconds("7d"), now), {})
+
+    def test_saves_append_to_a_journal_until_compaction(self):
+        now = time.time()
+        state = Path(tempfile.mkdtemp()) / "latency.json"
+        journal = state.with_name("latency.json.journal")
+
+        for i in range(3):
+            record_latencies(state, [("config_load", float(i), now)])
+        self.assertFalse(state.exists())
+        self.assertEqual(len(journal.read_text().splitlines()), 3)
+        self.assertEqual(
+            read_latency_store(state).window(60, now)["config_load"].count, 3
+        )
+
+        with mock.patch.object(latency, "JOURNAL_COMPACT_BYTES", 1):
+            record_latencies(state, [("config_load", 3.0, now)])
+        self.assertEqual(journal.stat().st_size, 0)
+        merged = read_latency_store(state).window(60, now)["config_load"]
+        self.assertEqual((merged.count, merged.max_ms), (4, 3.0))
+
+    def test_window_labels(self):
+        self.assertEqual(window_seconds("90s"), 90)
+        self.assertEqual(window_seconds("1.5h"), 5400)
+        for label in ("", "5", "0m", "xh", "8d"):
+            with self.subTest(label=label), self.assertRaises(ValueError):
+                window_seconds(label)
+
+    def test_merge_adds_counts(self):
+        a, b = LatencyStore(), LatencyStore()
+        a.add("op", 1.0, 0)
+        b.add("op", 3.0, 30)
+        a.merge(b)
+        merged = a.window(60, 59)["op"]
+        self.assertEqual((merged.count, merged.min_ms, merged.max_ms), (2, 1.0, 3.0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import asyncio
+import json
+import socket
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flowgate.core.lazystart import LazyBackends
+from flowgate.core.lifecycle import on_demand_services
+from flowgate.core.process import ProcessSupervisor
+from flowgate.core.proxy import FrontProxy, write_routes
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _get(port: int) -> bytes:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"GET / HTTP/1.0\r\n\r\n")
+    await writer.drain()
+    status = await reader.readline()
+    writer.close()
+    return status
+
+
+@pytest.mark.unit
+class LazyBackendsTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+        port = _unused_port()
+        self.config = {
+            "services": {
+                "backend": {
+                    "host": "127.0.0.1",
+                    "port": port,
+                    "readiness_path": "/",
+                    "command": {
+                        "cwd": str(self.root),
+                        "args": [
+                            sys.executable,
+                            "-m",
+                            "http.server",
+                            str(port),
+                            "--bind",
+                            "127.0.0.1",
+                        ],
+                    },
+                },
+                "flowgate_proxy": {"backends": ["backend"], "lazy": {}},
+            }
+        }
+        self.routes_path = self.root / "proxy" / "routes.json"
+        write_routes(
+            self.routes_path,
+            {
+                "listen": {"host": "127.0.0.1", "port": 0},
+                "backends": [{"name": "backend", "host": "127.0.0.1", "port": port}],
+            },
+        )
+        self.supervisor = ProcessSupervisor(self.root / "runtime")
+        self.addCleanup(self.supervisor.stop, "backend", timeout=2)
+
+    def _events(self, name: str) -> list[dict]:
+        lines = self.supervisor.events_log.read_text().splitlines()
+        return [e for e in map(json.loads, lines) if e["event"] == name]
+
+    def test_starts_on_first_connection_and_stops_when_idle(self):
+        async def scenario():
+            lazy = LazyBackends(self.config, self.supervisor, idle_seconds=0.3)
+            proxy = FrontProxy(self.routes_path, lazy=lazy)
+            port = await proxy.start()
+            proxy.start_idle_stop()
+            self.assertFalse(self.supervisor.is_running("backend"))
+
+            self.assertIn(b" 200 ", await _get(port))
+            self.assertTrue(self.supervisor.is_running("backend"))
+            self.assertEqual(len(self._events("lazy_start")), 1)
+
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if not self.supervisor.is_running("backend"):
+                    break
+            self.assertFalse(self.supervisor.is_running("backend"))
+
+            self.assertIn(b" 200 ", await _get(port))
+            await proxy.shutdown(drain_timeout=1.0)
+
+        asyncio.run(scenario())
+
+        starts = self._events("lazy_start")
+        self.assertEqual(len(starts), 2)
+        self.assertEqual(starts[0]["detail"], "backend")
+        self.assertGreater(starts[0]["cold_start_ms"], 0)
+        stop = self._events("lazy_idle_stop")[0]
+        self.assertGreater(stop["rss_kb"], 0)
+        self.assertGreaterEqual(stop["idle_ms"], 300)
+
+    def test_failed_cold_start_is_retried_by_the_next_connection(self):
+        command = self.config["services"]["backend"]["command"]
+        working_args = command["args"]
+        command["args"] = [sys.executable, "-c", "raise SystemExit(1)"]
+        calls = []
+
+        async def scenario():
+            lazy = LazyBackends(
+                self.config, self.supervisor, idle_seconds=60, start_timeout=5
+            )
+            await lazy.ensure_started(lambda: calls.append("first"))
+            self.assertFalse(self.supervisor.is_running("backend"))
+
+            command["args"] = working_args
+            await lazy.ensure_started(lambda: calls.append("second"))
+            self.assertTrue(self.supervisor.is_running("backend"))
+
+            # Ready now: later connections do not start anything.
+            await lazy.ensure_started(lambda: calls.append("third"))
+
+        asyncio.run(scenario())
+
+        self.assertEqual(calls, ["first", "second"])
+        failed, started = self._events("lazy_start")
+        self.assertEqual((failed["service"], failed["result"]), ("backend", "failed"))
+        self.assertEqual(started["detail"], "backend")
+        self.assertIn("cold_start_ms", started)
+
+    def test_start_errors_do_not_escape_into_the_proxy(self):
+        async def scenario():
+            lazy = LazyBackends(self.config, self.supervisor, idle_seconds=60)
+            with mock.patch(
+                "flowgate.core.lazystart.start_service",
+                side_effect=OSError("no such binary"),
+            ):
+                await lazy.ensure_started(lambda: None)
+            await lazy.ensure_started(lambda: None)
+
+        asyncio.run(scenario())
+
+        failed, started = self._events("lazy_start")
+        self.assertEqual(failed["detail"], "start failed: no such binary")
+        self.assertEqual(started["detail"], "backend")
+
+    def test_start_all_skips_on_demand_backends(self):
+        self.assertEqual(on_demand_services(self.config), {"backend"})
+
+
+if __name__ == "__main__":
+    unittest.main()
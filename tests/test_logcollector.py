@@ -0,0 +1,109 @@
+import gzip
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import flowgate
+from flowgate.core.logcollector import LogCollector, LogRotationPolicy, rotated_segments
+from flowgate.core.process import ProcessSupervisor
+
+
+def _read_all(log_path: Path) -> bytes:
+    data = b""
+    for segment in rotated_segments(log_path):
+        opener = gzip.open if segment.name.endswith(".gz") else open
+        with opener(segment, "rb") as handle:
+            data += handle.read()
+    return data + log_path.read_bytes()
+
+
+@pytest.mark.unit
+class LogCollectorTests(unittest.TestCase):
+    def setUp(self):
+        self.log_path = Path(tempfile.mkdtemp()) / "svc.log"
+
+    def test_rotates_by_size_compresses_and_keeps_newest_segments(self):
+        collector = LogCollector(
+            self.log_path, LogRotationPolicy(max_bytes=100, keep=2)
+        )
+        for n in range(10):
+            collector.feed(b"%02d" % n + b"x" * 58)
+        collector.close_input()
+        collector.run()
+
+        segments = rotated_segments(self.log_path)
+        self.assertEqual(len(segments), 2)
+        self.assertTrue(all(s.name.endswith(".gz") for s in segments))
+        # Only the newest data survives retention, and nothing is torn.
+        data = _read_all(self.log_path)
+        self.assertTrue(data.endswith(b"09" + b"x" * 58))
+        self.assertEqual(len(data) % 60, 0)
+
+    def test_drops_input_beyond_buffer_and_records_the_loss(self):
+        collector = LogCollector(
+            self.log_path,
+            LogRotationPolicy(max_bytes=1 << 20, buffer_bytes=10),
+        )
+        collector.feed(b"12345678\n")
+        collector.feed(b"lost\n")
+        collector.close_input()
+        collector.run()
+
+        text = self.log_path.read_text()
+        self.assertIn("12345678", text)
+        self.assertNotIn("lost", text)
+        self.assertIn("dropped 5 bytes", text)
+
+    def test_follows_file_rotated_by_another_collector(self):
+        collector = LogCollector(self.log_path, LogRotationPolicy(max_bytes=1 << 20))
+        collector.feed(b"before\n")
+        collector.close_input()
+        collector.run()
+        moved = self.log_path.with_name("svc.log.elsewhere")
+        os.replace(self.log_path, moved)
+
+        collector = LogCollector(self.log_path, LogRotationPolicy(max_bytes=1 << 20))
+        os.replace(self.log_path, moved.with_name("svc.log.other"))
+        collector.feed(b"after\n")
+        collector.close_input()
+        collector.run()
+
+        self.assertEqual(self.log_path.read_bytes(), b"after\n")
+        self.assertEqual(moved.read_bytes(), b"before\n")
+
+
+@pytest.mark.unit
+class SupervisorLogRotationTests(unittest.TestCase):
+    def test_child_output_goes_through_rotating_collector(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        code = "import sys\nfor n in range(2000): print(f'line {n:05d}')\n"
+
+        src_dir = str(Path(flowgate.__file__).resolve().parents[1])
+        with mock.patch.dict(os.environ, {"PYTHONPATH": src_dir}):
+            supervisor.start(
+                "svc",
+                [sys.executable, "-c", code],
+                log_rotation=LogRotationPolicy(max_bytes=4096, keep=100),
+            )
+        collector_pid = supervisor._read_pid_record("svc")["log_collector_pid"]
+        deadline = time.monotonic() + 10
+        while supervisor._is_pid_running(collector_pid):
+            self.assertLess(time.monotonic(), deadline, "collector did not exit")
+            supervisor._reap(collector_pid, None)
+            time.sleep(0.02)
+
+        log_path = supervisor.log_dir / "svc.log"
+        self.assertGreater(len(rotated_segments(log_path)), 1)
+        lines = _read_all(log_path).decode().splitlines()
+        self.assertEqual(lines, [f"line {n:05d}" for n in range(2000)])
+
+
+if __name__ == "__main__":
+    unittest.main()
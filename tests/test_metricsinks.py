@@ -0,0 +1,178 @@
+import json
+import socket
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+from flowgate.core import observability
+from flowgate.core.metricsinks import (
+    MemoryMetricSink,
+    MetricsPolicy,
+    NullMetricSink,
+    StatsdMetricSink,
+)
+from flowgate.core.observability import (
+    EventsLogMetricSink,
+    active_metric_sinks,
+    events_log_context,
+    log_performance_metric,
+    measure_time,
+    metrics_policy,
+)
+
+
+@pytest.mark.unit
+class MetricSinkTests(unittest.TestCase):
+    def setUp(self):
+        self.events_log = Path(tempfile.mkdtemp()) / "events.log"
+
+    def test_memory_sink_keeps_the_newest_records(self):
+        with metrics_policy(MetricsPolicy(sinks=("memory",), memory_capacity=3)) as (
+            memory,
+        ):
+            for i in range(5):
+                log_performance_metric("op", float(i))
+
+        self.assertIsInstance(memory, MemoryMetricSink)
+        self.assertEqual([r["duration_ms"] for r in memory.records()], [2.0, 3.0, 4.0])
+        self.assertEqual(memory.records("other"), [])
+
+    def test_statsd_sink_sends_one_line_per_metric(self):
+        listener = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.addCleanup(listener.close)
+        listener.bind(("127.0.0.1", 0))
+        listener.settimeout(5)
+        host, port = listener.getsockname()
+        policy = MetricsPolicy(
+            sinks=("statsd",),
+            sample_rates={"sampled": 0.5},
+            statsd_address=f"{host}:{port}",
+            dogstatsd=True,
+        )
+
+        with (
+            metrics_policy(policy),
+            mock.patch.object(observability.random, "random", return_value=0.1),
+        ):
+            log_performance_metric("config_load", 12.5, function_name="load")
+            log_performance_metric("sampled", 3.0, context={"profile": "fast"})
+
+        lines = [listener.recv(512).decode() for _ in range(2)]
+        self.assertEqual(
+            lines,
+            [
+                "flowgate.config_load:12.5|ms|#function:load",
+                "flowgate.sampled:3.0|ms|@0.5|#profile:fast",
+            ],
+        )
+
+    def test_file_sink_is_the_default(self):
+        self.assertIsInstance(active_metric_sinks()[0], EventsLogMetricSink)
+        with events_log_context(self.events_log), metrics_policy():
+            log_performance_metric("op", 1.0)
+
+        record = json.loads(self.events_log.read_text())
+        self.assertEqual(record["operation"], "op")
+        self.assertNotIn("sample_rate", record)
+
+    def test_null_sink_disables_measurement(self):
+        calls = []
+
+        @measure_time("op")
+        def work():
+            calls.append(observability.current_span())
+
+        with (
+            events_log_context(self.events_log),
+            metrics_policy(MetricsPolicy(sinks=("null",))),
+        ):
+            self.assertEqual(active_metric_sinks(), ())
+            with mock.patch.object(observability, "span") as span:
+                work()
+
+        span.assert_not_called()
+        self.assertEqual(calls, [None])
+        self.assertFalse(self.events_log.exists())
+
+    def test_sampled_out_operations_are_not_timed(self):
+        memory = MemoryMetricSink()
+        policy = MetricsPolicy(sample_rate=0.25, sample_rates={"always": 1.0})
+
+        @measure_time("sampled")
+        def sampled():
+            return "ok"
+
+        with metrics_policy(policy, sinks=[memory]):
+            with mock.patch.object(observability.random, "random", return_value=0.9):
+                self.assertEqual(sampled(), "ok")
+                log_performance_metric("always", 1.0)
+            with mock.patch.object(observability.random, "random", return_value=0.1):
+                sampled()
+
+        records = memory.records()
+        self.assertEqual([r["operation"] for r in records], ["always", "sampled"])
+        self.assertNotIn("sample_rate", records[0])
+        self.assertEqual(records[1]["sample_rate"], 0.25)
+
+    def test_policy_from_config(self):
+        policy = MetricsPolicy.from_config(
+            {"sinks": ["memory", "null"], "sample_rates": {"op": 0}}
+        )
+        self.assertEqual(policy.sinks, ("memory", "null"))
+        self.assertEqual(policy.rate_for("op"), 0.0)
+        self.assertEqual(policy.rate_for("other"), 1.0)
+
+    def test_statsd_line_without_tags(self):
+        sink = StatsdMetricSink(("127.0.0.1", 8125), prefix="")
+        self.addCleanup(sink.close)
+        self.assertEqual(
+            sink.line({"operation": "op", "duration_ms": 1.5, "function": "f"}),
+            "op:1.5|ms",
+        )
+        NullMetricSink().emit({"operation": "op"})
+
+    def test_statsd_tags_cannot_break_the_line(self):
+        sink = StatsdMetricSink(("127.0.0.1", 8125), prefix="", dogstatsd=True)
+        self.addCleanup(sink.close)
+        metric = {
+            "operation": "op",
+            "duration_ms": 1.5,
+            "context": {"path": "/a,b|c#d", "bad,key": 1},
+        }
+        self.assertEqual(sink.line(metric), "op:1.5|ms|#path:/a_b_c_d,bad_key:1")
+
+    def test_statsd_resolves_the_address_once(self):
+        listener = socket.socket(socket.AF_INET6, socket.SOCK_DGRAM)
+        self.addCleanup(listener.close)
+        try:
+            listener.bind(("::1", 0))
+        except OSError:
+            self.skipTest("IPv6 loopback unavailable")
+        listener.settimeout(5)
+        port = listener.getsockname()[1]
+        with mock.patch.object(
+            socket, "getaddrinfo", wraps=socket.getaddrinfo
+        ) as getaddrinfo:
+            sink = StatsdMetricSink(("::1", port), prefix="")
+            self.addCleanup(sink.close)
+            sink.emit({"operation": "a", "duration_ms": 1.0})
+            sink.emit({"operation": "b", "duration_ms": 2.0})
+
+        self.assertEqual(getaddrinfo.call_count, 1)
+        self.assertEqual(listener.recv(64), b"a:1.0|ms")
+        self.assertEqual(listener.recv(64), b"b:2.0|ms")
+
+    def test_unresolvable_statsd_address_drops_metrics(self):
+        with mock.patch.object(
+            socket, "getaddrinfo", side_effect=socket.gaierror("no such host")
+        ):
+            sink = StatsdMetricSink(("statsd.invalid", 8125))
+        self.addCleanup(sink.close)
+        sink.emit({"operation": "op", "duration_ms": 1.0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,18 +1,27 @@
 """Tests for observability module (performance monitoring)."""
 
 import json
+import os
 import tempfile
 import time
 import unittest
 from pathlib import Path
-from unittest.mock import Mock, patch
+from unittest.mock import patch
 
 import pytest
 
+from flowgate.core.eventlog import read_lines_reversed
+from flowgate.core.latency import read_latency_store
 from flowgate.core.observability import (
+    EventSink,
+    current_span,
+    event_sink_policy,
+    events_log_context,
     get_recent_metrics,
     log_performance_metric,
     measure_time,
+    span,
+    trace_to,
 )
 
 
@@ -220,11 +229,10 @@ class TestLogPerformanceMetric(unittest.TestCase):
 
     def test_log_handles_write_failure_gracefully(self):
         """Test that logging failures don't raise exceptions."""
-        with patch("flowgate.core.observability.Path") as mock_path:
-            mock_log = Mock()
-            mock_path.return_value = mock_log
-            mock_log.parent.mkdir.side_effect = OSError("Permission denied")
-
+        with patch(
+            "flowgate.core.observability.os.open",
+            side_effect=OSError("Permission denied"),
+        ):
             # Should not raise
             log_performance_metric("test_op", 100.0)
 
@@ -373,16 +381,214 @@ class TestGetRecentMetrics(unittest.TestCase):
 
     def test_get_metrics_handles_read_failure(self):
         """Test that read failures return empty list."""
-        with patch("flowgate.core.observability.Path") as mock_path:
-            mock_log = Mock()
-            mock_path.return_value = mock_log
-            mock_log.exists.return_value = True
-            mock_log.open.side_effect = OSError("Permission denied")
-
+        log_performance_metric("test_op", 1.0)
+        with patch(
+            "flowgate.core.observability.read_events",
+            side_effect=OSError("Permission denied"),
+        ):
             metrics = get_recent_metrics()
 
             self.assertEqual(metrics, [])
 
+    def test_get_metrics_stops_reading_at_limit(self):
+        """Test that only the tail of a large log is read for a small limit."""
+        for i in range(2000):
+            log_performance_metric("test_op", float(i))
+        consumed = 0
+
+        def counting(path):
+            nonlocal consumed
+            for line in read_lines_reversed(path):
+                consumed += 1
+                yield line
+
+        with patch("flowgate.core.eventlog.read_lines_reversed", counting):
+            metrics = get_recent_metrics(limit=3)
+
+        self.assertEqual([m["duration_ms"] for m in metrics], [1999.0, 1998.0, 1997.0])
+        self.assertEqual(consumed, 3)
+
+
+@pytest.mark.unit
+class TestReadLinesReversed(unittest.TestCase):
+    """Test reading a file newest line first."""
+
+    def test_lines_spanning_block_boundaries(self):
+        """Test that lines split across blocks are reassembled in order."""
+        path = Path(tempfile.mkdtemp()) / "events.log"
+        lines = ["first", "a much longer second line", "", "ünïcode", "last"]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        for block_size in (1, 3, 7, 64 * 1024):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(
+                    list(read_lines_reversed(path, block_size=block_size)),
+                    ["last", "ünïcode", "a much longer second line", "first"],
+                )
+
+    def test_byte_range(self):
+        """Test that only lines within [start, end) are read."""
+        path = Path(tempfile.mkdtemp()) / "events.log"
+        path.write_bytes(b"one\ntwo\nthree\nfour\n")
+
+        for block_size in (1, 4, 64 * 1024):
+            with self.subTest(block_size=block_size):
+                self.assertEqual(
+                    list(
+                        read_lines_reversed(
+                            path, block_size=block_size, start=4, end=14
+                        )
+                    ),
+                    ["three", "two"],
+                )
+
+    def test_empty_file(self):
+        """Test that an empty file yields nothing."""
+        path = Path(tempfile.mkdtemp()) / "events.log"
+        path.write_bytes(b"")
+        self.assertEqual(list(read_lines_reversed(path)), [])
+
+
+@pytest.mark.unit
+class TestEventSink(unittest.TestCase):
+    """Test batched writing of the events log."""
+
+    def setUp(self):
+        self.events_log = Path(tempfile.mkdtemp()) / "runtime" / "events.log"
+
+    def _lines(self) -> list[dict]:
+        return [json.loads(line) for line in self.events_log.read_text().splitlines()]
+
+    def test_batch_is_written_with_one_append(self):
+        sink = EventSink(self.events_log, flush_interval=60.0)
+        for n in range(50):
+            sink.emit({"event": "e", "n": n})
+        self.assertFalse(self.events_log.exists())
+
+        with patch("flowgate.core.observability.os.write", wraps=os.write) as write:
+            sink.flush()
+
+        write.assert_called_once()
+        self.assertEqual([line["n"] for line in self._lines()], list(range(50)))
+
+    def test_background_thread_flushes_on_interval(self):
+        sink = EventSink(self.events_log, flush_interval=0.05, fsync="batch")
+        sink.emit({"event": "e"})
+
+        deadline = time.monotonic() + 5
+        while not self.events_log.exists():
+            self.assertLess(time.monotonic(), deadline, "batch was not flushed")
+            time.sleep(0.01)
+        self.assertEqual(self._lines(), [{"event": "e"}])
+
+    def test_performance_metrics_update_latency_histograms(self):
+        sink = EventSink(self.events_log, flush_interval=60.0)
+        sink.emit_many(
+            [
+                {"event": "performance_metric", "operation": "op", "duration_ms": 4.0},
+                {"event": "service_start", "duration_ms": 9.0},
+            ]
+        )
+        sink.flush()
+
+        store = read_latency_store(self.events_log.with_name("latency.json"))
+        histograms = store.window(60, time.time())
+        self.assertEqual(list(histograms), ["op"])
+        self.assertEqual(histograms["op"].summary()["max_ms"], 4.0)
+
+    def test_sampled_metrics_are_scaled_back_up(self):
+        sink = EventSink(self.events_log, flush_interval=60.0)
+        metric = {
+            "event": "performance_metric",
+            "operation": "op",
+            "duration_ms": 4.0,
+            "sample_rate": 0.1,
+        }
+        sink.emit_many([metric, metric, dict(metric, sample_rate=1.0)])
+        sink.flush()
+
+        store = read_latency_store(self.events_log.with_name("latency.json"))
+        summary = store.window(60, time.time())["op"].summary()
+        self.assertEqual((summary["count"], summary["mean_ms"]), (21, 4.0))
+
+    def test_policy_batches_until_the_block_ends(self):
+        with events_log_context(self.events_log):
+            with event_sink_policy(flush_interval=60.0):
+                log_performance_metric("batched", 1.0)
+                self.assertFalse(self.events_log.exists())
+            self.assertEqual(self._lines()[0]["operation"], "batched")
+
+            log_performance_metric("direct", 1.0)
+            self.assertEqual(self._lines()[1]["operation"], "direct")
+
+
+@pytest.mark.unit
+class TestSpans(unittest.TestCase):
+    """Test span nesting and trace-event export."""
+
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.events_log = self.temp_dir / "events.log"
+
+    def test_nested_measurements_share_a_trace(self):
+        @measure_time("inner")
+        def inner():
+            return current_span()
+
+        @measure_time("outer")
+        def outer():
+            return current_span(), inner()
+
+        with events_log_context(self.events_log):
+            outer_span, inner_span = outer()
+            inner()
+
+        self.assertIsNone(current_span())
+        self.assertEqual(inner_span.parent_id, outer_span.span_id)
+        self.assertEqual(inner_span.trace_id, outer_span.trace_id)
+        inner_metric, outer_metric, lone_metric = [
+            json.loads(line) for line in self.events_log.read_text().splitlines()
+        ]
+        self.assertEqual(inner_metric["parent_id"], outer_metric["span_id"])
+        self.assertEqual(inner_metric["trace_id"], outer_metric["trace_id"])
+        self.assertNotIn("parent_id", outer_metric)
+        self.assertNotIn("parent_id", lone_metric)
+        self.assertNotEqual(lone_metric["trace_id"], outer_metric["trace_id"])
+
+    def test_trace_to_writes_complete_events(self):
+        trace_file = self.temp_dir / "trace.json"
+
+        with trace_to(trace_file), span("root") as root:
+            with span("child"):
+                time.sleep(0.01)
+            with self.assertRaises(ValueError), span("failing"):
+                raise ValueError("boom")
+
+        trace = json.loads(trace_file.read_text())
+        self.assertEqual(trace["displayTimeUnit"], "ms")
+        events = {e["name"]: e for e in trace["traceEvents"] if e["ph"] == "X"}
+        self.assertEqual(set(events), {"root", "child", "failing"})
+        child = events["child"]
+        self.assertEqual(child["args"]["parent_id"], root.span_id)
+        self.assertGreaterEqual(child["dur"], 10_000)
+        self.assertGreaterEqual(child["ts"], events["root"]["ts"])
+        self.assertLessEqual(
+            child["ts"] + child["dur"], events["root"]["ts"] + events["root"]["dur"]
+        )
+        self.assertEqual(events["failing"]["args"]["error"], "ValueError")
+        metadata = [e["name"] for e in trace["traceEvents"] if e["ph"] == "M"]
+        self.assertIn("process_name", metadata)
+
+    def test_spans_are_only_recorded_inside_trace_to(self):
+        trace_file = self.temp_dir / "trace.json"
+        with span("before"):
+            pass
+        with trace_to(trace_file):
+            pass
+
+        trace = json.loads(trace_file.read_text())
+        self.assertEqual([e for e in trace["traceEvents"] if e["ph"] == "X"], [])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from urllib.request import urlopen
+
+import pytest
+
+from flowgate.core.openmetrics import (
+    CONTENT_TYPE,
+    EventsFollower,
+    MetricsRegistry,
+    MetricsServer,
+)
+
+
+def _append(path: Path, *records: dict) -> None:
+    with path.open("a", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.mark.unit
+class MetricsRegistryTests(unittest.TestCase):
+    def test_renders_openmetrics_families_from_records(self):
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        registry.observe_many(
+            [
+                {
+                    "event": "performance_metric",
+                    "operation": "config_load",
+                    "duration_ms": 5,
+                },
+                {
+                    "event": "performance_metric",
+                    "operation": "config_load",
+                    "duration_ms": 50,
+                },
+                {"event": "service_restart", "service": "api", "result": "success"},
+                {"event": "service_restart", "service": "api", "result": "coalesced"},
+                {"event": "watchdog_restart", "service": "api", "result": "success"},
+                {
+                    "event": "service_ready",
+                    "service": "api",
+                    "result": "success",
+                    "time_to_ready_ms": 250.0,
+                },
+                {
+                    "event": "resource_sample",
+                    "service": "api",
+                    "rss_kb": 2,
+                    "cpu_pct": None,
+                },
+            ]
+        )
+
+        text = registry.render({"api": True, "proxy": False})
+
+        self.assertTrue(text.endswith("# EOF\n"))
+        lines = text.splitlines()
+        for expected in (
+            "# TYPE flowgate_operation_duration_seconds histogram",
+            "# UNIT flowgate_operation_duration_seconds seconds",
+            'flowgate_operation_duration_seconds_bucket{operation="config_load",le="0.01"} 1',
+            'flowgate_operation_duration_seconds_bucket{operation="config_load",le="0.1"} 2',
+            'flowgate_operation_duration_seconds_bucket{operation="config_load",le="+Inf"} 2',
+            'flowgate_operation_duration_seconds_count{operation="config_load"} 2',
+            'flowgate_service_up{service="api"} 1',
+            'flowgate_service_up{service="proxy"} 0',
+            "# TYPE flowgate_service_restarts counter",
+            'flowgate_service_restarts_total{service="api",kind="manual"} 1',
+            'flowgate_service_restarts_total{service="api",kind="watchdog"} 1',
+            'flowgate_events_total{event="service_restart",service="api",result="coalesced"} 1',
+            'flowgate_service_time_to_ready_seconds_bucket{service="api",le="+Inf"} 1',
+            'flowgate_process_resident_memory_bytes{service="api"} 2048',
+        ):
+            self.assertIn(expected, lines)
+        self.assertFalse(
+            any(line.startswith("flowgate_process_cpu_percent{") for line in lines)
+        )
+
+    def test_sampled_records_are_scaled_back_up(self):
+        registry = MetricsRegistry(buckets=(0.01, 0.1))
+        metric = {
+            "event": "performance_metric",
+            "operation": "config_load",
+            "duration_ms": 5,
+            "sample_rate": 0.25,
+        }
+        registry.observe_many([metric, metric, dict(metric, duration_ms=50)])
+        registry.observe_many(
+            [{"event": "service_start", "result": "success", "sample_rate": 0.5}]
+        )
+
+        text = registry.render()
+
+        labels = 'operation="config_load"'
+        self.assertIn(
+            f'flowgate_operation_duration_seconds_bucket{{{labels},le="0.01"}} 8', text
+        )
+        self.assertIn(
+            f'flowgate_operation_duration_seconds_bucket{{{labels},le="+Inf"}} 12', text
+        )
+        self.assertIn(f"flowgate_operation_duration_seconds_count{{{labels}}} 12", text)
+        self.assertIn(
+            'flowgate_events_total{event="service_start",service="",result="success"} 2',
+            text,
+        )
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry()
+        registry.observe_many(
+            [{"event": "service_start", "service": 'a"b\\c', "result": "x\ny"}]
+        )
+        self.assertIn(
+            'flowgate_events_total{event="service_start",service="a\\"b\\\\c",result="x\\ny"} 1',
+            registry.render(),
+        )
+
+
+@pytest.mark.unit
+class EventsFollowerTests(unittest.TestCase):
+    def test_reads_only_new_complete_lines_across_a_seal(self):
+        log = Path(tempfile.mkdtemp()) / "events.log"
+        _append(log, {"event": "old"})
+        follower = EventsFollower(log)
+        self.addCleanup(follower.close)
+        self.assertEqual(follower.poll(), [])
+
+        _append(log, {"event": "a"})
+        with log.open("a") as f:
+            f.write('{"event": "b"')
+        self.assertEqual(follower.poll(), [{"event": "a"}])
+
+        with log.open("a") as f:
+            f.write("}\n")
+        os.replace(log, log.with_name("events.log.sealed"))
+        _append(log, {"event": "c"})
+        self.assertEqual(follower.poll(), [{"event": "b"}, {"event": "c"}])
+
+
+@pytest.mark.unit
+class MetricsServerTests(unittest.TestCase):
+    def test_scrape_serves_aggregates_of_appended_events(self):
+        log = Path(tempfile.mkdtemp()) / "events.log"
+        server = MetricsServer(
+            ("127.0.0.1", 0), log, services_up=lambda: {"api": True}, poll_interval=0.05
+        )
+        server.start()
+        self.addCleanup(server.stop)
+        url = "http://{}:{}/metrics".format(*server.address)
+
+        _append(log, {"event": "service_start", "service": "api", "result": "success"})
+        deadline = time.monotonic() + 5
+        while True:
+            with urlopen(url, timeout=2) as response:
+                self.assertEqual(response.headers["Content-Type"], CONTENT_TYPE)
+                body = response.read().decode()
+            if "flowgate_events_total{" in body:
+                break
+            self.assertLess(time.monotonic(), deadline, "event was not picked up")
+            time.sleep(0.05)
+        self.assertIn('flowgate_service_up{service="api"} 1', body)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,14 +1,19 @@
 import json
+import socket
+import subprocess
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from pathlib import Path
 from unittest import mock
 
 import pytest
 
+from flowgate.core import process
 from flowgate.core.health import check_health_url
-from flowgate.core.process import ProcessSupervisor
+from flowgate.core.process import ProcessSupervisor, ServiceBusyError
 
 
 @pytest.mark.unit
@@ -44,6 +49,282 @@ class ProcessSupervisorTests(unittest.TestCase):
             self.assertIn("provider", event)
             self.assertIn("result", event)
 
+    def test_stop_records_time_to_exit(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        supervisor.start(
+            "cliproxyapi_plus",
+            [sys.executable, "-c", "import time; time.sleep(60)"],
+            cwd=str(runtime_dir),
+        )
+
+        self.assertTrue(supervisor.stop("cliproxyapi_plus", timeout=2))
+
+        events = [
+            json.loads(line)
+            for line in (runtime_dir / "events.log").read_text().splitlines()
+        ]
+        stop_events = [e for e in events if e["event"] == "service_stop"]
+        self.assertEqual(stop_events[-1]["result"], "success")
+        self.assertIsInstance(stop_events[-1]["time_to_exit_ms"], float)
+        self.assertLess(stop_events[-1]["time_to_exit_ms"], 2000)
+
+    def test_wait_for_exit_returns_when_adopted_pid_exits(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+        try:
+            self.assertFalse(supervisor._wait_for_exit(proc.pid, 0.01))
+            self.assertTrue(supervisor._wait_for_exit(proc.pid, 5.0))
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_wait_for_exit_without_pidfd_support(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+        try:
+            with mock.patch.object(supervisor, "_open_pidfd", return_value=None):
+                self.assertTrue(supervisor._wait_for_exit(proc.pid, 5.0, child=proc))
+        finally:
+            proc.kill()
+            proc.wait()
+
+    def test_reap_returns_exit_code_of_tracked_child(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        pid = supervisor.start("svc", [sys.executable, "-c", "raise SystemExit(3)"])
+        deadline = time.monotonic() + 5
+        while supervisor.reap("svc", pid) is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self.assertEqual(supervisor.reap("svc", pid), 3)
+        self.assertFalse(supervisor.pid_alive(pid))
+        self.assertIsNone(supervisor.reap("other", pid))
+
+    @pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+    def test_identity_uses_start_time_without_reading_cmdline(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        supervisor.start("svc", [sys.executable, "-c", "import time; time.sleep(60)"])
+        self.addCleanup(supervisor.stop, "svc", timeout=2)
+        record = supervisor._read_pid_record("svc")
+        self.assertIsInstance(record["start_time"], int)
+        self.assertIsInstance(record["boot_id"], str)
+
+        with (
+            mock.patch.object(
+                supervisor, "_read_process_cmdline", side_effect=AssertionError
+            ),
+            mock.patch("subprocess.check_output", side_effect=AssertionError),
+        ):
+            self.assertTrue(supervisor.is_running("svc"))
+
+    @pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+    def test_reused_pid_is_not_mistaken_for_the_service(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        supervisor.start("svc", [sys.executable, "-c", "import time; time.sleep(60)"])
+        self.addCleanup(supervisor.stop, "svc", timeout=2)
+        record = supervisor._read_pid_record("svc")
+
+        for stale in (
+            {**record, "start_time": record["start_time"] - 1},
+            {**record, "boot_id": "previous-boot"},
+        ):
+            supervisor._pid_path("svc").write_text(json.dumps(stale))
+            self.assertFalse(supervisor.is_running("svc"))
+        supervisor._pid_path("svc").write_text(json.dumps(record))
+
+    def test_legacy_record_falls_back_to_command_match(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        proc = subprocess.Popen(
+            [sys.executable, "-c", "import time; print(flush=True); time.sleep(60)"],
+            stdout=subprocess.PIPE,
+        )
+        self.addCleanup(proc.wait)
+        self.addCleanup(proc.kill)
+        proc.stdout.readline()  # exec'd: cmdline is populated
+        self.addCleanup(proc.stdout.close)
+        supervisor._pid_path("svc").write_text(
+            json.dumps({"pid": proc.pid, "command": [sys.executable]})
+        )
+        self.assertTrue(supervisor.is_running("svc"))
+
+        supervisor._pid_path("svc").write_text(
+            json.dumps({"pid": proc.pid, "command": ["/usr/bin/something-else"]})
+        )
+        self.assertFalse(supervisor.is_running("svc"))
+
+    def _start_listener(self, supervisor, *, exit_when_idle, accept=True):
+        """Start a SIGTERM-ignoring service holding one client connection.
+
+        With ``accept`` False the connection stays in the listen backlog.
+        """
+        code = (
+            "import signal, socket, sys, time\n"
+            "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+            "srv = socket.socket()\n"
+            "srv.bind(('127.0.0.1', 0))\n"
+            "srv.listen()\n"
+            "print(srv.getsockname()[1], flush=True)\n"
+            + ("" if accept else "time.sleep(60)\n")
+            + "conn, _ = srv.accept()\n"
+            "print('accepted', flush=True)\n"
+            "while conn.recv(1024): pass\n"
+            f"sys.exit(0) if {exit_when_idle} else time.sleep(60)\n"
+        )
+        supervisor.start("svc", [sys.executable, "-c", code], drain_timeout=5.0)
+        log = supervisor.log_dir / "svc.log"
+        deadline = time.monotonic() + 10
+        while not log.read_text().strip():
+            self.assertLess(time.monotonic(), deadline, "service did not listen")
+            time.sleep(0.01)
+        client = socket.create_connection(("127.0.0.1", int(log.read_text())))
+        self.addCleanup(client.close)
+        while accept and "accepted" not in log.read_text():
+            self.assertLess(time.monotonic(), deadline, "service did not accept")
+            time.sleep(0.01)
+        return client
+
+    def _stop_event(self, supervisor):
+        events = [
+            json.loads(line) for line in supervisor.events_log.read_text().splitlines()
+        ]
+        return [e for e in events if e["event"] == "service_stop"][-1]
+
+    @pytest.mark.skipif(not Path("/proc/net/tcp").exists(), reason="requires /proc")
+    def test_stop_waits_for_connections_to_drain(self):
+        supervisor = ProcessSupervisor(Path(tempfile.mkdtemp()))
+        client = self._start_listener(supervisor, exit_when_idle=True)
+        threading.Timer(0.5, client.close).start()
+
+        self.assertTrue(supervisor.stop("svc", timeout=0.1))
+
+        event = self._stop_event(supervisor)
+        self.assertEqual(event["result"], "success")
+        self.assertEqual(event["connections_at_stop"], 1)
+        self.assertEqual(event["drained_connections"], 1)
+        self.assertEqual(event["connections_at_kill"], 0)
+        self.assertGreaterEqual(event["drain_ms"], 400)
+        self.assertLess(event["drain_ms"], 5000)
+
+    @pytest.mark.skipif(not Path("/proc/net/tcp").exists(), reason="requires /proc")
+    def test_stop_escalates_at_the_drain_deadline(self):
+        supervisor = ProcessSupervisor(Path(tempfile.mkdtemp()))
+        self._start_listener(supervisor, exit_when_idle=False)
+
+        self.assertTrue(supervisor.stop("svc", timeout=0.1, drain_timeout=0.5))
+
+        event = self._stop_event(supervisor)
+        self.assertEqual(event["result"], "success-after-kill")
+        self.assertEqual(event["connections_at_kill"], 1)
+        self.assertEqual(event["drained_connections"], 0)
+        self.assertGreaterEqual(event["drain_ms"], 450)
+
+    @pytest.mark.skipif(not Path("/proc/net/tcp").exists(), reason="requires /proc")
+    def test_stop_counts_connections_still_in_the_backlog(self):
+        supervisor = ProcessSupervisor(Path(tempfile.mkdtemp()))
+        self._start_listener(supervisor, exit_when_idle=False, accept=False)
+
+        self.assertTrue(supervisor.stop("svc", timeout=0.1, drain_timeout=0.5))
+
+        event = self._stop_event(supervisor)
+        self.assertEqual(event["connections_at_stop"], 1)
+        self.assertEqual(event["connections_at_kill"], 1)
+        self.assertGreaterEqual(event["drain_ms"], 450)
+
+    def test_backlog_count_ignores_unrelated_orphaned_sockets(self):
+        loopback = "0100007F"
+        sockets = [
+            (loopback, 8317, process._TCP_LISTEN, 11),
+            (loopback, 8317, process._TCP_ESTABLISHED, 12),
+            # Waiting in our backlog: no file yet.
+            (loopback, 8317, process._TCP_ESTABLISHED, 0),
+            # Another process's listener on the same port, another address.
+            ("0500000A", 8317, process._TCP_ESTABLISHED, 0),
+            # Another process's lingering connection on an unrelated port.
+            (loopback, 9000, process._TCP_ESTABLISHED, 0),
+        ]
+        with (
+            mock.patch.object(process, "_tcp_sockets", return_value=sockets),
+            mock.patch.object(process, "_socket_inodes", return_value={11, 12}),
+        ):
+            endpoints = process._listening_endpoints(1)
+            self.assertEqual(endpoints, {(loopback, 8317)})
+            self.assertEqual(process._established_connections(1, endpoints), 2)
+            self.assertEqual(process._established_connections(1, {(None, 8317)}), 3)
+
+    def test_concurrent_starts_coalesce_into_one_process(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        command = [sys.executable, "-c", "import time; time.sleep(60)"]
+        pids: list[int] = []
+
+        def start():
+            pids.append(ProcessSupervisor(runtime_dir).start("svc", command))
+
+        threads = [threading.Thread(target=start) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        supervisor = ProcessSupervisor(runtime_dir)
+        self.addCleanup(supervisor.stop, "svc", timeout=2)
+
+        self.assertEqual(len(set(pids)), 1)
+        results = [
+            json.loads(line)["result"]
+            for line in supervisor.events_log.read_text().splitlines()
+        ]
+        self.assertEqual(results.count("success"), 1)
+        self.assertEqual(results.count("already-running"), 3)
+        self.assertEqual(list(supervisor.pid_dir.glob(".*")), [])
+
+    def test_busy_service_fails_fast_without_blocking_others(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        holder = ProcessSupervisor(runtime_dir)
+        other = ProcessSupervisor(runtime_dir, lock_timeout=0)
+        command = [sys.executable, "-c", "import time; time.sleep(60)"]
+
+        with holder.locked("svc"):
+            with self.assertRaisesRegex(ServiceBusyError, r"pid \d+"):
+                other.start("svc", command)
+            other.start("other", command)
+            self.addCleanup(other.stop, "other", timeout=2)
+
+        self.assertFalse(holder.is_running("svc"))
+        self.assertTrue(holder.is_running("other"))
+
+    def test_restart_waiting_on_a_concurrent_restart_is_coalesced(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        holder = ProcessSupervisor(runtime_dir)
+        command = [sys.executable, "-c", "import time; time.sleep(60)"]
+        holder.start("svc", command)
+        self.addCleanup(holder.stop, "svc", timeout=2)
+        waited: list[int] = []
+
+        with holder.locked("svc"):
+            waiter = threading.Thread(
+                target=lambda: waited.append(
+                    ProcessSupervisor(runtime_dir).restart("svc", command)
+                )
+            )
+            waiter.start()
+            time.sleep(0.1)
+            new_pid = holder.restart("svc", command)
+        waiter.join()
+
+        self.assertEqual(waited, [new_pid])
+        self.assertTrue(holder.is_running("svc"))
+        restarts = [
+            json.loads(line)
+            for line in holder.events_log.read_text().splitlines()
+            if '"service_restart"' in line
+        ]
+        self.assertEqual([e["result"] for e in restarts], ["success", "coalesced"])
+
     def test_health_check_handles_network_error(self):
         with mock.patch("flowgate.core.health.urlopen", side_effect=OSError("boom")):
             self.assertFalse(check_health_url("http://127.0.0.1:1/", timeout=0.1))
@@ -0,0 +1,53 @@
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+from pathlib import Path
+
+import pytest
+
+from flowgate.core.profiling import profile_command
+
+
+def _busy() -> list[bytes]:
+    return [bytes(1024) for _ in range(256)]
+
+
+@pytest.mark.unit
+class ProfileCommandTests(unittest.TestCase):
+    def setUp(self):
+        self.root = Path(tempfile.mkdtemp())
+
+    def test_cpu_profile_writes_stats_and_summary(self):
+        with profile_command("health", self.root / "early", top=5) as session:
+            session.directory = self.root / "profiles"
+            _busy()
+
+        stats_path, summary_path = session.artifacts
+        self.assertEqual(stats_path.parent, self.root / "profiles")
+        self.assertTrue(stats_path.name.startswith("health-"))
+        self.assertEqual(stats_path.suffix, ".pstats")
+        functions = {name for _, _, name in pstats.Stats(str(stats_path)).stats}
+        self.assertIn("_busy", functions)
+        summary = summary_path.read_text()
+        self.assertIn("Top 5 functions by cumulative time", summary)
+        self.assertIn("_busy", summary)
+        self.assertNotIn("## Memory", summary)
+
+    def test_memory_profile_reports_peak_and_allocation_sites(self):
+        with profile_command(
+            "bootstrap.update", self.root, cpu=False, memory=True
+        ) as session:
+            kept = _busy()
+
+        self.assertFalse(tracemalloc.is_tracing())
+        (summary_path,) = session.artifacts
+        summary = summary_path.read_text()
+        peak = int(summary.split("peak_traced_bytes=")[1].split()[0])
+        self.assertGreaterEqual(peak, 256 * 1024)
+        self.assertIn(f"{__file__}:", summary)
+        self.assertEqual(len(kept), 256)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import socket
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from flowgate.core.proxy import FrontProxy, read_routes, write_routes
+
+
+async def _start_backend(tag: bytes) -> tuple[asyncio.Server, int]:
+    async def handle(reader, writer):
+        while line := await reader.readline():
+            writer.write(tag + b":" + line)
+            await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+async def _roundtrip(reader, writer, payload: bytes) -> bytes:
+    writer.write(payload)
+    await writer.drain()
+    return await reader.readline()
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _routes(*ports: int) -> dict:
+    return {
+        "listen": {"host": "127.0.0.1", "port": 0},
+        "backends": [
+            {"name": f"b{port}", "host": "127.0.0.1", "port": port} for port in ports
+        ],
+        "drain_timeout": 1.0,
+    }
+
+
+@pytest.mark.unit
+class FrontProxyTests(unittest.TestCase):
+    def setUp(self):
+        self.routes_path = Path(tempfile.mkdtemp()) / "proxy" / "routes.json"
+
+    def test_write_routes_is_readable_and_replaces_atomically(self):
+        write_routes(self.routes_path, _routes(1))
+        write_routes(self.routes_path, _routes(2))
+
+        self.assertEqual(read_routes(self.routes_path)["backends"][0]["port"], 2)
+        self.assertEqual(list(self.routes_path.parent.iterdir()), [self.routes_path])
+
+    def test_switches_new_connections_and_keeps_existing_ones(self):
+        async def scenario():
+            blue, blue_port = await _start_backend(b"blue")
+            green, green_port = await _start_backend(b"green")
+            write_routes(self.routes_path, _routes(blue_port))
+            proxy = FrontProxy(self.routes_path)
+            port = await proxy.start()
+
+            old_r, old_w = await asyncio.open_connection("127.0.0.1", port)
+            self.assertEqual(await _roundtrip(old_r, old_w, b"1\n"), b"blue:1\n")
+
+            write_routes(self.routes_path, _routes(green_port))
+            new_r, new_w = await asyncio.open_connection("127.0.0.1", port)
+            self.assertEqual(await _roundtrip(new_r, new_w, b"2\n"), b"green:2\n")
+            self.assertEqual(await _roundtrip(old_r, old_w, b"3\n"), b"blue:3\n")
+
+            old_w.close()
+            new_w.close()
+            await proxy.shutdown(drain_timeout=1.0)
+            blue.close()
+            green.close()
+
+        asyncio.run(scenario())
+
+    def test_shutdown_waits_for_in_flight_connections(self):
+        async def scenario():
+            backend, backend_port = await _start_backend(b"b")
+            write_routes(self.routes_path, _routes(backend_port))
+            proxy = FrontProxy(self.routes_path)
+            port = await proxy.start()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            self.assertEqual(await _roundtrip(reader, writer, b"x\n"), b"b:x\n")
+            shutdown = asyncio.create_task(proxy.shutdown(drain_timeout=5.0))
+            await asyncio.sleep(0.05)
+            self.assertFalse(shutdown.done())
+
+            # The listener is closed but the established connection still works.
+            self.assertEqual(await _roundtrip(reader, writer, b"y\n"), b"b:y\n")
+            writer.close()
+            await asyncio.wait_for(shutdown, timeout=2.0)
+            self.assertEqual(proxy.active_connections, 0)
+            backend.close()
+
+        asyncio.run(scenario())
+
+    def test_balances_by_least_connections(self):
+        async def scenario():
+            blue, blue_port = await _start_backend(b"blue")
+            green, green_port = await _start_backend(b"green")
+            write_routes(self.routes_path, _routes(blue_port, green_port))
+            proxy = FrontProxy(self.routes_path)
+            port = await proxy.start()
+
+            first_r, first_w = await asyncio.open_connection("127.0.0.1", port)
+            first = await _roundtrip(first_r, first_w, b"1\n")
+            # The first connection stays open, so the next ones avoid its backend.
+            for n in range(3):
+                r, w = await asyncio.open_connection("127.0.0.1", port)
+                reply = await _roundtrip(r, w, b"%d\n" % n)
+                self.assertNotEqual(reply.split(b":")[0], first.split(b":")[0])
+                w.close()
+                while proxy.active_connections > 1:
+                    await asyncio.sleep(0.01)
+
+            first_w.close()
+            await proxy.shutdown(drain_timeout=1.0)
+            blue.close()
+            green.close()
+
+        asyncio.run(scenario())
+
+    def test_fails_over_when_backend_refuses_connections(self):
+        async def scenario():
+            live, live_port = await _start_backend(b"live")
+            dead_port = _unused_port()
+            write_routes(self.routes_path, _routes(dead_port, live_port))
+            proxy = FrontProxy(self.routes_path)
+            port = await proxy.start()
+
+            for n in range(3):
+                r, w = await asyncio.open_connection("127.0.0.1", port)
+                self.assertEqual(await _roundtrip(r, w, b"%d\n" % n), b"live:%d\n" % n)
+                w.close()
+            dead = next(b for b in proxy.backends if b.port == dead_port)
+            self.assertFalse(dead.healthy)
+
+            await proxy.shutdown(drain_timeout=1.0)
+            live.close()
+
+        asyncio.run(scenario())
+
+    def test_failed_readiness_takes_backend_out_of_rotation(self):
+        async def scenario():
+            routes = _routes(1111, 2222)
+            routes["backends"][0]["readiness_url"] = (
+                f"http://127.0.0.1:{_unused_port()}/v1/models"
+            )
+            write_routes(self.routes_path, routes)
+            proxy = FrontProxy(self.routes_path)
+
+            await proxy.check_backends()
+
+            self.assertEqual(
+                {proxy.pick_backend().port for _ in range(4)},
+                {2222},
+            )
+
+        asyncio.run(scenario())
+
+    def test_standby_only_takes_traffic_when_no_primary_is_healthy(self):
+        routes = _routes(1111, 2222)
+        routes["backends"][1]["standby"] = True
+        write_routes(self.routes_path, routes)
+        proxy = FrontProxy(self.routes_path)
+
+        self.assertEqual({proxy.pick_backend().port for _ in range(4)}, {1111})
+        proxy.backends[0].healthy = False
+        self.assertEqual(proxy.pick_backend().port, 2222)
+
+
+if __name__ == "__main__":
+    unittest.main()
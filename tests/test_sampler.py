@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pytest
+
+from flowgate.core.process import ProcessSupervisor
+from flowgate.core.sampler import (
+    _CLK_TCK,
+    ResourceSampler,
+    cpu_percent,
+    read_proc_sample,
+    read_resource_state,
+)
+
+_STAT = (
+    "4242 (cli (proxy) x) S 1 4242 4242 0 -1 4194560 1000 0 0 0 "
+    "{utime} {stime} 0 0 20 0 7 0 12345 123456789 2000 18446744073709551615"
+)
+_STATUS = "Name:\tcli\nState:\tS (sleeping)\nVmRSS:\t   51234 kB\nThreads:\t7\n"
+
+
+@pytest.mark.unit
+class ProcSampleTests(unittest.TestCase):
+    def _fake_proc(self, utime: int, stime: int, fds: int) -> Path:
+        root = Path(tempfile.mkdtemp())
+        base = root / "4242"
+        (base / "fd").mkdir(parents=True)
+        (base / "stat").write_text(_STAT.format(utime=utime, stime=stime))
+        (base / "status").write_text(_STATUS)
+        for n in range(fds):
+            (base / "fd" / str(n)).touch()
+        return root
+
+    def test_parses_stat_status_and_fd_table(self):
+        root = self._fake_proc(utime=120, stime=30, fds=3)
+
+        sample = read_proc_sample(4242, proc_root=root, clock=lambda: 1.0)
+
+        self.assertEqual(sample.cpu_ticks, 150)
+        self.assertEqual(sample.rss_kb, 51234)
+        self.assertEqual(sample.threads, 7)
+        self.assertEqual(sample.fds, 3)
+
+    def test_cpu_percent_is_a_delta_between_samples_of_one_pid(self):
+        first = read_proc_sample(
+            4242, proc_root=self._fake_proc(100, 0, 0), clock=lambda: 10.0
+        )
+        second = read_proc_sample(
+            4242, proc_root=self._fake_proc(150, 0, 0), clock=lambda: 11.0
+        )
+
+        self.assertIsNone(cpu_percent(None, first))
+        self.assertAlmostEqual(cpu_percent(first, second), 50 / _CLK_TCK * 100, 2)
+
+    def test_missing_process_yields_no_sample(self):
+        self.assertIsNone(read_proc_sample(4242, proc_root=tempfile.mkdtemp()))
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="requires /proc")
+class ResourceSamplerTests(unittest.TestCase):
+    def test_tick_emits_compact_records_for_running_services(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        args = [sys.executable, "-c", "import time; time.sleep(60)"]
+        config = {"services": {"svc": {"command": {"args": args}}, "idle": {}}}
+        pid = supervisor.start("svc", args)
+        self.addCleanup(supervisor.stop, "svc", timeout=2)
+        sampler = ResourceSampler(lambda: (config, supervisor), interval=0.01)
+
+        sampler.tick()
+        records = sampler.tick()
+
+        self.assertEqual([r["service"] for r in records], ["svc"])
+        record = records[0]
+        self.assertEqual(record["pid"], pid)
+        self.assertIsInstance(record["cpu_pct"], float)
+        self.assertGreater(record["rss_kb"], 0)
+        self.assertGreaterEqual(record["threads"], 1)
+        logged = [
+            json.loads(line)
+            for line in supervisor.events_log.read_text().splitlines()
+            if '"resource_sample"' in line
+        ]
+        self.assertEqual(len(logged), 2)
+        self.assertEqual(read_resource_state(runtime_dir)["svc"]["pid"], pid)
+
+    def test_tick_skips_a_stale_pid_reused_by_another_process(self):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        supervisor.pid_dir.mkdir(parents=True, exist_ok=True)
+        # Our own pid, but not the process that wrote the record.
+        record = {"pid": os.getpid(), "start_time": 1, "boot_id": "stale"}
+        (supervisor.pid_dir / "svc.pid").write_text(json.dumps(record))
+        config = {"services": {"svc": {}}}
+        sampler = ResourceSampler(lambda: (config, supervisor), interval=0.01)
+
+        self.assertEqual(sampler.tick(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import resource
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pytest
+
+import flowgate
+from flowgate.core.process import ProcessError, ProcessSupervisor
+from flowgate.core.tuning import ProcessControls, split_cpus
+
+
+@pytest.mark.unit
+class SplitCpusTests(unittest.TestCase):
+    def test_splits_into_disjoint_contiguous_sets(self):
+        self.assertEqual(
+            split_cpus([3, 0, 1, 2, 4, 5, 6], 3), [[0, 1, 2], [3, 4], [5, 6]]
+        )
+
+    def test_shares_cores_when_there_are_more_parts_than_cpus(self):
+        self.assertEqual(split_cpus([0, 1], 3), [[0], [1], [0]])
+
+
+@pytest.mark.unit
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="requires Linux")
+class SupervisorProcessControlsTests(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = ProcessSupervisor(Path(tempfile.mkdtemp()))
+        src_dir = str(Path(flowgate.__file__).resolve().parents[1])
+        patcher = mock.patch.dict(os.environ, {"PYTHONPATH": src_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _start(self, controls: ProcessControls) -> int:
+        pid = self.supervisor.start(
+            "svc",
+            [sys.executable, "-c", "import time; time.sleep(60)"],
+            controls=controls,
+        )
+        self.addCleanup(self.supervisor.stop, "svc", timeout=2)
+        # Wait for the wrapper to exec the service.
+        deadline = time.monotonic() + 10
+        while b"flowgate.core.tuning" in Path(f"/proc/{pid}/cmdline").read_bytes():
+            self.assertLess(time.monotonic(), deadline, "wrapper did not exec")
+            time.sleep(0.01)
+        return pid
+
+    def test_controls_are_applied_recorded_and_verified(self):
+        cpu = min(os.sched_getaffinity(0))
+        nofile = min(resource.getrlimit(resource.RLIMIT_NOFILE)[1], 512)
+        controls = ProcessControls(
+            cpus=(cpu,),
+            nice=os.getpriority(os.PRIO_PROCESS, 0) + 1,
+            max_open_files=nofile,
+        )
+
+        pid = self._start(controls)
+
+        self.assertEqual(os.sched_getaffinity(pid), {cpu})
+        self.assertEqual(os.getpriority(os.PRIO_PROCESS, pid), controls.nice)
+        self.assertEqual(resource.prlimit(pid, resource.RLIMIT_NOFILE)[0], nofile)
+        record = self.supervisor._read_pid_record("svc")
+        self.assertEqual(record["controls"], controls.to_record())
+        self.assertEqual(record["command"][0], sys.executable)
+        self.assertEqual(self.supervisor.controls_drift("svc"), [])
+
+        os.setpriority(os.PRIO_PROCESS, pid, controls.nice + 1)
+        self.assertEqual(self.supervisor.controls_drift("svc"), ["nice"])
+
+    def test_unavailable_cpus_fail_the_start(self):
+        with self.assertRaises(ProcessError):
+            self.supervisor.start(
+                "svc",
+                [sys.executable, "-c", "pass"],
+                controls=ProcessControls(cpus=(4095,)),
+            )
+        self.assertFalse(self.supervisor.is_running("svc"))
+
+
+if __name__ == "__main__":
+    unittest.main()
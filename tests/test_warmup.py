@@ -0,0 +1,95 @@
+import json
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+from flowgate.core.warmup import WarmupPlan, run_warmup
+
+
+class _Backend(BaseHTTPRequestHandler):
+    seen: list[tuple[str, str, str | None]] = []
+    in_flight = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def _handle(self) -> None:
+        cls = type(self)
+        with cls.lock:
+            cls.in_flight += 1
+            cls.peak = max(cls.peak, cls.in_flight)
+            cls.seen.append(
+                (self.command, self.path, self.headers.get("Authorization"))
+            )
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        time.sleep(0.05)
+        with cls.lock:
+            cls.in_flight -= 1
+        self.send_response(404 if self.path == "/missing" else 200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    do_GET = do_POST = _handle
+
+    def log_message(self, format, *args):  # noqa: A002 - silence test output
+        pass
+
+
+@pytest.mark.unit
+class RunWarmupTests(unittest.TestCase):
+    def setUp(self):
+        _Backend.seen = []
+        _Backend.peak = 0
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Backend)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def test_sends_every_round_with_bounded_concurrency_and_api_key(self):
+        cliproxy = Path(tempfile.mkdtemp()) / "cliproxyapi.yaml"
+        cliproxy.write_text(json.dumps({"api-keys": ["sk-warm"]}), encoding="utf-8")
+        plan = WarmupPlan.from_config(
+            {
+                "requests": [
+                    "/v1/models",
+                    {"path": "/v1/chat/completions", "body": {"max_tokens": 1}},
+                    "/a",
+                    "/b",
+                ],
+                "concurrency": 2,
+                "rounds": 3,
+                "api_keys_from": str(cliproxy),
+            }
+        )
+
+        result = run_warmup(self.base_url, plan)
+
+        self.assertTrue(result["ok"])
+        self.assertEqual(result["requests"], 12)
+        self.assertEqual(len(_Backend.seen), 12)
+        self.assertEqual(_Backend.peak, 2)
+        self.assertIn(("POST", "/v1/chat/completions", "Bearer sk-warm"), _Backend.seen)
+        self.assertGreater(result["first_latency_ms"], 0)
+        self.assertGreater(result["steady_latency_ms"], 0)
+        self.assertGreaterEqual(result["duration_ms"], 3 * 2 * 50)
+
+    def test_failed_requests_are_counted_not_raised(self):
+        plan = WarmupPlan.from_config(
+            {"requests": ["/v1/models", "/missing"], "rounds": 1}
+        )
+
+        result = run_warmup(self.base_url, plan)
+
+        self.assertFalse(result["ok"])
+        self.assertEqual((result["requests"], result["failures"]), (2, 1))
+        self.assertIsNone(result["steady_latency_ms"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,251 @@
+import json
+import os
+import signal
+import socket
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+import pytest
+
+from flowgate.core.lifecycle import spare_name, start_service, stop_service
+from flowgate.core.process import ProcessSupervisor
+from flowgate.core.proxy import read_routes
+from flowgate.core.watchdog import Watchdog, WatchdogPolicy, read_watchdog_state
+
+_FAST = WatchdogPolicy(initial_backoff=0.01, max_backoff=0.05, poll_interval=0.05)
+
+# Serves 200 on the port of the (derived) config file passed as last argument.
+_HTTP_BACKEND = """
+import json, sys
+from http.server import BaseHTTPRequestHandler, HTTPServer
+cfg = json.load(open(sys.argv[1]))
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+    def log_message(self, *args):
+        pass
+HTTPServer((cfg["host"], cfg["port"]), Handler).serve_forever()
+"""
+
+
+@pytest.mark.unit
+class WatchdogPolicyTests(unittest.TestCase):
+    def test_backoff_grows_exponentially_and_is_capped(self):
+        policy = WatchdogPolicy(initial_backoff=1.0, max_backoff=10.0, jitter=0.0)
+        self.assertEqual(
+            [policy.backoff(n) for n in (1, 2, 3, 4, 5)], [1.0, 2.0, 4.0, 8.0, 10.0]
+        )
+
+    def test_backoff_jitter_stays_within_bounds(self):
+        policy = WatchdogPolicy(initial_backoff=1.0, jitter=0.2)
+        self.assertAlmostEqual(policy.backoff(1, rng=lambda: 0.0), 0.8)
+        self.assertAlmostEqual(policy.backoff(1, rng=lambda: 1.0), 1.2)
+
+
+@pytest.mark.unit
+class WatchdogTests(unittest.TestCase):
+    def _setup(self, code: str, policy: WatchdogPolicy = _FAST):
+        runtime_dir = Path(tempfile.mkdtemp())
+        supervisor = ProcessSupervisor(runtime_dir)
+        config = {
+            "services": {
+                "svc": {
+                    "command": {
+                        "args": [sys.executable, "-c", code],
+                        "cwd": str(runtime_dir),
+                    }
+                }
+            }
+        }
+        self.addCleanup(supervisor.stop, "svc", timeout=2)
+        watchdog = Watchdog(lambda: (config, supervisor), policy=policy)
+        return supervisor, watchdog, config
+
+    def _events(self, supervisor: ProcessSupervisor, name: str) -> list[dict]:
+        lines = supervisor.events_log.read_text(encoding="utf-8").splitlines()
+        return [e for e in map(json.loads, lines) if e["event"] == name]
+
+    def _tick_until(self, watchdog: Watchdog, predicate, timeout: float = 10.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "watchdog did not converge")
+            watchdog.tick()
+
+    def test_restarts_crashed_service(self):
+        supervisor, watchdog, config = self._setup("import time; time.sleep(60)")
+        pid = supervisor.start("svc", config["services"]["svc"]["command"]["args"])
+        watchdog.tick()
+
+        os.kill(pid, signal.SIGKILL)
+        self._tick_until(watchdog, lambda: self._events(supervisor, "watchdog_restart"))
+
+        self.assertTrue(supervisor.is_running("svc"))
+        self.assertNotEqual(supervisor.read_pid("svc"), pid)
+        self.assertEqual(
+            self._events(supervisor, "watchdog_exit")[0]["result"], "crashed"
+        )
+        backoff = self._events(supervisor, "watchdog_backoff")[0]
+        self.assertIn("delay_ms", backoff)
+        self.assertEqual(
+            read_watchdog_state(supervisor.runtime_dir)["svc"]["state"], "running"
+        )
+
+    def test_enters_crash_loop_after_threshold(self):
+        policy = WatchdogPolicy(
+            initial_backoff=0.01,
+            max_backoff=0.05,
+            poll_interval=0.05,
+            crash_loop_threshold=3,
+        )
+        supervisor, watchdog, config = self._setup(
+            "import sys, time; time.sleep(0.3); sys.exit(1)", policy
+        )
+        supervisor.start("svc", config["services"]["svc"]["command"]["args"])
+        watchdog.tick()
+
+        self._tick_until(
+            watchdog, lambda: self._events(supervisor, "watchdog_crash_loop")
+        )
+
+        self.assertEqual(len(self._events(supervisor, "watchdog_restart")), 2)
+        self.assertEqual(
+            read_watchdog_state(supervisor.runtime_dir)["svc"]["state"], "crash-loop"
+        )
+        for _ in range(3):
+            watchdog.tick()
+        self.assertEqual(len(self._events(supervisor, "watchdog_restart")), 2)
+
+    def test_intentional_stop_is_not_restarted(self):
+        supervisor, watchdog, config = self._setup("import time; time.sleep(60)")
+        supervisor.start("svc", config["services"]["svc"]["command"]["args"])
+        watchdog.tick()
+
+        supervisor.stop("svc", timeout=2)
+        for _ in range(3):
+            watchdog.tick()
+
+        self.assertFalse(supervisor.is_running("svc"))
+        self.assertEqual(self._events(supervisor, "watchdog_exit"), [])
+        self.assertEqual(
+            read_watchdog_state(supervisor.runtime_dir)["svc"]["state"], "unwatched"
+        )
+
+    def test_slow_stop_is_not_mistaken_for_a_crash(self):
+        supervisor, watchdog, config = self._setup("import time; time.sleep(60)")
+        pid = supervisor.start("svc", config["services"]["svc"]["command"]["args"])
+        watchdog.tick()
+        locked = threading.Event()
+
+        def slow_stop():
+            with supervisor.locked("svc"):
+                locked.set()
+                os.kill(pid, signal.SIGKILL)
+                # Well past the exit, as under load, before the pid file goes.
+                time.sleep(0.5)
+                supervisor.stop("svc", timeout=2)
+
+        stopper = threading.Thread(target=slow_stop)
+        stopper.start()
+        locked.wait(5)
+        for _ in range(3):
+            watchdog.tick()
+        stopper.join(5)
+
+        self.assertEqual(self._events(supervisor, "watchdog_exit"), [])
+        self.assertEqual(
+            read_watchdog_state(supervisor.runtime_dir)["svc"]["state"], "unwatched"
+        )
+
+
+def _unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@pytest.mark.unit
+class HotSpareTests(unittest.TestCase):
+    def setUp(self):
+        root = Path(tempfile.mkdtemp())
+        source = root / "cliproxyapi.yaml"
+        source.write_text(json.dumps({"port": 0}), encoding="utf-8")
+        self.slots = [_unused_port(), _unused_port()]
+        self.routes_file = root / "proxy" / "routes.json"
+        self.config = {
+            "services": {
+                "backend": {
+                    "host": "127.0.0.1",
+                    "port": self.slots[0],
+                    "readiness_path": "/",
+                    "command": {
+                        "cwd": str(root),
+                        "args": [sys.executable, "-c", _HTTP_BACKEND, str(source)],
+                    },
+                    "derived_config": {"source": str(source), "dir": str(root)},
+                    "proxy": {
+                        "service": "flowgate_proxy",
+                        "ports": self.slots,
+                        "drain_seconds": 0.0,
+                        "hot_spare": True,
+                    },
+                },
+                "flowgate_proxy": {
+                    "host": "127.0.0.1",
+                    "port": _unused_port(),
+                    "routes_file": str(self.routes_file),
+                    "backends": ["backend"],
+                    "command": {"cwd": str(root), "args": [sys.executable, "-V"]},
+                },
+            }
+        }
+        self.supervisor = ProcessSupervisor(root / "runtime")
+        self.addCleanup(stop_service, self.config, self.supervisor, "backend")
+        self.watchdog = Watchdog(lambda: (self.config, self.supervisor), policy=_FAST)
+
+    def _events(self, name: str) -> list[dict]:
+        lines = self.supervisor.events_log.read_text(encoding="utf-8").splitlines()
+        return [e for e in map(json.loads, lines) if e["event"] == name]
+
+    def _tick_until(self, predicate, timeout: float = 20.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "watchdog did not converge")
+            self.watchdog.tick()
+
+    def _backend_ports(self) -> dict[str, int]:
+        routes = read_routes(self.routes_file)
+        return {b["name"]: b["port"] for b in routes["backends"]}
+
+    def test_crash_fails_over_to_spare_and_replaces_it(self):
+        pid = start_service(self.config, self.supervisor, "backend")
+        spare_pid = self.supervisor.read_pid(spare_name("backend"))
+        self.assertEqual(
+            self._backend_ports(),
+            {"backend": self.slots[0], "backend.spare": self.slots[1]},
+        )
+        self._tick_until(lambda: self._events("hot_spare_ready"))
+
+        os.kill(pid, signal.SIGKILL)
+        self._tick_until(lambda: self._events("service_failover"))
+
+        self.assertEqual(self.supervisor.read_pid("backend"), spare_pid)
+        self.assertEqual(self._backend_ports()["backend"], self.slots[1])
+        failover = self._events("service_failover")[0]
+        self.assertEqual(failover["result"], "success")
+        self.assertGreaterEqual(failover["failover_ms"], 0)
+
+        self._tick_until(lambda: len(self._events("hot_spare_ready")) == 2)
+        self.assertEqual(self._backend_ports()["backend.spare"], self.slots[0])
+        self.assertNotIn(
+            self.supervisor.read_pid(spare_name("backend")), (pid, spare_pid)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()